@@ -1,14 +1,15 @@
 import { hash, verify } from "argon2";
 import { ICryptoService } from "../models/ICryptoService";
+import { timeAsync } from "./ServerTiming";
 
 export class Argon2CryptoService implements ICryptoService {
   async hash(password: string): Promise<string> {
-    return hash(password);
+    return timeAsync("argon2", () => hash(password));
   }
 
   async verify(password: string, hash: string): Promise<boolean> {
     try {
-      return await verify(hash, password);
+      return await timeAsync("argon2", () => verify(hash, password));
     } catch {
       return false;
     }
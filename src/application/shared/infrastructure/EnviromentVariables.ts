@@ -2,6 +2,8 @@ import "dotenv/config";
 
 export type NODE_ENV_VALUE = "development" | "production" | "test";
 
+export type REPOSITORY_BACKEND_VALUE = "postgres" | "memory";
+
 export interface IENVIROMENT_VARIABLES {
   // Server Configuration
   PORT: string;
@@ -9,9 +11,15 @@ export interface IENVIROMENT_VARIABLES {
   // Node Environment
   NODE_ENV: NODE_ENV_VALUE;
 
+  // User/Refresh Token Repository Backend (todos always use PostgreSQL)
+  REPOSITORY_BACKEND: REPOSITORY_BACKEND_VALUE;
+
   // CORS Configuration
   ALLOWED_ORIGINS: string;
 
+  // Server-Timing response header (argon2, jwt, db phases), "true" to enable
+  SERVER_TIMING: string;
+
   // JWT Secrets
   ACCESS_TOKEN_SECRET: string;
   REFRESH_TOKEN_SECRET: string;
@@ -24,6 +32,12 @@ export interface IENVIROMENT_VARIABLES {
   POSTGRES_PASSWORD: string;
   POSTGRES_PORT: string;
   POSTGRES_HOST: string;
+
+  // PostgreSQL Connection Pool (milliseconds for acquire/idle)
+  POSTGRES_POOL_MAX: string;
+  POSTGRES_POOL_MIN: string;
+  POSTGRES_POOL_ACQUIRE: string;
+  POSTGRES_POOL_IDLE: string;
 }
 
 const EnviromentVariables = (): IENVIROMENT_VARIABLES => {
@@ -32,8 +46,12 @@ const EnviromentVariables = (): IENVIROMENT_VARIABLES => {
     PORT: process.env.PORT ?? "3001",
     // Node Environment
     NODE_ENV: (process.env.NODE_ENV ?? "development") as NODE_ENV_VALUE,
+    // User/Refresh Token Repository Backend
+    REPOSITORY_BACKEND: (process.env.REPOSITORY_BACKEND ?? "postgres") as REPOSITORY_BACKEND_VALUE,
     // CORS Configuration
     ALLOWED_ORIGINS: process.env.ALLOWED_ORIGINS ?? "",
+    // Server-Timing response header
+    SERVER_TIMING: process.env.SERVER_TIMING ?? "false",
     // JWT Secrets
     ACCESS_TOKEN_SECRET:
       process.env.ACCESS_TOKEN_SECRET ?? "dev-access-secret-key",
@@ -47,6 +65,11 @@ const EnviromentVariables = (): IENVIROMENT_VARIABLES => {
     POSTGRES_PASSWORD: process.env.POSTGRES_PASSWORD ?? "password",
     POSTGRES_PORT: process.env.POSTGRES_PORT ?? "5432",
     POSTGRES_HOST: process.env.POSTGRES_HOST ?? "localhost",
+    // PostgreSQL Connection Pool (Sequelize defaults)
+    POSTGRES_POOL_MAX: process.env.POSTGRES_POOL_MAX ?? "5",
+    POSTGRES_POOL_MIN: process.env.POSTGRES_POOL_MIN ?? "0",
+    POSTGRES_POOL_ACQUIRE: process.env.POSTGRES_POOL_ACQUIRE ?? "60000",
+    POSTGRES_POOL_IDLE: process.env.POSTGRES_POOL_IDLE ?? "10000",
   };
 
   return envs;
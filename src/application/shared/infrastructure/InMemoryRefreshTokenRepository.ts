@@ -27,3 +27,6 @@ export class InMemoryRefreshTokenRepository implements IRefreshTokenRepository {
     }
   }
 }
+
+// singleton instance
+export const InMemoryRefreshTokenRepositoryImp = new InMemoryRefreshTokenRepository();
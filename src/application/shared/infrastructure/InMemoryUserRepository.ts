@@ -27,3 +27,6 @@ export class InMemoryUserRepository implements IUserRepository {
     return user;
   }
 }
+
+// singleton instance
+export const InMemoryUserRepositoryImp = new InMemoryUserRepository();
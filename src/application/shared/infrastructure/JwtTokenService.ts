@@ -1,5 +1,6 @@
 import jwt, { SignOptions } from "jsonwebtoken";
 import { ITokenService, TokenPayload } from "../models/ITokenService";
+import { timeSync } from "./ServerTiming";
 
 export class JwtTokenServiceSingleton implements ITokenService {
   private static instance: JwtTokenServiceSingleton | null = null;
@@ -41,10 +42,8 @@ export class JwtTokenServiceSingleton implements ITokenService {
     const options: SignOptions = {
       expiresIn: this.accessTokenExpiry as unknown as number,
     };
-    return jwt.sign(
-      { ...payload, type: "access" },
-      this.accessTokenSecret,
-      options,
+    return timeSync("jwt", () =>
+      jwt.sign({ ...payload, type: "access" }, this.accessTokenSecret, options),
     );
   }
 
@@ -52,16 +51,16 @@ export class JwtTokenServiceSingleton implements ITokenService {
     const options: SignOptions = {
       expiresIn: this.refreshTokenExpiry as unknown as number,
     };
-    return jwt.sign(
-      { ...payload, type: "refresh" },
-      this.refreshTokenSecret,
-      options,
+    return timeSync("jwt", () =>
+      jwt.sign({ ...payload, type: "refresh" }, this.refreshTokenSecret, options),
     );
   }
 
   verifyAccessToken(token: string): TokenPayload | null {
     try {
-      const decoded = jwt.verify(token, this.accessTokenSecret) as TokenPayload;
+      const decoded = timeSync("jwt", () =>
+        jwt.verify(token, this.accessTokenSecret),
+      ) as TokenPayload;
       return decoded.type === "access" ? decoded : null;
     } catch {
       return null;
@@ -70,9 +69,8 @@ export class JwtTokenServiceSingleton implements ITokenService {
 
   verifyRefreshToken(token: string): TokenPayload | null {
     try {
-      const decoded = jwt.verify(
-        token,
-        this.refreshTokenSecret,
+      const decoded = timeSync("jwt", () =>
+        jwt.verify(token, this.refreshTokenSecret),
       ) as TokenPayload;
       return decoded.type === "refresh" ? decoded : null;
     } catch {
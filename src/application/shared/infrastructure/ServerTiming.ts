@@ -0,0 +1,73 @@
+import { AsyncLocalStorage } from "node:async_hooks";
+import { performance } from "node:perf_hooks";
+
+/**
+ * Per-request phase durations reported in the Server-Timing header.
+ * Infrastructure services record into the timings of the request they run for
+ * (found through AsyncLocalStorage), so use cases stay unaware of HTTP.
+ */
+export class ServerTimings {
+  private readonly start = performance.now();
+  private readonly phases: Map<string, { dur: number; count: number }> = new Map();
+
+  record(name: string, dur: number): void {
+    const phase = this.phases.get(name);
+    if (phase) {
+      phase.dur += dur;
+      phase.count += 1;
+    } else {
+      this.phases.set(name, { dur, count: 1 });
+    }
+  }
+
+  header(): string {
+    const entries = [...this.phases].map(
+      ([name, { dur, count }]) => `${name};dur=${dur.toFixed(2)};desc="${count}"`,
+    );
+    entries.push(`total;dur=${(performance.now() - this.start).toFixed(2)}`);
+    return entries.join(", ");
+  }
+}
+
+const storage = new AsyncLocalStorage<ServerTimings>();
+
+export const runWithServerTimings = (timings: ServerTimings, callback: () => void): void =>
+  storage.run(timings, callback);
+
+/**
+ * Add a duration (ms) to the current request's phase, no-op outside a timed request
+ */
+export const recordServerTiming = (name: string, dur: number): void => {
+  storage.getStore()?.record(name, dur);
+};
+
+export const timeAsync = async <T>(name: string, fn: () => Promise<T>): Promise<T> => {
+  const timings = storage.getStore();
+  if (!timings) return fn();
+  const start = performance.now();
+  try {
+    return await fn();
+  } finally {
+    timings.record(name, performance.now() - start);
+  }
+};
+
+export const timeSync = <T>(name: string, fn: () => T): T => {
+  const timings = storage.getStore();
+  if (!timings) return fn();
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    timings.record(name, performance.now() - start);
+  }
+};
+
+/**
+ * Sequelize `logging` callback (with `benchmark: true`): one db-<verb> phase per statement
+ */
+export const recordQueryTiming = (sql: string, timing?: number): void => {
+  if (timing === undefined) return;
+  const verb = /:\s*(\w+)/.exec(sql)?.[1]?.toLowerCase() ?? "query";
+  recordServerTiming(`db-${verb}`, timing);
+};
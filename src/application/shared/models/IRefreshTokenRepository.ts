@@ -1,5 +1,5 @@
 import { ENVIROMENT_VARIABLES } from "../infrastructure/EnviromentVariables";
-import { InMemoryRefreshTokenRepository } from "../infrastructure/InMemoryRefreshTokenRepository";
+import { InMemoryRefreshTokenRepository, InMemoryRefreshTokenRepositoryImp } from "../infrastructure/InMemoryRefreshTokenRepository";
 import { RefreshTokenRepoPostgreSqlImp } from "../sequelize/RefreshTokenRepoPostgreSql";
 
 export interface RefreshTokenEntity {
@@ -34,11 +34,15 @@ export interface IRefreshTokenRepository {
 /**
  * this factory function returns the appropriate refresh token repository implementation
  * based on the current environment (development, production, test).
+ * REPOSITORY_BACKEND=memory swaps PostgreSQL for a shared in-memory instance (benchmarks).
  * @returns
  */
 export const GetRefreshTokenRepositoryInstance = (): IRefreshTokenRepository => {
   // develoment and production use PostgreSQL and was cached throughout env vars
 
+  if (ENVIROMENT_VARIABLES.REPOSITORY_BACKEND === "memory")
+    return InMemoryRefreshTokenRepositoryImp;
+
   if (ENVIROMENT_VARIABLES.NODE_ENV === "development")
     return RefreshTokenRepoPostgreSqlImp;
 
@@ -1,5 +1,5 @@
 import { ENVIROMENT_VARIABLES } from "../infrastructure/EnviromentVariables";
-import { InMemoryUserRepository } from "../infrastructure/InMemoryUserRepository";
+import { InMemoryUserRepository, InMemoryUserRepositoryImp } from "../infrastructure/InMemoryUserRepository";
 import { UserRespoPostgreSqlImp } from "../sequelize/UserRespoPostgreSql";
 import { User } from "./User";
 
@@ -18,11 +18,15 @@ export interface IUserRepository {
 /**
  * this factory function returns the appropriate user repository implementation
  * based on the current environment (development, production, test).
+ * REPOSITORY_BACKEND=memory swaps PostgreSQL for a shared in-memory instance (benchmarks).
  * @returns
  */
 export const GetUserRepositoryInstance = (): IUserRepository => {
   // develoment and production use PostgreSQL and was cached throughout env vars
 
+  if (ENVIROMENT_VARIABLES.REPOSITORY_BACKEND === "memory")
+    return InMemoryUserRepositoryImp;
+
   if (ENVIROMENT_VARIABLES.NODE_ENV === "development")
     return UserRespoPostgreSqlImp;
 
@@ -1,5 +1,6 @@
 import { Sequelize } from "sequelize";
 import { ENVIROMENT_VARIABLES } from "../infrastructure/EnviromentVariables";
+import { recordQueryTiming } from "../infrastructure/ServerTiming";
 
 class SequelizeSingleton {
   private static instance: Sequelize | null = null;
@@ -16,8 +17,16 @@ class SequelizeSingleton {
         username: ENVIROMENT_VARIABLES.POSTGRES_USER,
         password: ENVIROMENT_VARIABLES.POSTGRES_PASSWORD,
         database: ENVIROMENT_VARIABLES.POSTGRES_DB,
+        pool: {
+          max: parseInt(ENVIROMENT_VARIABLES.POSTGRES_POOL_MAX, 10),
+          min: parseInt(ENVIROMENT_VARIABLES.POSTGRES_POOL_MIN, 10),
+          acquire: parseInt(ENVIROMENT_VARIABLES.POSTGRES_POOL_ACQUIRE, 10),
+          idle: parseInt(ENVIROMENT_VARIABLES.POSTGRES_POOL_IDLE, 10),
+        },
 
-        logging: false,
+        // Query durations feed the Server-Timing header when it is enabled
+        logging: ENVIROMENT_VARIABLES.SERVER_TIMING === "true" ? recordQueryTiming : false,
+        benchmark: ENVIROMENT_VARIABLES.SERVER_TIMING === "true",
         define: {
           timestamps: true,
           underscored: true,
@@ -9,9 +9,11 @@ import { HealthRoutes } from "./presentation/routes/health.routes";
 import SequelizeSingleton from "./application/shared/sequelize";
 import { swaggerSpec } from "./presentation/swagger/swaggerConfig";
 import { corsOptions } from "./application/shared/infrastructure/CORSConfig";
+import { serverTimingMiddleware } from "./presentation/middlewares/ServerTimingMiddleware";
 
 // Create Express app && Middlewares
 const app = express();
+if (ENVIROMENT_VARIABLES.SERVER_TIMING === "true") app.use(serverTimingMiddleware);
 app.use(cors(corsOptions));
 app.use(express.json());
 app.use(cookieParser());
@@ -48,6 +50,7 @@ app.listen(ENVIROMENT_VARIABLES.PORT, async () => {
     console.log("📍 Server Information:");
     console.log(`   • API Base URL:        ${baseUrl}`);
     console.log(`   • Environment:         ${process.env.NODE_ENV || 'development'}`);
+    console.log(`   • Repository Backend:  ${ENVIROMENT_VARIABLES.REPOSITORY_BACKEND}`);
     console.log("");
 
     console.log("📚 API Documentation:");
@@ -0,0 +1,26 @@
+import { Request, Response, NextFunction } from "express";
+import {
+  ServerTimings,
+  runWithServerTimings,
+} from "../../application/shared/infrastructure/ServerTiming";
+
+/**
+ * Adds a Server-Timing header (argon2, jwt, db-* phases and total) to every response.
+ * Mounted only when SERVER_TIMING=true.
+ */
+export const serverTimingMiddleware = (
+  _req: Request,
+  res: Response,
+  next: NextFunction,
+): void => {
+  const timings = new ServerTimings();
+
+  // Headers are final at writeHead, so the total covers the whole handler
+  const writeHead = res.writeHead as unknown as (...args: unknown[]) => Response;
+  res.writeHead = function (this: Response, ...args: unknown[]): Response {
+    if (!this.headersSent) this.setHeader("Server-Timing", timings.header());
+    return writeHead.apply(this, args);
+  } as unknown as typeof res.writeHead;
+
+  runWithServerTimings(timings, next);
+};
@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Access-log replay against the API
+Streams Express (morgan combined/common) or nginx access logs through a
+generator pipeline (read -> parse -> map -> pace -> dispatch) without loading
+them into memory, maps every line onto /v1/auth/* and /v1/todo calls made by a
+pool of synthetic users, and preserves (or rescales) the original
+inter-arrival times. Combined/common logs only have second resolution, so the
+lines sharing a second are spread evenly across it; sub-second timestamps
+(e.g. [10/Oct/2025:13:55:36.123 +0000]) are used as-is. Plain and .gz logs of
+any size are supported.
+"""
+
+import requests
+import gzip
+import itertools
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+import json
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, PayloadFactory, register_renderer, todo_renderer
+from soak import LatencyHistogram
+from validation import ResponseValidator
+
+# 127.0.0.1 - - [10/Oct/2025:13:55:36 +0000] "GET /v1/todo/list?page=2 HTTP/1.1" 200 512 "-" "curl/8.0"
+LOG_LINE = re.compile(
+    r'^(?P<client>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}|-) \S+'
+    r'(?: "[^"]*" "(?P<agent>[^"]*)")?'
+)
+
+TODO_ITEM = re.compile(r"^/v1/todo/list/[^/]+$")
+
+
+class LogEntry(NamedTuple):
+    timestamp: float
+    method: str
+    path: str
+    client: str
+    whole_second: bool
+
+
+class Operation(NamedTuple):
+    timestamp: float
+    name: str
+    query: str
+    client: str
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Stream lines from a plain or gzip-compressed log"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line
+
+
+def parse_entries(lines: Iterable[str], stats: Dict[str, int]) -> Iterator[LogEntry]:
+    """Parse access log lines, skipping anything that does not match"""
+    last_time, last_epoch = None, 0.0
+    for line in lines:
+        stats["lines"] += 1
+        match = LOG_LINE.match(line)
+        if not match:
+            stats["unparsed"] += 1
+            continue
+
+        # Timestamps mostly have second resolution, consecutive lines share one
+        raw_time = match.group("time")
+        if raw_time != last_time:
+            fmt = "%d/%b/%Y:%H:%M:%S.%f %z" if "." in raw_time else "%d/%b/%Y:%H:%M:%S %z"
+            try:
+                last_epoch = datetime.strptime(raw_time, fmt).timestamp()
+            except ValueError:
+                stats["unparsed"] += 1
+                continue
+            last_time = raw_time
+
+        yield LogEntry(
+            last_epoch,
+            match.group("method"),
+            match.group("path"),
+            f"{match.group('client')}|{match.group('agent') or ''}",
+            "." not in raw_time,
+        )
+
+
+def spread_seconds(entries: Iterable[LogEntry]) -> Iterator[LogEntry]:
+    """Spread entries sharing a second-resolution timestamp evenly across that second"""
+    group: List[LogEntry] = []
+
+    def flush() -> Iterator[LogEntry]:
+        for i, entry in enumerate(group):
+            yield entry._replace(timestamp=entry.timestamp + i / len(group))
+        group.clear()
+
+    for entry in entries:
+        if not entry.whole_second:
+            yield from flush()
+            yield entry
+            continue
+        if group and entry.timestamp != group[0].timestamp:
+            yield from flush()
+        # Buffers at most one second of traffic
+        group.append(entry)
+    yield from flush()
+
+
+def map_operations(entries: Iterable[LogEntry], stats: Dict[str, int]) -> Iterator[Operation]:
+    """Map log entries onto the API operations the replay can issue"""
+    for entry in entries:
+        path, _, query = entry.path.partition("?")
+        path = path.rstrip("/") or "/"
+        name = None
+
+        if entry.method == "POST" and path == "/v1/auth/register":
+            name = "register"
+        elif entry.method == "POST" and path == "/v1/auth/login":
+            name = "login"
+        elif entry.method == "POST" and path == "/v1/auth/refresh-token":
+            name = "refresh"
+        elif entry.method == "GET" and path == "/v1/auth/me":
+            name = "me"
+        elif entry.method == "POST" and path == "/v1/todo/create":
+            name = "todo_create"
+        elif entry.method == "GET" and path == "/v1/todo/list":
+            name = "todo_list"
+        elif TODO_ITEM.match(path):
+            name = {"GET": "todo_get", "PATCH": "todo_update", "DELETE": "todo_delete"}.get(entry.method)
+        elif entry.method == "GET" and path == "/health":
+            name = "health"
+
+        if name is None:
+            stats["unmapped"] += 1
+            continue
+        yield Operation(entry.timestamp, name, query if name == "todo_list" else "", entry.client)
+
+
+def pace(operations: Iterable[Operation], speed: float, stats: Dict[str, float]) -> Iterator[Operation]:
+    """Release operations at their original offsets divided by speed (0 = no pacing)"""
+    start_time = None
+    first_timestamp = 0.0
+    for operation in operations:
+        if start_time is None:
+            start_time, first_timestamp = time.time(), operation.timestamp
+        if speed > 0:
+            target = start_time + (operation.timestamp - first_timestamp) / speed
+            delay = target - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                stats["max_lag"] = max(stats["max_lag"], -delay)
+        yield operation
+
+
+class SyntheticUser:
+    """A logged-in synthetic user standing in for one log client"""
+
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.session = requests.Session()
+        self.access_token: Optional[str] = None
+        self.user_id: Optional[str] = None
+        self.todo_ids: Deque[str] = deque(maxlen=50)
+        # A real client never rotates its own refresh token concurrently
+        self.refresh_lock = threading.Lock()
+
+
+class SyntheticUserPool:
+    """Setup phase: register, login and seed todos for the synthetic users"""
+
+    def __init__(self, base_url: str, num_users: int, todos_per_user: int, concurrency: int):
+        self.base_url = base_url
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.concurrency = concurrency
+        self.users: List[SyntheticUser] = []
+
+    def create_user(self, index: int) -> Optional[SyntheticUser]:
+        """Register, login and create the initial todos of one user"""
+        unique_id = str(uuid.uuid4())[:8]
+        user = SyntheticUser(
+            f"logreplay-{index}-{unique_id}@stress-test.com",
+            f"LogReplay123_{unique_id}")
+
+        try:
+            response = user.session.post(
+                f"{self.base_url}/v1/auth/register",
+                json={"email": user.email, "password": user.password, "name": f"Test User {index}"},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return None
+
+            response = user.session.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user.email, "password": user.password},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return None
+            data = response.json()["data"]
+            user.access_token, user.user_id = data["accessToken"], data["user"]["id"]
+
+            for i in range(self.todos_per_user):
+                response = user.session.post(
+                    f"{self.base_url}/v1/todo/create",
+                    json={"name": f"Replay todo {i}", "priority": "medium"},
+                    headers={"Authorization": f"Bearer {user.access_token}"},
+                    timeout=10
+                )
+                if response.status_code in [200, 201]:
+                    user.todo_ids.append(response.json()["data"]["id"])
+
+            return user
+        except Exception:
+            return None
+
+    def run(self) -> List[SyntheticUser]:
+        """Create all synthetic users"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Creating Synthetic Users")
+        print(f"{'='*70}")
+        print(f"Users:          {self.num_users}")
+        print(f"Todos per user: {self.todos_per_user}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.create_user, i) for i in range(self.num_users)]
+            for future in as_completed(futures):
+                user = future.result()
+                if user:
+                    self.users.append(user)
+
+        print(f"Setup completed in {time.time() - start_time:.2f}s")
+        print(f"Users ready: {len(self.users)}/{self.num_users}")
+        return self.users
+
+
+class AccessLogReplay:
+    """Replay mapped log operations with bounded in-flight requests"""
+
+    def __init__(self, base_url: str, log_path: str, users: List[SyntheticUser], speed: float,
+                 concurrency: int, limit: Optional[int], validator: Optional[ResponseValidator] = None):
+        self.base_url = base_url
+        self.log_path = log_path
+        self.users = users
+        self.speed = speed
+        self.concurrency = concurrency
+        self.limit = limit
+        self.validator = validator
+        self.parse_stats = {"lines": 0, "unparsed": 0, "unmapped": 0}
+        self.pace_stats = {"max_lag": 0.0}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.skipped: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.rng = random.Random()
+        # Register and todo-create bodies are rendered by background producers
+        self.register_payloads = PayloadFactory(register_renderer(self.new_user))
+        self.todo_payloads = PayloadFactory(todo_renderer("Replay todo"))
+        self.register_counter = itertools.count()
+        self.todo_counter = itertools.count()
+
+    def new_user(self, index: int) -> Dict[str, str]:
+        """Credentials for a user registered by a replayed register line"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"logreplay-new-{index}-{unique_id}@stress-test.com",
+            "password": f"LogReplay123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+    def user_for(self, client: str) -> SyntheticUser:
+        """Stable mapping of a log client (ip + user agent) onto a synthetic user"""
+        return self.users[zlib.crc32(client.encode()) % len(self.users)]
+
+    def execute(self, operation: Operation) -> Tuple[str, float, int]:
+        """Issue the API call for one operation"""
+        user = self.user_for(operation.client)
+        auth = {"Authorization": f"Bearer {user.access_token}"}
+        session = user.session
+        name = operation.name
+
+        todo_id, previous = None, None
+        if name in ["todo_get", "todo_update", "todo_delete"]:
+            try:
+                todo_id = user.todo_ids.popleft() if name == "todo_delete" else user.todo_ids[-1]
+            except IndexError:
+                return (name, 0.0, 0)
+
+        try:
+            start = time.time()
+            if name == "register":
+                body = self.register_payloads.get(next(self.register_counter))[0]
+                start = time.time()
+                response = requests.post(
+                    f"{self.base_url}/v1/auth/register",
+                    data=body, headers=JSON_HEADERS, timeout=10)
+            elif name == "login":
+                response = session.post(
+                    f"{self.base_url}/v1/auth/login",
+                    json={"email": user.email, "password": user.password},
+                    timeout=10)
+            elif name == "refresh":
+                with user.refresh_lock:
+                    previous = session.cookies.get("refreshToken")
+                    start = time.time()
+                    response = session.post(f"{self.base_url}/v1/auth/refresh-token", json={}, timeout=10)
+            elif name == "me":
+                response = session.get(f"{self.base_url}/v1/auth/me", headers=auth, timeout=10)
+            elif name == "todo_create":
+                body = self.todo_payloads.get(next(self.todo_counter))[0]
+                start = time.time()
+                response = session.post(
+                    f"{self.base_url}/v1/todo/create",
+                    data=body, headers={**auth, **JSON_HEADERS}, timeout=10)
+            elif name == "todo_list":
+                query = f"?{operation.query}" if operation.query else ""
+                response = session.get(f"{self.base_url}/v1/todo/list{query}", headers=auth, timeout=10)
+            elif name == "todo_get":
+                response = session.get(f"{self.base_url}/v1/todo/list/{todo_id}", headers=auth, timeout=10)
+            elif name == "todo_update":
+                response = session.patch(
+                    f"{self.base_url}/v1/todo/list/{todo_id}",
+                    json={"completed": self.rng.random() < 0.5},
+                    headers=auth, timeout=10)
+            elif name == "todo_delete":
+                response = session.delete(f"{self.base_url}/v1/todo/list/{todo_id}", headers=auth, timeout=10)
+            else:
+                response = session.get(f"{self.base_url}/health", timeout=10)
+            elapsed = time.time() - start
+            status_code = response.status_code
+            if self.validator:
+                status_code = self.validate(name, response, user, todo_id, previous)
+
+            # Keep the synthetic user's state in step with the server
+            if status_code in [200, 201]:
+                if name in ["login", "refresh"]:
+                    user.access_token = response.json()["data"]["accessToken"]
+                elif name == "todo_create":
+                    user.todo_ids.append(response.json()["data"]["id"])
+
+            return (name, elapsed, status_code)
+        except requests.exceptions.Timeout:
+            return (name, 10.0, -1)
+        except Exception:
+            return (name, 0.0, -1)
+
+    def validate(self, name: str, response: requests.Response, user: SyntheticUser,
+                 todo_id: Optional[str], previous: Optional[str]):
+        """Sampled contract check of an operation's response (status or invalid_2xx)"""
+        if name == "register":
+            return self.validator.status("register", response)
+        if name == "login":
+            return self.validator.status("login", response, email=user.email)
+        if name == "refresh":
+            return self.validator.status("refresh", response, previous=previous)
+        if name == "todo_create":
+            return self.validator.status("todo", response, user_id=user.user_id)
+        if name in ["todo_get", "todo_update"]:
+            return self.validator.status("todo", response, user_id=user.user_id, todo_id=todo_id)
+        if name == "todo_list":
+            return self.validator.status("todo_list", response, user_id=user.user_id)
+        return response.status_code
+
+    def record(self, name: str, elapsed: float, status_code: int):
+        """Fold one result into the streaming metrics"""
+        with self.lock:
+            if status_code == 0:
+                self.skipped[f"{name}_no_todo"] = self.skipped.get(f"{name}_no_todo", 0) + 1
+                return
+            counts = self.counts.setdefault(name, {"requests": 0, "failed": 0})
+            counts["requests"] += 1
+            if status_code in [200, 201]:
+                self.histograms.setdefault(name, LatencyHistogram()).record(elapsed)
+            else:
+                counts["failed"] += 1
+                status_key = f"status_{status_code}"
+                counts[status_key] = counts.get(status_key, 0) + 1
+
+    def operations(self) -> Iterator[Operation]:
+        """The full generator pipeline"""
+        lines = read_lines(self.log_path)
+        entries = spread_seconds(parse_entries(lines, self.parse_stats))
+        operations = map_operations(entries, self.parse_stats)
+        if self.limit:
+            operations = itertools.islice(operations, self.limit)
+        return pace(operations, self.speed, self.pace_stats)
+
+    def run(self) -> Dict:
+        """Execute the replay"""
+        print(f"\n{'='*70}")
+        print(f"Access Log Replay")
+        print(f"{'='*70}")
+        print(f"Log:           {self.log_path}")
+        print(f"Speed:         {self.speed}x" if self.speed > 0 else "Speed:         unpaced")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Users:         {len(self.users)}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        # Bounded in-flight work: the pipeline never runs ahead of the workers
+        slots = threading.Semaphore(self.concurrency * 2)
+        dispatched = 0
+        last_print = 0.0
+
+        def task(operation: Operation):
+            try:
+                self.record(*self.execute(operation))
+            finally:
+                slots.release()
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for operation in self.operations():
+                slots.acquire()
+                executor.submit(task, operation)
+                dispatched += 1
+
+                if time.time() - last_print >= 1.0:
+                    last_print = time.time()
+                    print(
+                        f"\rlines {self.parse_stats['lines']}  dispatched {dispatched}  "
+                        f"rate {dispatched / (last_print - start_time):.1f}/s  "
+                        f"max lag {self.pace_stats['max_lag']:.2f}s", end="", flush=True)
+
+        total_time = time.time() - start_time
+        print("\n")
+        return self.generate_report(dispatched, total_time)
+
+    def generate_report(self, dispatched: int, total_time: float) -> Dict:
+        """Per-operation latency and error summary"""
+        stats = {
+            "summary": {
+                "log_lines": self.parse_stats["lines"],
+                "unparsed_lines": self.parse_stats["unparsed"],
+                "unmapped_lines": self.parse_stats["unmapped"],
+                "dispatched": dispatched,
+                "skipped": self.skipped,
+                "total_duration": f"{total_time:.2f}s",
+                "requests_per_second": f"{dispatched / total_time:.2f}" if total_time else "0",
+                "max_schedule_lag": f"{self.pace_stats['max_lag']:.3f}s",
+            },
+            "operations": {},
+        }
+
+        for name, counts in sorted(self.counts.items()):
+            histogram = self.histograms.get(name, LatencyHistogram())
+            stats["operations"][name] = {
+                **counts,
+                "mean": f"{histogram.mean():.3f}s",
+                "p50": f"{histogram.percentile(50):.3f}s",
+                "p90": f"{histogram.percentile(90):.3f}s",
+                "p99": f"{histogram.percentile(99):.3f}s",
+                "max": f"{histogram.max:.3f}s",
+            }
+
+        # Print report
+        print(f"{'='*70}")
+        print(f"Test Results Summary")
+        print(f"{'='*70}")
+        print(f"Log Lines:          {stats['summary']['log_lines']}")
+        print(f"Unparsed/Unmapped:  {stats['summary']['unparsed_lines']}/{stats['summary']['unmapped_lines']}")
+        print(f"Dispatched:         {stats['summary']['dispatched']}")
+        print(f"Total Duration:     {stats['summary']['total_duration']}")
+        print(f"Requests/Second:    {stats['summary']['requests_per_second']}")
+        print(f"Max Schedule Lag:   {stats['summary']['max_schedule_lag']}")
+
+        print(f"\n{'Operation':<12} {'Requests':>9} {'Failed':>7} {'P50':>8} {'P90':>8} {'P99':>8}")
+        for name, op in stats["operations"].items():
+            print(f"{name:<12} {op['requests']:>9} {op['failed']:>7} {op['p50']:>8} {op['p90']:>8} {op['p99']:>8}")
+
+        if self.validator:
+            stats["validation"] = self.validator.summary()
+            self.validator.print_summary()
+
+        if self.skipped:
+            print(f"\nSkipped (no todo left for the user):")
+            for name, count in self.skipped.items():
+                print(f"  {name}: {count}")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay an Express/nginx access log against the API with synthetic users",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python access-log-replay.py access.log
+  python access-log-replay.py access.log.gz --speed 10 --users 200 -c 100
+  python access-log-replay.py access.log --speed 0 --limit 100000
+        """
+    )
+
+    parser.add_argument(
+        "log",
+        type=str,
+        help="Access log in combined/common format (.gz supported)"
+    )
+    parser.add_argument(
+        "-u", "--users",
+        type=int,
+        default=50,
+        help="Number of synthetic users log clients are mapped onto (default: 50)"
+    )
+    parser.add_argument(
+        "--todos-per-user",
+        type=int,
+        default=5,
+        help="Todos created per synthetic user during setup (default: 5)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=50,
+        help="Maximum number of in-flight requests (default: 50)"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Inter-arrival time scale, 2.0 replays twice as fast, 0 disables pacing. Lines sharing a "
+             "second-resolution timestamp are spread evenly across that second, sub-second "
+             "timestamps are kept (default: 1.0)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after this many mapped operations (default: whole log)"
+    )
+    parser.add_argument(
+        "--validate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of 2xx responses checked against the API contract, failures count as invalid_2xx (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.users < 1:
+        print("Error: users must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.todos_per_user < 0:
+        print("Error: todos-per-user must be >= 0", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.speed < 0:
+        print("Error: speed must be >= 0", file=sys.stderr)
+        sys.exit(1)
+    if args.limit is not None and args.limit < 1:
+        print("Error: limit must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.validate_rate <= 1:
+        print("Error: validate-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # Setup: synthetic users
+        users = SyntheticUserPool(
+            base_url=args.url,
+            num_users=args.users,
+            todos_per_user=args.todos_per_user,
+            concurrency=min(args.concurrency, args.users)
+        ).run()
+
+        if not users:
+            print(
+                "Error: No synthetic users were created. Cannot proceed with replay.", file=sys.stderr)
+            sys.exit(1)
+
+        replay = AccessLogReplay(
+            base_url=args.url,
+            log_path=args.log,
+            users=users,
+            speed=args.speed,
+            concurrency=args.concurrency,
+            limit=args.limit,
+            validator=ResponseValidator(args.validate_rate) if args.validate_rate > 0 else None
+        )
+        report = replay.run()
+
+        # Save report to file
+        report_file = f"access_log_replay_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Calibration test for the authentication overhead
+Alternates the unauthenticated /health route with authenticated lightweight routes
+under identical load, and reports the per-request delta attributable to
+authMiddleware + JWT verification at several concurrency levels
+
+Routes (interleaved request by request):
+  health       GET /health                       -> framework floor
+  auth_reject  GET /v1/auth/me (bad signature)   -> floor + authMiddleware + JWT verify
+  auth_me      GET /v1/auth/me (valid token)     -> floor + auth + GetUserController (DB lookup)
+"""
+
+import requests
+import math
+import threading
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from statistics import mean, median
+from typing import Dict, Tuple, List, Optional
+from datetime import datetime
+import sys
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"authoverhead-{index}-{unique_id}@stress-test.com",
+            "password": f"AuthOverhead123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class AuthSetupPhase:
+    """Setup phase: Register and login a single user to obtain an access token"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.user_generator = UserGenerator()
+
+    def run(self) -> Optional[str]:
+        """Register + login, returns the access token"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Registering and Logging in Calibration User")
+        print(f"{'='*70}\n")
+
+        user = self.user_generator.generate(0)
+
+        try:
+            response = requests.post(
+                f"{self.base_url}/v1/auth/register",
+                json=user,
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                print(f"Registration failed with status {response.status_code}")
+                return None
+
+            response = requests.post(
+                f"{self.base_url}/v1/auth/login",
+                json={
+                    "email": user["email"],
+                    "password": user["password"]
+                },
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                print(f"Login failed with status {response.status_code}")
+                return None
+
+            return response.json()["data"]["accessToken"]
+        except Exception as e:
+            print(f"Setup error: {e}")
+            return None
+
+
+class AuthOverheadTest:
+    """Interleaved /health vs authenticated route calibration"""
+
+    ROUTES = ["health", "auth_reject", "auth_me"]
+
+    def __init__(self, base_url: str, num_requests: int, concurrency_levels: List[int], access_token: str):
+        self.base_url = base_url
+        self.num_requests = num_requests
+        self.concurrency_levels = concurrency_levels
+        self.access_token = access_token
+        self.targets = {
+            "health": (f"{base_url}/health", None, 200),
+            "auth_reject": (f"{base_url}/v1/auth/me", self.tamper_token(access_token), 401),
+            "auth_me": (f"{base_url}/v1/auth/me", access_token, 200),
+        }
+        # One keep-alive session per worker thread, so every route pays the
+        # same (amortized) connection cost and only the server work differs
+        self.local = threading.local()
+
+    @staticmethod
+    def tamper_token(token: str) -> str:
+        """Flip one signature character so the JWT is well-formed but fails verification"""
+        header, payload, signature = token.split(".")
+        middle = len(signature) // 2
+        flipped = "A" if signature[middle] != "A" else "B"
+        return f"{header}.{payload}.{signature[:middle]}{flipped}{signature[middle + 1:]}"
+
+    def get_session(self) -> requests.Session:
+        """Return the keep-alive session owned by the current worker thread"""
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def send_request(self, index: int) -> Tuple[int, str, float, int]:
+        """Send a single request, the route is chosen by index so routes interleave"""
+        route = self.ROUTES[index % len(self.ROUTES)]
+        url, token, _ = self.targets[route]
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        try:
+            start = time.perf_counter()
+            response = self.get_session().get(url, headers=headers, timeout=10)
+            elapsed = time.perf_counter() - start
+
+            return (index, route, elapsed, response.status_code)
+        except requests.exceptions.Timeout:
+            return (index, route, 10.0, -1)
+        except Exception:
+            return (index, route, 0.0, -1)
+
+    def run_level(self, concurrency: int) -> Dict[str, Dict]:
+        """Run all interleaved requests at a single concurrency level"""
+        results = {route: {"times": [], "unexpected": 0} for route in self.ROUTES}
+        completed = 0
+
+        # Fresh sessions per level, connection pools are sized by the executor
+        self.local = threading.local()
+        start_time = time.time()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(self.send_request, i): i
+                for i in range(self.num_requests)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    index, route, elapsed, status_code = future.result()
+                    completed += 1
+
+                    if status_code == self.targets[route][2]:
+                        results[route]["times"].append(elapsed)
+                    else:
+                        results[route]["unexpected"] += 1
+
+                    progress = (completed / self.num_requests) * 100
+                    bar_length = 40
+                    filled = int(bar_length * completed // self.num_requests)
+                    bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                    print(
+                        f"\r{bar} {progress:.1f}% ({completed}/{self.num_requests}) c={concurrency}", end="", flush=True)
+                except Exception as e:
+                    print(f"\nError processing response: {e}")
+
+        results["duration"] = time.time() - start_time
+        print()
+        return results
+
+    def run(self) -> Dict:
+        """Execute the calibration at every concurrency level"""
+        print(f"\n{'='*70}")
+        print(f"Auth Overhead Calibration")
+        print(f"{'='*70}")
+        print(f"Routes:         /health, /v1/auth/me (rejected), /v1/auth/me")
+        print(f"Requests/level: {self.num_requests}")
+        print(f"Concurrency:    {', '.join(str(c) for c in self.concurrency_levels)}")
+        print(f"Started:        {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        levels = {}
+        for concurrency in self.concurrency_levels:
+            levels[concurrency] = self.run_level(concurrency)
+
+        print()
+        return self.generate_report(levels)
+
+    def generate_report(self, levels: Dict[int, Dict]) -> Dict:
+        """Generate per-level latency statistics and auth deltas"""
+        stats = {"levels": {}}
+
+        for concurrency, results in levels.items():
+            level_stats = {
+                "duration": f"{results['duration']:.2f}s",
+                "routes": {},
+                "deltas": {},
+            }
+
+            summary = {}
+            for route in self.ROUTES:
+                times = results[route]["times"]
+                route_stats = {
+                    "requests": len(times),
+                    "unexpected_status": results[route]["unexpected"],
+                }
+                if times:
+                    summary[route] = {
+                        "median": median(times),
+                        "p95": percentile(times, 95),
+                        "p99": percentile(times, 99),
+                    }
+                    route_stats.update({
+                        "mean": f"{mean(times) * 1000:.2f}ms",
+                        "median": f"{summary[route]['median'] * 1000:.2f}ms",
+                        "p95": f"{summary[route]['p95'] * 1000:.2f}ms",
+                        "p99": f"{summary[route]['p99'] * 1000:.2f}ms",
+                    })
+                level_stats["routes"][route] = route_stats
+
+            deltas = {
+                "auth_middleware_jwt": ("auth_reject", "health"),
+                "get_user_handler": ("auth_me", "auth_reject"),
+                "auth_total": ("auth_me", "health"),
+            }
+            for name, (route, baseline) in deltas.items():
+                if route in summary and baseline in summary:
+                    level_stats["deltas"][name] = {
+                        key: f"{(summary[route][key] - summary[baseline][key]) * 1000:+.2f}ms"
+                        for key in ["median", "p95", "p99"]
+                    }
+
+            stats["levels"][str(concurrency)] = level_stats
+
+        # Print report
+        print(f"{'='*70}")
+        print(f"Test Results Summary")
+        print(f"{'='*70}")
+        for concurrency, level_stats in stats["levels"].items():
+            print(f"\nConcurrency {concurrency} ({level_stats['duration']}):")
+            for route, route_stats in level_stats["routes"].items():
+                if "median" in route_stats:
+                    print(
+                        f"  {route:<14} median {route_stats['median']:>10}  p95 {route_stats['p95']:>10}  p99 {route_stats['p99']:>10}"
+                        f"  (unexpected status: {route_stats['unexpected_status']})")
+                else:
+                    print(f"  {route:<14} no successful requests")
+            for name, delta in level_stats["deltas"].items():
+                print(
+                    f"  Δ {name:<22} median {delta['median']:>10}  p95 {delta['p95']:>10}  p99 {delta['p99']:>10}")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate auth middleware + JWT verification cost against the /health floor",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python auth-overhead.py --requests 3000 --levels 1,10,50
+  python auth-overhead.py -r 6000 -l 1,25,100 --url http://localhost:3001
+        """
+    )
+
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=3000,
+        help="Number of requests per concurrency level, split across routes (default: 3000)"
+    )
+    parser.add_argument(
+        "-l", "--levels",
+        type=str,
+        default="1,10,50",
+        help="Comma-separated concurrency levels (default: 1,10,50)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.requests < len(AuthOverheadTest.ROUTES):
+        print(f"Error: requests must be >= {len(AuthOverheadTest.ROUTES)}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        levels = [int(level) for level in args.levels.split(",")]
+    except ValueError:
+        print("Error: levels must be a comma-separated list of integers", file=sys.stderr)
+        sys.exit(1)
+    if any(level < 1 for level in levels):
+        print("Error: every concurrency level must be >= 1", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # Setup: obtain an access token
+        access_token = AuthSetupPhase(base_url=args.url).run()
+
+        if not access_token:
+            print(
+                "Error: Could not obtain an access token. Cannot proceed with calibration.", file=sys.stderr)
+            sys.exit(1)
+
+        # Calibration
+        tester = AuthOverheadTest(
+            base_url=args.url,
+            num_requests=args.requests,
+            concurrency_levels=levels,
+            access_token=access_token
+        )
+        report = tester.run()
+
+        # Save report to file
+        report_file = f"auth_overhead_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Backend matrix: the same auth scenarios against each repository backend
+Spawns the API once per REPOSITORY_BACKEND (postgres, memory), runs register,
+login, refresh-token and /me against it, and prints the backends side by side.
+The memory backend keeps users and refresh tokens in process, so its numbers
+are the Express/JWT/Argon2 ceiling and the difference to postgres is the
+Sequelize/PostgreSQL cost per endpoint. Todo routes are not part of the matrix:
+todos always use PostgreSQL and reference users by foreign key.
+"""
+
+import requests
+import threading
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, PayloadFactory, login_arena, register_renderer
+from server_process import DEFAULT_COMMAND, REPO_ROOT, ApiServer, parse_env_overrides
+from soak import LatencyHistogram
+
+BACKENDS = ["postgres", "memory"]
+ENDPOINTS = ["register", "login", "refresh-token", "me"]
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def __init__(self, backend: str):
+        self.backend = backend
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"matrix-{self.backend}-{index}-{unique_id}@stress-test.com",
+            "password": f"MatrixPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class EndpointResult:
+    """Latency and errors of one endpoint on one backend"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.error_codes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def record(self, elapsed: float, status_code: int):
+        self.requests += 1
+        if status_code in [200, 201]:
+            self.histogram.record(elapsed)
+        else:
+            self.errors += 1
+            status_key = str(status_code)
+            self.error_codes[status_key] = self.error_codes.get(status_key, 0) + 1
+
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        """Report row"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_second": round(self.rps(), 2),
+            "mean": f"{self.histogram.mean():.4f}s",
+            "p50": f"{self.histogram.percentile(50):.4f}s",
+            "p99": f"{self.histogram.percentile(99):.4f}s",
+            "error_codes": self.error_codes,
+        }
+
+
+def timed(send: Callable[[], requests.Response]) -> Tuple[float, int, Optional[requests.Response]]:
+    """Elapsed time and status of one request"""
+    try:
+        start = time.time()
+        response = send()
+        return (time.time() - start, response.status_code, response)
+    except requests.exceptions.Timeout:
+        return (10.0, -1, None)
+    except Exception:
+        return (0.0, -1, None)
+
+
+class BackendScenarios:
+    """register -> login -> refresh-token -> me against one running server"""
+
+    def __init__(self, base_url: str, backend: str, num_requests: int, concurrency: int):
+        self.base_url = base_url
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.register_payloads = PayloadFactory(
+            register_renderer(UserGenerator(backend).generate), total=num_requests)
+        self.users: List[Dict[str, str]] = []
+        self.sessions: List[requests.Session] = []
+        self.access_tokens: List[str] = []
+        self.lock = threading.Lock()
+
+    def measure(self, name: str, tasks: List[Callable[[], List[Tuple[float, int]]]]) -> EndpointResult:
+        """Run tasks on the pool; each returns (elapsed, status) of its requests"""
+        result = EndpointResult()
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(task) for task in tasks]
+            for future in as_completed(futures):
+                for elapsed, status_code in future.result():
+                    result.record(elapsed, status_code)
+        result.elapsed = time.time() - start_time
+        print(
+            f"  {name:<14} {result.rps():>9.1f} req/s  p50 {result.histogram.percentile(50) * 1000:>7.1f}ms  "
+            f"p99 {result.histogram.percentile(99) * 1000:>7.1f}ms  errors {result.errors}", flush=True)
+        return result
+
+    def register(self, index: int) -> List[Tuple[float, int]]:
+        body, user = self.register_payloads.get(index)
+        elapsed, status_code, _ = timed(lambda: requests.post(
+            f"{self.base_url}/v1/auth/register", data=body, headers=JSON_HEADERS, timeout=10))
+        if status_code in [200, 201]:
+            with self.lock:
+                self.users.append(user)
+        return [(elapsed, status_code)]
+
+    def login(self, index: int, bodies) -> List[Tuple[float, int]]:
+        # Every user logs in once with its own body; the first users keep their
+        # cookie jar for refresh-token, the others only add login samples
+        post = self.sessions[index].post if index < len(self.sessions) else requests.post
+        elapsed, status_code, response = timed(lambda: post(
+            f"{self.base_url}/v1/auth/login", data=bodies[index], headers=JSON_HEADERS, timeout=10))
+        if status_code in [200, 201] and index < len(self.sessions):
+            self.access_tokens[index] = response.json()["data"]["accessToken"]
+        return [(elapsed, status_code)]
+
+    def refresh_chain(self, session: requests.Session, count: int) -> List[Tuple[float, int]]:
+        # Refreshes of one session are sequential: each rotates the cookie
+        return [
+            timed(lambda: session.post(f"{self.base_url}/v1/auth/refresh-token", json={}, timeout=10))[:2]
+            for _ in range(count)
+        ]
+
+    def me(self, index: int) -> List[Tuple[float, int]]:
+        token = self.access_tokens[index % len(self.access_tokens)]
+        elapsed, status_code, _ = timed(lambda: requests.get(
+            f"{self.base_url}/v1/auth/me", headers={"Authorization": f"Bearer {token}"}, timeout=10))
+        return [(elapsed, status_code)]
+
+    def run(self) -> Dict[str, EndpointResult]:
+        """Every endpoint in order; each one uses the state the previous one built"""
+        results = {"register": self.measure(
+            "register", [lambda i=i: self.register(i) for i in range(self.num_requests)])}
+        if not self.users:
+            return results
+
+        # At most `concurrency` sessions, one per user, each logged in exactly once
+        self.sessions = [requests.Session() for _ in self.users[:self.concurrency]]
+        self.access_tokens = [""] * len(self.sessions)
+        bodies = login_arena(self.users)
+        results["login"] = self.measure(
+            "login", [lambda i=i: self.login(i, bodies) for i in range(len(self.users))])
+        self.access_tokens = [token for token in self.access_tokens if token]
+        if not self.access_tokens:
+            return results
+
+        per_session, extra = divmod(self.num_requests, len(self.sessions))
+        results["refresh-token"] = self.measure("refresh-token", [
+            lambda s=session, n=per_session + (1 if i < extra else 0): self.refresh_chain(s, n)
+            for i, session in enumerate(self.sessions)
+        ])
+        results["me"] = self.measure("me", [lambda i=i: self.me(i) for i in range(self.num_requests)])
+        return results
+
+
+class BackendMatrix:
+    """Spawn the API per backend and compare the endpoints"""
+
+    def __init__(self, url: str, backends: List[str], num_requests: int, concurrency: int,
+                 command: str, cwd: str, env: Dict[str, str], log_path: Optional[str]):
+        self.url = url
+        self.backends = backends
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.log_path = log_path
+        self.results: Dict[str, Dict[str, EndpointResult]] = {}
+        self.failures: Dict[str, str] = {}
+
+    def run(self) -> Dict:
+        """One server per backend"""
+        print(f"\n{'='*70}")
+        print(f"Backend Matrix")
+        print(f"{'='*70}")
+        print(f"Command:       {self.command} (in {self.cwd})")
+        print(f"Backends:      {', '.join(self.backends)}")
+        print(f"Endpoints:     {', '.join(ENDPOINTS)}")
+        print(f"Requests:      {self.num_requests} per endpoint")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        for backend in self.backends:
+            print(f"REPOSITORY_BACKEND={backend}")
+            server = ApiServer(self.url, command=self.command, cwd=self.cwd,
+                               env={**self.env, "REPOSITORY_BACKEND": backend}, log_path=self.log_path)
+            try:
+                server.start()
+                server.wait_for_health()
+                self.results[backend] = BackendScenarios(
+                    self.url, backend, self.num_requests, self.concurrency).run()
+            except Exception as e:
+                self.failures[backend] = str(e)
+                print(f"  failed: {e}")
+            finally:
+                server.stop()
+
+        return self.generate_report(time.time() - start_time)
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Side-by-side table per endpoint"""
+        stats = {
+            "summary": {
+                "backends": self.backends,
+                "requests_per_endpoint": self.num_requests,
+                "concurrency": self.concurrency,
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "endpoints": {
+                endpoint: {
+                    backend: self.results[backend][endpoint].to_dict()
+                    for backend in self.backends
+                    if endpoint in self.results.get(backend, {})
+                }
+                for endpoint in ENDPOINTS
+            },
+            "failures": self.failures,
+        }
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Backend Matrix Results")
+        print(f"{'='*70}")
+        header = "".join(f"{backend + ' req/s':>16}{'p50':>9}{'p99':>9}" for backend in self.backends)
+        print(f"{'Endpoint':<14}{header}")
+        for endpoint in ENDPOINTS:
+            row = ""
+            for backend in self.backends:
+                result = self.results.get(backend, {}).get(endpoint)
+                if result:
+                    row += (f"{result.rps():>16.1f}{result.histogram.percentile(50) * 1000:>7.1f}ms"
+                            f"{result.histogram.percentile(99) * 1000:>7.1f}ms")
+                else:
+                    row += f"{'-':>16}{'-':>9}{'-':>9}"
+            print(f"{endpoint:<14}{row}")
+
+        if "postgres" in self.backends and "memory" in self.backends:
+            print(f"\nRepository share of p50 (postgres - memory):")
+            for endpoint in ENDPOINTS:
+                pg = self.results.get("postgres", {}).get(endpoint)
+                mem = self.results.get("memory", {}).get(endpoint)
+                if pg and mem and pg.histogram.count and mem.histogram.count:
+                    delta = pg.histogram.percentile(50) - mem.histogram.percentile(50)
+                    share = delta / pg.histogram.percentile(50) * 100 if pg.histogram.percentile(50) else 0
+                    print(f"  {endpoint:<14} {delta * 1000:>7.1f}ms ({share:.0f}% of postgres p50)")
+
+        if self.failures:
+            print(f"\nFailed Backends:")
+            for backend, error in self.failures.items():
+                print(f"  {backend}: {error}")
+
+        print(f"\nTotal Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the auth endpoints against each repository backend and compare them",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  npm run build && python backend-matrix.py --requests 2000 --concurrency 50
+  python backend-matrix.py --backends memory --env ACCESS_TOKEN_EXPIRY=1h
+        """
+    )
+
+    parser.add_argument(
+        "--backends",
+        type=str,
+        default=",".join(BACKENDS),
+        help=f"Comma-separated REPOSITORY_BACKEND values to compare (default: {','.join(BACKENDS)})"
+    )
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=1000,
+        help="Requests per endpoint and backend (default: 1000)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=50,
+        help="Number of concurrent requests (default: 50)"
+    )
+    parser.add_argument(
+        "--command",
+        type=str,
+        default=DEFAULT_COMMAND,
+        help=f"Command that starts the API (default: {DEFAULT_COMMAND})"
+    )
+    parser.add_argument(
+        "--cwd",
+        type=str,
+        default=REPO_ROOT,
+        help="Working directory for the command (default: repository root)"
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        help="Environment override for the server, KEY=VALUE (repeatable)"
+    )
+    parser.add_argument(
+        "--server-log",
+        type=str,
+        default=None,
+        help="Append timestamped server output to this file (default: not kept)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL the spawned API listens on; its port is passed as PORT (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.requests < 1:
+        print("Error: requests must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if not backends or any(b not in BACKENDS for b in backends):
+        print(f"Error: backends must be among {', '.join(BACKENDS)}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        env = parse_env_overrides(args.env)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        report = BackendMatrix(
+            url=args.url,
+            backends=backends,
+            num_requests=args.requests,
+            concurrency=args.concurrency,
+            command=args.command,
+            cwd=args.cwd,
+            env=env,
+            log_path=args.server_log
+        ).run()
+
+        # Save report to file
+        report_file = f"backend_matrix_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
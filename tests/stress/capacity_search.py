@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Adaptive capacity search shared by the stress scripts
+Instead of guessing --concurrency, drives a scenario's send_request open-loop
+at a fixed arrival rate per step and searches the rate space: the rate is
+doubled while the step meets the SLO (e.g. "p99<200ms,errors<0.1%"), then the
+bracket [last passing, first failing] is bisected until it is narrower than
+the tolerance. The result is verified by repeated steps (confidence), and the
+knee of the latency curve over every measured step is reported.
+Steps are the load stages of the optional profiler: step-1, step-2, ...
+Latency is measured from the scheduled send time, so queueing inside the
+harness under overload is not hidden (no coordinated omission).
+A send_request that cannot take an arrival (e.g. every session is in flight)
+returns the DROPPED status; like a full harness, that counts as dropped.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from statistics import mean, stdev
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from profiler import StageProfiler
+from soak import LatencyHistogram
+
+# Status a send_request returns when it refused the arrival (e.g. no idle session)
+DROPPED = "dropped"
+
+
+class SLO(NamedTuple):
+    latency: List[Tuple[float, float]]  # (percentile, max seconds)
+    max_error_rate: float
+    text: str
+
+
+def parse_slo(value: str) -> SLO:
+    """Parse an SLO like "p99<200ms,p50<50ms,errors<0.1%" """
+    latency: List[Tuple[float, float]] = []
+    max_error_rate = 1.0
+    for part in value.split(","):
+        part = part.strip().replace(" ", "")
+        match = re.fullmatch(r"p(\d+(?:\.\d+)?)<(\d+(?:\.\d+)?)(ms|s)", part)
+        if match:
+            pct = float(match.group(1))
+            # p999 means 99.9
+            if pct > 100:
+                pct = float(f"{match.group(1)[:2]}.{match.group(1)[2:]}")
+            seconds = float(match.group(2)) / (1000 if match.group(3) == "ms" else 1)
+            latency.append((pct, seconds))
+            continue
+        match = re.fullmatch(r"errors<(\d+(?:\.\d+)?)(%?)", part)
+        if match:
+            max_error_rate = float(match.group(1)) / (100 if match.group(2) else 1)
+            continue
+        raise ValueError(f"Invalid SLO term: {part}")
+    if not latency and max_error_rate >= 1.0:
+        raise ValueError(f"Empty SLO: {value}")
+    return SLO(latency, max_error_rate, value)
+
+
+class StepResult:
+    """Outcome of one fixed-rate step"""
+
+    def __init__(self, rate: float, duration: float):
+        self.rate = rate
+        self.duration = duration
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.dropped = 0
+        self.error_codes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def error_rate(self) -> float:
+        """Failed and dropped arrivals over all arrivals"""
+        arrivals = self.requests + self.dropped
+        return (self.errors + self.dropped) / arrivals if arrivals else 0.0
+
+    def achieved_rps(self) -> float:
+        """Completed requests per second"""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def violations(self, slo: SLO) -> List[str]:
+        """SLO terms this step broke"""
+        broken = []
+        for pct, limit in slo.latency:
+            value = self.histogram.percentile(pct)
+            if value > limit:
+                broken.append(f"p{pct:g}={value * 1000:.1f}ms")
+        if self.error_rate() > slo.max_error_rate:
+            broken.append(f"errors={self.error_rate() * 100:.2f}%")
+        # Falling behind the offered load is a failure even if latency looks fine
+        if self.achieved_rps() < self.rate * 0.9:
+            broken.append(f"achieved={self.achieved_rps():.1f}rps")
+        return broken
+
+    def to_dict(self, slo: SLO) -> Dict:
+        """Report row"""
+        return {
+            "rate": round(self.rate, 2),
+            "achieved_rps": round(self.achieved_rps(), 2),
+            "requests": self.requests,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "error_rate": f"{self.error_rate() * 100:.3f}%",
+            "p50": f"{self.histogram.percentile(50):.4f}s",
+            "p99": f"{self.histogram.percentile(99):.4f}s",
+            "violations": self.violations(slo),
+            "error_codes": self.error_codes,
+        }
+
+
+def find_knee(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Knee of a latency-vs-rate curve: the point farthest below the chord (Kneedle)"""
+    points = sorted(points)
+    if len(points) < 3:
+        return None
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    if x1 == x0 or y1 <= y0:
+        return None
+    best, best_gap = None, 0.0
+    for x, y in points[1:-1]:
+        nx, ny = (x - x0) / (x1 - x0), (y - y0) / (y1 - y0)
+        gap = nx - ny
+        if gap > best_gap:
+            best, best_gap = (x, y), gap
+    return best
+
+
+class CapacitySearch:
+    """Find the highest arrival rate a scenario sustains within an SLO"""
+
+    def __init__(
+        self,
+        send_request: Callable[[int], Tuple],
+        slo: SLO,
+        step_duration: float = 10.0,
+        start_rate: float = 10.0,
+        max_rate: float = 5000.0,
+        tolerance: float = 0.05,
+        repeats: int = 3,
+        max_in_flight: int = 512,
+        cooldown: float = 1.0,
+        is_success: Optional[Callable[[Tuple], bool]] = None,
+        profiler: Optional[StageProfiler] = None,
+    ):
+        self.send_request = send_request
+        self.slo = slo
+        self.step_duration = step_duration
+        self.start_rate = start_rate
+        self.max_rate = max_rate
+        self.tolerance = tolerance
+        self.repeats = repeats
+        self.max_in_flight = max_in_flight
+        self.cooldown = cooldown
+        self.is_success = is_success or (lambda result: result[2] in [200, 201])
+        self.profiler = profiler
+        self.steps: List[StepResult] = []
+        self.next_index = 0
+
+    def run_step(self, rate: float) -> StepResult:
+        """Offer `rate` requests/second open-loop for one step"""
+        step = StepResult(rate, self.step_duration)
+        lock = threading.Lock()
+        slots = threading.Semaphore(self.max_in_flight)
+        total = max(1, int(rate * self.step_duration))
+        interval = 1.0 / rate
+        stage = f"step-{len(self.steps) + 1}"
+        if self.profiler:
+            self.profiler.stage_started(stage, f"{rate:.1f}/s")
+
+        def task(index: int, scheduled: float):
+            try:
+                started = time.time()
+                result = self.send_request(index)
+                if result[2] == DROPPED:
+                    with lock:
+                        step.dropped += 1
+                    return
+                # Queueing before the send counts towards latency
+                latency = (started - scheduled) + result[1]
+                success = self.is_success(result)
+                with lock:
+                    step.requests += 1
+                    if success:
+                        step.histogram.record(latency)
+                    else:
+                        step.errors += 1
+                        status_key = str(result[2])
+                        step.error_codes[status_key] = step.error_codes.get(status_key, 0) + 1
+                    if self.profiler and step.requests % 50 == 0:
+                        self.profiler.observe(stage, step.histogram.percentile(99), step.histogram.count)
+            finally:
+                slots.release()
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for i in range(total):
+                scheduled = start_time + i * interval
+                delay = scheduled - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                # Harness saturated: the arrival is lost, not delayed
+                if not slots.acquire(blocking=False):
+                    step.dropped += 1
+                    continue
+                executor.submit(task, self.next_index, scheduled)
+                self.next_index += 1
+        step.elapsed = time.time() - start_time
+
+        self.steps.append(step)
+        broken = step.violations(self.slo)
+        flag = "pass ✓" if not broken else f"fail ✗ ({', '.join(broken)})"
+        print(
+            f"  rate {rate:>8.1f}/s  achieved {step.achieved_rps():>8.1f}/s  "
+            f"p50 {step.histogram.percentile(50) * 1000:>7.1f}ms  "
+            f"p99 {step.histogram.percentile(99) * 1000:>7.1f}ms  "
+            f"err {step.error_rate() * 100:>6.2f}%  {flag}", flush=True)
+        time.sleep(self.cooldown)
+        return step
+
+    def passes(self, rate: float) -> bool:
+        """Run one step and check it against the SLO"""
+        return not self.run_step(rate).violations(self.slo)
+
+    def run(self) -> Dict:
+        """Ramp, bisect and verify"""
+        print(f"\n{'='*70}")
+        print(f"Capacity Search")
+        print(f"{'='*70}")
+        print(f"SLO:           {self.slo.text}")
+        print(f"Step:          {self.step_duration:.0f}s, tolerance {self.tolerance * 100:.0f}%")
+        print(f"Rates:         {self.start_rate:g}/s .. {self.max_rate:g}/s")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+
+        # Phase 1: double the rate until the SLO breaks
+        print("Ramp:")
+        low, high = 0.0, None
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            if self.passes(rate):
+                low = rate
+                rate *= 2
+            else:
+                high = rate
+                break
+        if high is None:
+            high = self.max_rate
+            if low < self.max_rate and self.passes(self.max_rate):
+                low = self.max_rate
+
+        # Phase 2: bisect the bracket
+        if low < high and low > 0:
+            print("Bisection:")
+            while (high - low) / high > self.tolerance:
+                rate = (low + high) / 2
+                if self.passes(rate):
+                    low = rate
+                else:
+                    high = rate
+
+        # Phase 3: verify the candidate, backing off while it is flaky
+        capacity, confidence, verified = low, 0.0, []
+        if low > 0:
+            print("Verification:")
+            for _ in range(3):
+                verified = [self.run_step(capacity) for _ in range(self.repeats)]
+                confidence = sum(not s.violations(self.slo) for s in verified) / len(verified)
+                if confidence >= 2 / 3:
+                    break
+                capacity *= 1 - self.tolerance
+
+        return self.generate_report(capacity, confidence, verified, time.time() - start_time)
+
+    def generate_report(self, capacity: float, confidence: float, verified: List[StepResult],
+                        total_time: float) -> Dict:
+        """Summarize the search"""
+        knee = find_knee([(s.rate, s.histogram.percentile(99)) for s in self.steps if s.requests])
+        achieved = [s.achieved_rps() for s in verified]
+
+        stats = {
+            "summary": {
+                "slo": self.slo.text,
+                "max_sustainable_rps": round(capacity, 2),
+                "confidence": f"{confidence * 100:.0f}%",
+                "verification_runs": len(verified),
+                "achieved_rps_mean": f"{mean(achieved):.2f}" if achieved else "0",
+                "achieved_rps_stdev": f"{stdev(achieved):.2f}" if len(achieved) > 1 else "0",
+                "steps": len(self.steps),
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "knee": {"rate": round(knee[0], 2), "p99": f"{knee[1]:.4f}s"} if knee else None,
+            "steps": [s.to_dict(self.slo) for s in self.steps],
+        }
+        if self.profiler:
+            stats["profiles"] = self.profiler.finish()
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Capacity Results")
+        print(f"{'='*70}")
+        print(f"SLO:                {self.slo.text}")
+        if capacity > 0:
+            print(f"Max Sustainable:    {capacity:.1f} req/s")
+            print(f"Confidence:         {stats['summary']['confidence']} of {len(verified)} verification runs")
+            print(f"Achieved (mean):    {stats['summary']['achieved_rps_mean']} ± {stats['summary']['achieved_rps_stdev']} req/s")
+        else:
+            print(f"Max Sustainable:    none, {self.start_rate:g}/s already breaks the SLO")
+        if knee:
+            print(f"Latency Knee:       {knee[0]:.1f} req/s (p99 {knee[1] * 1000:.1f}ms)")
+        print(f"Steps Run:          {len(self.steps)}")
+        print(f"Total Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API
+Spawns the server per trial and measures, from the moment of the spawn:
+time to port open, first successful /health, first successful DB-backed
+request (a registration, which reads and writes the users table), and the
+latency of the first N requests against the steady state reached later in
+the same process (cold connection pool, JIT, first Argon2 calls).
+src/index.ts starts listening before SequelizeSingleton.connect() resolves,
+so the gap between /health and the first DB-backed success is the window in
+which early requests fail or stall.
+"""
+
+import requests
+import math
+import time
+import uuid
+import json
+import argparse
+from statistics import mean, median, stdev
+from typing import Dict, List, Optional
+from datetime import datetime
+import sys
+
+from server_process import DEFAULT_COMMAND, REPO_ROOT, ApiServer, parse_env_overrides
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class ColdStartTrial:
+    """One spawn of the server and its readiness milestones"""
+
+    def __init__(self, server: ApiServer, first_n: int, steady_n: int, warm_n: int):
+        self.server = server
+        self.url = server.url
+        self.first_n = first_n
+        self.steady_n = steady_n
+        self.warm_n = warm_n
+        self.db_attempts = 0
+        self.db_errors: Dict[str, int] = {}
+        self.first_login = 0.0
+
+    def register(self) -> bool:
+        """DB-backed probe: register a fresh user"""
+        unique_id = str(uuid.uuid4())[:8]
+        response = requests.post(
+            f"{self.url}/v1/auth/register",
+            json={
+                "email": f"coldstart-{unique_id}@stress-test.com",
+                "password": f"ColdStart123_{unique_id}",
+                "name": "Cold Start"
+            },
+            timeout=10
+        )
+        if response.status_code not in [200, 201]:
+            status_key = str(response.status_code)
+            self.db_errors[status_key] = self.db_errors.get(status_key, 0) + 1
+        return response.status_code in [200, 201]
+
+    def login_token(self) -> Optional[str]:
+        """Register and login one user for the authenticated DB reads"""
+        unique_id = str(uuid.uuid4())[:8]
+        user = {
+            "email": f"coldstart-reader-{unique_id}@stress-test.com",
+            "password": f"ColdStart123_{unique_id}",
+            "name": "Cold Start Reader"
+        }
+        requests.post(f"{self.url}/v1/auth/register", json=user, timeout=10)
+        start = time.time()
+        response = requests.post(
+            f"{self.url}/v1/auth/login",
+            json={"email": user["email"], "password": user["password"]},
+            timeout=10
+        )
+        self.first_login = time.time() - start
+        if response.status_code not in [200, 201]:
+            return None
+        return response.json()["data"]["accessToken"]
+
+    def timed_reads(self, session: requests.Session, token: str, count: int) -> List[float]:
+        """Sequential GET /v1/todo/list latencies"""
+        latencies = []
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(count):
+            start = time.time()
+            response = session.get(f"{self.url}/v1/todo/list", headers=headers, timeout=10)
+            elapsed = time.time() - start
+            if response.status_code == 200:
+                latencies.append(elapsed)
+        return latencies
+
+    def run(self) -> Dict:
+        """Spawn, probe the milestones, measure first-N vs steady state, stop"""
+        self.server.start()
+        try:
+            port_open = self.server.wait_for_port()
+            health, health_attempts = self.server.wait_for_health()
+            first_db, self.db_attempts = self.server.wait_until(self.register, interval=0.005)
+            db_logged = self.server.first_line("Database connection established")
+
+            token = self.login_token()
+            if token is None:
+                raise RuntimeError("login failed after the server became ready")
+
+            # A new connection like a freshly started client would open
+            session = requests.Session()
+            first = self.timed_reads(session, token, self.first_n)
+            self.timed_reads(session, token, self.warm_n)
+            steady = self.timed_reads(session, token, self.steady_n)
+        finally:
+            self.server.stop()
+
+        return {
+            "port_open": port_open,
+            "first_health": health,
+            "health_attempts": health_attempts,
+            "db_connected_log": db_logged,
+            "first_db_request": first_db,
+            "db_attempts": self.db_attempts,
+            "db_errors_before_ready": self.db_errors,
+            "first_login": self.first_login,
+            "first_n": first,
+            "steady": steady,
+        }
+
+
+class ColdStartBenchmark:
+    """Repeated cold-start trials"""
+
+    def __init__(self, url: str, command: str, cwd: str, env: Dict[str, str], trials: int,
+                 first_n: int, steady_n: int, warm_n: int, log_path: Optional[str]):
+        self.url = url
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.trials = trials
+        self.first_n = first_n
+        self.steady_n = steady_n
+        self.warm_n = warm_n
+        self.log_path = log_path
+        self.results: List[Dict] = []
+        self.failures: List[str] = []
+
+    def run(self) -> Dict:
+        """Execute all trials"""
+        print(f"\n{'='*70}")
+        print(f"API Cold-Start Benchmark")
+        print(f"{'='*70}")
+        print(f"Command:       {self.command} (in {self.cwd})")
+        print(f"URL:           {self.url}")
+        print(f"Trials:        {self.trials}")
+        print(f"First N:       {self.first_n} requests, steady state after {self.warm_n} more")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        for trial in range(self.trials):
+            server = ApiServer(self.url, command=self.command, cwd=self.cwd, env=self.env,
+                               log_path=self.log_path)
+            try:
+                result = ColdStartTrial(server, self.first_n, self.steady_n, self.warm_n).run()
+            except Exception as e:
+                self.failures.append(f"trial {trial + 1}: {e}")
+                print(f"Trial {trial + 1}: failed ({e})")
+                continue
+            self.results.append(result)
+            print(
+                f"Trial {trial + 1}: port {result['port_open'] * 1000:.0f}ms  "
+                f"/health {result['first_health'] * 1000:.0f}ms  "
+                f"first DB {result['first_db_request'] * 1000:.0f}ms "
+                f"({result['db_attempts']} attempts)  "
+                f"first-N p50 {median(result['first_n']) * 1000 if result['first_n'] else 0:.1f}ms  "
+                f"steady p50 {median(result['steady']) * 1000 if result['steady'] else 0:.1f}ms",
+                flush=True)
+
+        return self.generate_report(time.time() - start_time)
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Aggregate the milestones over trials"""
+
+        def summarize(values: List[float]) -> Dict[str, str]:
+            if not values:
+                return {}
+            row = {
+                "min": f"{min(values):.3f}s",
+                "median": f"{median(values):.3f}s",
+                "max": f"{max(values):.3f}s",
+            }
+            if len(values) > 1:
+                row["stdev"] = f"{stdev(values):.3f}s"
+            return row
+
+        first = [latency for r in self.results for latency in r["first_n"]]
+        steady = [latency for r in self.results for latency in r["steady"]]
+        # Request position i across trials: where the cold penalty fades out
+        by_position = [
+            median([r["first_n"][i] for r in self.results if i < len(r["first_n"])])
+            for i in range(self.first_n)
+            if any(i < len(r["first_n"]) for r in self.results)
+        ]
+
+        stats = {
+            "summary": {
+                "trials": self.trials,
+                "successful_trials": len(self.results),
+                "failed_trials": len(self.failures),
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "milestones": {
+                "port_open": summarize([r["port_open"] for r in self.results]),
+                "first_health": summarize([r["first_health"] for r in self.results]),
+                "db_connected_log": summarize([r["db_connected_log"] for r in self.results
+                                               if r["db_connected_log"] is not None]),
+                "first_db_request": summarize([r["first_db_request"] for r in self.results]),
+                "health_to_db_gap": summarize([r["first_db_request"] - r["first_health"] for r in self.results]),
+                "first_login": summarize([r["first_login"] for r in self.results]),
+            },
+            "db_errors_before_ready": {},
+            "first_n_vs_steady": {
+                "first_n": {
+                    "p50": f"{percentile(first, 50):.4f}s",
+                    "p99": f"{percentile(first, 99):.4f}s",
+                    "max": f"{max(first):.4f}s" if first else "0",
+                    "mean": f"{mean(first):.4f}s" if first else "0",
+                },
+                "steady": {
+                    "p50": f"{percentile(steady, 50):.4f}s",
+                    "p99": f"{percentile(steady, 99):.4f}s",
+                    "max": f"{max(steady):.4f}s" if steady else "0",
+                    "mean": f"{mean(steady):.4f}s" if steady else "0",
+                },
+                "cold_penalty_p50": f"{(percentile(first, 50) / percentile(steady, 50)) if steady and percentile(steady, 50) else 0:.2f}x",
+                "median_by_position": [f"{value:.4f}s" for value in by_position],
+            },
+            "failures": self.failures,
+        }
+        for result in self.results:
+            for code, count in result["db_errors_before_ready"].items():
+                stats["db_errors_before_ready"][code] = stats["db_errors_before_ready"].get(code, 0) + count
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Cold-Start Results ({len(self.results)}/{self.trials} trials)")
+        print(f"{'='*70}")
+        print(f"{'Milestone':<22} {'Min':>9} {'Median':>9} {'Max':>9}")
+        for name, row in stats["milestones"].items():
+            if row:
+                print(f"{name:<22} {row['min']:>9} {row['median']:>9} {row['max']:>9}")
+
+        if stats["db_errors_before_ready"]:
+            print(f"\nDB-backed requests failing before ready:")
+            for code, count in stats["db_errors_before_ready"].items():
+                print(f"  Status {code}: {count} requests")
+
+        cold = stats["first_n_vs_steady"]
+        print(f"\nFirst {self.first_n} vs Steady State (GET /v1/todo/list):")
+        print(f"  First N p50/p99:  {cold['first_n']['p50']} / {cold['first_n']['p99']}")
+        print(f"  Steady p50/p99:   {cold['steady']['p50']} / {cold['steady']['p99']}")
+        print(f"  Cold penalty p50: {cold['cold_penalty_p50']}")
+
+        for failure in self.failures:
+            print(f"\n✗ {failure}")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cold-start and time-to-first-request benchmark (spawns the API per trial)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  npm run build && python cold-start.py --trials 10
+  python cold-start.py --command "npx tsx src/index.ts" --trials 5
+  python cold-start.py --env NODE_ENV=production --first-n 100
+        """
+    )
+
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=5,
+        help="Number of server spawns (default: 5)"
+    )
+    parser.add_argument(
+        "--first-n",
+        type=int,
+        default=50,
+        help="Requests measured right after readiness (default: 50)"
+    )
+    parser.add_argument(
+        "--warm",
+        type=int,
+        default=500,
+        help="Unmeasured requests between the first N and the steady state (default: 500)"
+    )
+    parser.add_argument(
+        "--steady",
+        type=int,
+        default=200,
+        help="Steady-state requests measured after warm-up (default: 200)"
+    )
+    parser.add_argument(
+        "--command",
+        type=str,
+        default=DEFAULT_COMMAND,
+        help=f"Command that starts the API (default: {DEFAULT_COMMAND})"
+    )
+    parser.add_argument(
+        "--cwd",
+        type=str,
+        default=REPO_ROOT,
+        help="Working directory for the command (default: repository root)"
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        help="Environment override for the server, KEY=VALUE (repeatable)"
+    )
+    parser.add_argument(
+        "--server-log",
+        type=str,
+        default=None,
+        help="Append timestamped server output to this file (default: not kept)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL the spawned API listens on; its port is passed as PORT (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.trials < 1:
+        print("Error: trials must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.first_n < 1 or args.steady < 1 or args.warm < 0:
+        print("Error: first-n and steady must be >= 1, warm >= 0", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        env = parse_env_overrides(args.env)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        report = ColdStartBenchmark(
+            url=args.url,
+            command=args.command,
+            cwd=args.cwd,
+            env=env,
+            trials=args.trials,
+            first_n=args.first_n,
+            steady_n=args.steady,
+            warm_n=args.warm,
+            log_path=args.server_log
+        ).run()
+
+        # Save report to file
+        report_file = f"cold_start_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Local TCP fault-injection proxy for the stress scripts
+Sits between the harness and the API and makes loopback connections behave
+like slow or flaky mobile clients: every chunk is delayed by a one-way
+latency, each direction is paced to a bandwidth limit, writes are split into
+small partial writes (so express.json() sees a body trickle in), and a share
+of connections is reset (RST) part-way through their first request. The
+proxy runs an asyncio loop in a background thread; each FaultProxy listens on
+its own port, so healthy clients can use a fault-free proxy on another port
+and pay the same proxy overhead.
+"""
+
+import asyncio
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class FaultProfile(NamedTuple):
+    latency: float = 0.0  # one-way delay per chunk, seconds
+    bandwidth: Optional[float] = None  # bytes/second per connection and direction, None = unlimited
+    chunk_size: int = 0  # split writes into pieces of this many bytes, 0 = forward as read
+    reset_rate: float = 0.0  # share of connections reset during their first request
+
+    def describe(self) -> str:
+        parts = []
+        if self.latency:
+            parts.append(f"latency {self.latency * 1000:.0f}ms")
+        if self.bandwidth:
+            parts.append(f"bandwidth {self.bandwidth / 1024:g} KiB/s")
+        if self.chunk_size:
+            parts.append(f"{self.chunk_size}B partial writes")
+        if self.reset_rate:
+            parts.append(f"{self.reset_rate * 100:g}% resets")
+        return ", ".join(parts) or "no faults"
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like 512, 4KB, 1.5MB (binary units) into bytes"""
+    text = value.strip().upper().rstrip("B").rstrip("I")
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(float(text))
+    except ValueError:
+        raise ValueError(f"Invalid size: {value}")
+
+
+def split_url(url: str) -> Tuple[str, int]:
+    """Host and port of an http URL"""
+    parsed = urlparse(url)
+    return parsed.hostname or "localhost", parsed.port or 80
+
+
+class FaultProxy:
+    """TCP proxy applying one FaultProfile to every connection it accepts"""
+
+    def __init__(self, upstream_url: str, profile: FaultProfile = FaultProfile(),
+                 listen_host: str = "127.0.0.1", listen_port: int = 0, seed: Optional[int] = None):
+        self.upstream_host, self.upstream_port = split_url(upstream_url)
+        self.profile = profile
+        self.listen_host = listen_host
+        self.port = listen_port
+        self.random = random.Random(seed)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.stats = {
+            "connections": 0,
+            "active": 0,
+            "peak_active": 0,
+            "resets": 0,
+            "upstream_failures": 0,
+            "bytes_up": 0,
+            "bytes_down": 0,
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.listen_host}:{self.port}"
+
+    def start(self) -> "FaultProxy":
+        """Start listening; returns once the port is bound"""
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            raise RuntimeError(f"fault proxy failed to start: {self.error}")
+        return self
+
+    def serve(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle, self.listen_host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        self.loop.run_forever()
+        # Tear down keep-alive connections that are still open
+        self.server.close()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def stop(self):
+        """Stop accepting and shut the loop down"""
+        if self.loop and self.thread and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
+
+    def summary(self) -> Dict:
+        return {"profile": self.profile.describe(), **self.stats}
+
+    async def handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        """Connection callback; open connections are cancelled when the proxy stops"""
+        try:
+            await self.relay(client_reader, client_writer)
+        except asyncio.CancelledError:
+            pass
+
+    async def relay(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        """Pipe one connection through the faults in both directions"""
+        self.stats["connections"] += 1
+        self.stats["active"] += 1
+        self.stats["peak_active"] = max(self.stats["peak_active"], self.stats["active"])
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+        except OSError:
+            self.stats["upstream_failures"] += 1
+            self.stats["active"] -= 1
+            client_writer.close()
+            return
+
+        doomed = self.random.random() < self.profile.reset_rate
+        reset = asyncio.Event()
+        up = asyncio.ensure_future(self.pipe(client_reader, upstream_writer, "bytes_up", reset if doomed else None))
+        down = asyncio.ensure_future(self.pipe(upstream_reader, client_writer, "bytes_down", None))
+        watcher = asyncio.ensure_future(reset.wait())
+        try:
+            done, _ = await asyncio.wait({up, down, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if watcher in done:
+                self.stats["resets"] += 1
+                for writer in (client_writer, upstream_writer):
+                    self.abort(writer)
+            else:
+                # One side finished: let the other flush what it already read
+                await asyncio.wait({up, down}, timeout=30)
+        finally:
+            for task in (up, down, watcher):
+                task.cancel()
+            for writer in (client_writer, upstream_writer):
+                if not writer.is_closing():
+                    writer.close()
+            self.stats["active"] -= 1
+
+    @staticmethod
+    def abort(writer: asyncio.StreamWriter):
+        """Close with an RST instead of a FIN"""
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            except OSError:
+                pass
+        writer.transport.abort()
+
+    async def pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, counter: str,
+                   reset: Optional[asyncio.Event]):
+        """Forward one direction: delayed, paced and split; a doomed connection dies mid-request"""
+        profile = self.profile
+        # Chunks keep their arrival order, each one is due `latency` after it was read
+        queue: "asyncio.Queue[Tuple[float, bytes]]" = asyncio.Queue()
+
+        async def read():
+            while True:
+                try:
+                    data = await reader.read(65536)
+                except (ConnectionError, OSError):
+                    data = b""
+                await queue.put((time.monotonic() + profile.latency, data))
+                if not data:
+                    return
+
+        reading = asyncio.ensure_future(read())
+        try:
+            while True:
+                due, data = await queue.get()
+                if not data:
+                    if writer.can_write_eof():
+                        writer.write_eof()
+                    return
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if reset is not None:
+                    # Forward part of the first request, then reset the connection
+                    data = data[:self.random.randint(0, max(0, len(data) - 1))]
+                    if not data:
+                        reset.set()
+                        return
+                step = profile.chunk_size or len(data)
+                for offset in range(0, len(data), step):
+                    piece = data[offset:offset + step]
+                    writer.write(piece)
+                    await writer.drain()
+                    self.stats[counter] += len(piece)
+                    if profile.bandwidth:
+                        await asyncio.sleep(len(piece) / profile.bandwidth)
+                if reset is not None:
+                    reset.set()
+                    return
+        except (ConnectionError, OSError):
+            return
+        finally:
+            reading.cancel()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Hot-row contention scenario for PATCH /v1/todo/list/:id
+Concentrates a configurable fraction of PATCH traffic onto a small set of hot
+todos, stepping from uniform (0) to every request on the hot set (1.0), and
+reports throughput and tail latency per contention ratio.
+Every PATCH writes a unique name, so the returned bodies and a final read of
+each contended todo can be checked against the real order of the writes:
+- foreign body: the response shows another request's name, the row changed
+  between the UPDATE and the findByPk that re-reads it
+- stale body: the response shows a write that had already been overwritten
+  by another acknowledged write before this request was sent
+- lost update: the final name belongs to a write that another acknowledged
+  write started after, so that later write is gone
+"""
+
+import requests
+import bisect
+import random
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, encode_body, todo_renderer
+from soak import LatencyHistogram
+
+
+class Write(NamedTuple):
+    name: str
+    todo: int
+    started: float
+    done: float
+    returned: Optional[str]
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"hotrow-{index}-{unique_id}@stress-test.com",
+            "password": f"HotRowPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class SetupPhase:
+    """Setup phase: register and login users and create their todos"""
+
+    def __init__(self, base_url: str, num_users: int, todos_per_user: int, concurrency: int):
+        self.base_url = base_url
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.concurrency = concurrency
+        self.user_generator = UserGenerator()
+        self.render_todo = todo_renderer("Hot row todo")
+        self.todos: List[Dict] = []
+        self.errors = 0
+
+    def send_request(self, index: int) -> Tuple[int, List[Dict]]:
+        """Register, login and create the todos of one user"""
+        user = self.user_generator.generate(index)
+
+        try:
+            response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+            if response.status_code not in [200, 201]:
+                return (index, [])
+
+            response = requests.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user["email"], "password": user["password"]},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return (index, [])
+
+            # PATCH is owner-only: each todo keeps its owner's token
+            headers = {"Authorization": f"Bearer {response.json()['data']['accessToken']}", **JSON_HEADERS}
+            todos = []
+            for i in range(self.todos_per_user):
+                response = requests.post(
+                    f"{self.base_url}/v1/todo/create",
+                    data=self.render_todo(index * self.todos_per_user + i)[0],
+                    headers=headers,
+                    timeout=10
+                )
+                if response.status_code in [200, 201]:
+                    todos.append({"id": response.json()["data"]["id"], "headers": headers})
+
+            return (index, todos)
+        except Exception:
+            return (index, [])
+
+    def run(self) -> List[Dict]:
+        """Create all todos"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Todos")
+        print(f"{'='*70}")
+        print(f"Users to create: {self.num_users}")
+        print(f"Todos per user:  {self.todos_per_user}")
+        print(f"Concurrency:     {self.concurrency}")
+        print(f"{'='*70}\n")
+
+        completed = 0
+        start_time = time.time()
+        todos_by_index: Dict[int, List[Dict]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.send_request, i) for i in range(self.num_users)]
+            for future in as_completed(futures):
+                index, todos = future.result()
+                completed += 1
+                if todos:
+                    todos_by_index[index] = todos
+                else:
+                    self.errors += 1
+
+                progress = (completed / self.num_users) * 100
+                bar_length = 40
+                filled = int(bar_length * completed // self.num_users)
+                bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                print(
+                    f"\r{bar} {progress:.1f}% ({completed}/{self.num_users})", end="", flush=True)
+
+        self.todos = [todo for i in sorted(todos_by_index) for todo in todos_by_index[i]]
+
+        print(f"\n\nSetup completed in {time.time() - start_time:.2f}s")
+        print(f"Todos ready: {len(self.todos)}/{self.num_users * self.todos_per_user}")
+        if self.errors > 0:
+            print(f"Errors: {self.errors}")
+
+        return self.todos
+
+
+def check_writes(writes: List[Write], final_names: Dict[int, Optional[str]]) -> Dict[str, int]:
+    """Foreign/stale response bodies and lost updates, from the real order of acknowledged writes"""
+    by_name = {w.name: w for w in writes}
+    by_todo: Dict[int, List[Write]] = {}
+    for w in writes:
+        by_todo.setdefault(w.todo, []).append(w)
+
+    foreign = stale = lost_rows = lost_writes = 0
+    for todo, todo_writes in by_todo.items():
+        # Prefix max of start times over writes ordered by completion
+        ordered = sorted(todo_writes, key=lambda w: w.done)
+        done_times = [w.done for w in ordered]
+        latest_start = []
+        for w in ordered:
+            latest_start.append(max(w.started, latest_start[-1]) if latest_start else w.started)
+
+        def superseded_before(write: Write, moment: float) -> bool:
+            """Another write started after `write` finished and itself finished before `moment`"""
+            count = bisect.bisect_left(done_times, moment)
+            return count > 0 and latest_start[count - 1] > write.done
+
+        for w in todo_writes:
+            if w.returned is None or w.returned == w.name:
+                continue
+            foreign += 1
+            seen = by_name.get(w.returned)
+            if seen is not None and superseded_before(seen, w.started):
+                stale += 1
+
+        final = by_name.get(final_names.get(todo))
+        if final is not None:
+            later = sum(1 for w in todo_writes if w.started > final.done)
+            if later:
+                lost_rows += 1
+                lost_writes += later
+
+    return {"foreign_bodies": foreign, "stale_bodies": stale, "lost_rows": lost_rows, "lost_writes": lost_writes}
+
+
+class HotRowContention:
+    """PATCH traffic with a growing share on the hot todos"""
+
+    def __init__(self, base_url: str, todos: List[Dict], hot_rows: int, hot_fractions: List[float],
+                 num_requests: int, concurrency: int, seed: int):
+        self.base_url = base_url
+        self.todos = todos
+        self.hot_rows = hot_rows
+        self.hot_fractions = hot_fractions
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.seed = seed
+        self.steps: List[Dict] = []
+
+    def endpoint(self, todo: int) -> str:
+        return f"{self.base_url}/v1/todo/list/{self.todos[todo]['id']}"
+
+    def send_request(self, index: int, todo: int, name: str) -> Tuple[int, float, int, Optional[Write]]:
+        """PATCH one todo to a unique name"""
+        try:
+            start = time.time()
+            response = requests.patch(
+                self.endpoint(todo),
+                data=encode_body({"name": name}),
+                headers=self.todos[todo]["headers"],
+                timeout=10
+            )
+            done = time.time()
+            if response.status_code not in [200, 201]:
+                return (index, done - start, response.status_code, None)
+            returned = response.json()["data"]["name"]
+            return (index, done - start, response.status_code, Write(name, todo, start, done, returned))
+        except requests.exceptions.Timeout:
+            return (index, 10.0, -1, None)
+        except Exception:
+            return (index, 0.0, -1, None)
+
+    def read_name(self, todo: int) -> Optional[str]:
+        """Current name of a todo"""
+        try:
+            response = requests.get(self.endpoint(todo), headers=self.todos[todo]["headers"], timeout=10)
+            return response.json()["data"]["name"] if response.status_code == 200 else None
+        except Exception:
+            return None
+
+    def run_step(self, step: int, hot_fraction: float) -> Dict:
+        """One contention ratio"""
+        rng = random.Random(self.seed + step)
+        targets = [
+            rng.randrange(self.hot_rows) if rng.random() < hot_fraction else rng.randrange(len(self.todos))
+            for _ in range(self.num_requests)
+        ]
+        histogram = LatencyHistogram()
+        writes: List[Write] = []
+        error_codes: Dict[str, int] = {}
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(self.send_request, i, todo, f"hot {step}-{i}")
+                for i, todo in enumerate(targets)
+            ]
+            for future in as_completed(futures):
+                index, elapsed, status_code, write = future.result()
+                if write:
+                    histogram.record(elapsed)
+                    writes.append(write)
+                else:
+                    status_key = str(status_code)
+                    error_codes[status_key] = error_codes.get(status_key, 0) + 1
+        elapsed = time.time() - start_time
+
+        # Only rows written more than once can lose an update
+        counts: Dict[int, int] = {}
+        for w in writes:
+            counts[w.todo] = counts.get(w.todo, 0) + 1
+        final_names = {todo: self.read_name(todo) for todo, count in counts.items() if count > 1}
+        anomalies = check_writes(writes, final_names)
+
+        result = {
+            "hot_fraction": hot_fraction,
+            "requests": self.num_requests,
+            "successful": len(writes),
+            "failed": self.num_requests - len(writes),
+            "requests_per_second": round(self.num_requests / elapsed, 2),
+            "p50": f"{histogram.percentile(50):.4f}s",
+            "p99": f"{histogram.percentile(99):.4f}s",
+            "max": f"{histogram.max:.4f}s",
+            "hottest_row_share": f"{max(counts.values()) / len(writes) * 100:.1f}%" if writes else "0%",
+            **anomalies,
+            "errors": error_codes,
+        }
+        print(
+            f"  hot {hot_fraction * 100:>5.1f}%  {result['requests_per_second']:>8.1f} req/s  "
+            f"p50 {histogram.percentile(50) * 1000:>7.1f}ms  p99 {histogram.percentile(99) * 1000:>7.1f}ms  "
+            f"foreign {anomalies['foreign_bodies']:>4}  stale {anomalies['stale_bodies']:>4}  "
+            f"lost {anomalies['lost_writes']:>4}  err {result['failed']}", flush=True)
+        return result
+
+    def run(self) -> Dict:
+        """Execute every contention ratio"""
+        print(f"\n{'='*70}")
+        print(f"Hot-Row Contention: PATCH /v1/todo/list/:id")
+        print(f"{'='*70}")
+        print(f"Todos:         {len(self.todos)} ({self.hot_rows} hot)")
+        print(f"Hot Fractions: {', '.join(f'{f:g}' for f in self.hot_fractions)}")
+        print(f"Requests:      {self.num_requests} per step")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        for step, hot_fraction in enumerate(self.hot_fractions):
+            self.steps.append(self.run_step(step, hot_fraction))
+
+        return self.generate_report(time.time() - start_time)
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Throughput, tail latency and anomalies per contention ratio"""
+        stats = {
+            "summary": {
+                "todos": len(self.todos),
+                "hot_rows": self.hot_rows,
+                "requests_per_step": self.num_requests,
+                "concurrency": self.concurrency,
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "steps": self.steps,
+        }
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Hot-Row Contention Results")
+        print(f"{'='*70}")
+        print(f"{'Hot':>6} {'Top row':>8} {'Req/s':>9} {'P50':>9} {'P99':>9} {'Foreign':>8} {'Stale':>6} {'Lost':>6} {'Errors':>7}")
+        for s in self.steps:
+            print(
+                f"{s['hot_fraction'] * 100:>5.1f}% {s['hottest_row_share']:>8} {s['requests_per_second']:>9.1f} "
+                f"{s['p50']:>9} {s['p99']:>9} {s['foreign_bodies']:>8} {s['stale_bodies']:>6} "
+                f"{s['lost_writes']:>6} {s['failed']:>7}")
+        print(f"\nForeign: response shows another request's write (UPDATE then re-read is not atomic)")
+        print(f"Stale:   response shows a write already overwritten before the request was sent")
+        print(f"Lost:    acknowledged writes missing from the final value of their todo")
+        print(f"\nTotal Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hot-row contention scenario for PATCH /v1/todo/list/:id",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python hot-row-contention.py --hot-fractions 0,0.5,0.9,1.0 --hot-rows 1
+  python hot-row-contention.py -u 20 --todos-per-user 50 --hot-rows 5 -r 5000 -c 100
+        """
+    )
+
+    parser.add_argument(
+        "-u", "--users",
+        type=int,
+        default=10,
+        help="Number of todo owners to set up first (default: 10)"
+    )
+    parser.add_argument(
+        "--todos-per-user",
+        type=int,
+        default=20,
+        help="Todos created per owner during setup (default: 20)"
+    )
+    parser.add_argument(
+        "--hot-rows",
+        type=int,
+        default=1,
+        help="Size of the hot set of todos (default: 1)"
+    )
+    parser.add_argument(
+        "--hot-fractions",
+        type=str,
+        default="0,0.5,0.9,1.0",
+        help="Comma-separated shares of PATCH traffic sent to the hot set, 0 = uniform (default: 0,0.5,0.9,1.0)"
+    )
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=2000,
+        help="PATCH requests per hot fraction (default: 2000)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=50,
+        help="Number of concurrent requests (default: 50)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Seed of the todo choice per request (default: 1)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.users < 1 or args.todos_per_user < 1:
+        print("Error: users and todos-per-user must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.hot_rows < 1:
+        print("Error: hot-rows must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.requests < 1:
+        print("Error: requests must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    try:
+        hot_fractions = [float(part) for part in args.hot_fractions.split(",") if part.strip()]
+        if not hot_fractions or any(not 0 <= f <= 1 for f in hot_fractions):
+            raise ValueError(f"hot-fractions must be between 0 and 1: {args.hot_fractions}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        todos = SetupPhase(
+            base_url=args.url,
+            num_users=args.users,
+            todos_per_user=args.todos_per_user,
+            concurrency=min(args.users, 25)
+        ).run()
+
+        if len(todos) < args.hot_rows:
+            print(
+                f"Error: Only {len(todos)} todos were created, fewer than --hot-rows. Cannot proceed.", file=sys.stderr)
+            sys.exit(1)
+
+        report = HotRowContention(
+            base_url=args.url,
+            todos=todos,
+            hot_rows=args.hot_rows,
+            hot_fractions=hot_fractions,
+            num_requests=args.requests,
+            concurrency=args.concurrency,
+            seed=args.seed
+        ).run()
+
+        # Save report to file
+        report_file = f"hot_row_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
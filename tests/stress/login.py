@@ -6,16 +6,26 @@ First registers test users, then performs login stress testing
 """
 
 import requests
+import random
 import time
 import uuid
 import json
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from statistics import mean, stdev, median
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from datetime import datetime
 import sys
 
+from capacity_search import CapacitySearch, parse_slo
+from payload_factory import JSON_HEADERS, PayloadFactory, login_arena, register_renderer
+from profiler import build_profiler
+from server_timing import ServerTimingCollector
+from soak import SoakRunner, parse_duration
+from trace_replay import TraceRecorder, TraceReplayer, check_trace_setup, read_trace_header, request_seed, seeded_unique_id
+from trials import TrialRunner, parse_warmup
+from validation import ResponseValidator
+
 
 class UserGenerator:
     """Generate unique user credentials for testing"""
@@ -23,9 +33,9 @@ class UserGenerator:
     def __init__(self):
         self.users: List[Dict[str, str]] = []
 
-    def generate(self, index: int) -> Dict[str, str]:
-        """Generate unique user data"""
-        unique_id = str(uuid.uuid4())[:8]
+    def generate(self, index: int, seed: Optional[int] = None) -> Dict[str, str]:
+        """Generate unique user data (deterministic when seeded)"""
+        unique_id = seeded_unique_id(seed) if seed is not None else str(uuid.uuid4())[:8]
         return {
             "email": f"logintest-{index}-{unique_id}@stress-test.com",
             "password": f"LoginPass123_{unique_id}",
@@ -40,29 +50,42 @@ class UserGenerator:
 class RegistrationPhase:
     """Setup phase: Register test users"""
 
-    def __init__(self, base_url: str, num_users: int, concurrency: int):
+    def __init__(self, base_url: str, num_users: int, concurrency: int, base_seed: Optional[int] = None):
         self.base_url = base_url
         self.endpoint = f"{base_url}/v1/auth/register"
         self.num_users = num_users
         self.concurrency = concurrency
+        self.base_seed = base_seed
         self.user_generator = UserGenerator()
+        self.payloads = PayloadFactory(
+            register_renderer(lambda index: self.user_generator.generate(index, self.payload_seed(index))),
+            total=num_users
+        )
         self.registered_users: List[Dict[str, str]] = []
         self.errors = 0
 
+    def payload_seed(self, index: int) -> Optional[int]:
+        """Payload seed of a setup user in seeded runs"""
+        return request_seed(self.base_seed, "setup-register", index) if self.base_seed is not None else None
+
     def send_request(self, index: int) -> Tuple[int, bool, str]:
         """Register a single user"""
-        user = self.user_generator.generate(index)
+        seed = self.payload_seed(index)
+        body, user = self.payloads.get(index)
 
         try:
             start = time.time()
             response = requests.post(
                 self.endpoint,
-                json=user,
+                data=body,
+                headers=JSON_HEADERS,
                 timeout=10
             )
             elapsed = time.time() - start
 
-            is_success = response.status_code in [200, 201]
+            # Seeded users are reproducible, so a 409 means a previous run created them
+            is_success = response.status_code in [200, 201] or (
+                seed is not None and response.status_code == 409)
             if is_success:
                 self.registered_users.append(user)
 
@@ -113,18 +136,29 @@ class RegistrationPhase:
         if self.errors > 0:
             print(f"Errors: {self.errors}")
 
+        # Stable order so replays map request indexes onto the same users
+        self.registered_users.sort(key=lambda user: user["email"])
         return self.registered_users
 
 
 class LoginStressTest:
     """Login stress testing phase"""
 
-    def __init__(self, base_url: str, num_requests: int, concurrency: int, users: List[Dict[str, str]]):
+    def __init__(self, base_url: str, num_requests: int, concurrency: int, users: List[Dict[str, str]],
+                 base_seed: Optional[int] = None, recorder: Optional[TraceRecorder] = None,
+                 validator: Optional[ResponseValidator] = None,
+                 timing: Optional[ServerTimingCollector] = None):
         self.base_url = base_url
         self.endpoint = f"{base_url}/v1/auth/login"
         self.num_requests = num_requests
         self.concurrency = concurrency
         self.users = users
+        # Login bodies are encoded once up front, workers only slice bytes
+        self.login_bodies = login_arena(users)
+        self.base_seed = base_seed
+        self.recorder = recorder
+        self.validator = validator
+        self.timing = timing
         self.results = {
             "success": [],
             "failed": [],
@@ -133,27 +167,33 @@ class LoginStressTest:
         self.start_time = None
         self.end_time = None
 
-    def send_request(self, index: int) -> Tuple[int, float, int, str]:
+    def send_request(self, index: int, seed: Optional[int] = None) -> Tuple[int, float, int, str]:
         """Send a single login request"""
         if not self.users:
             return (index, 0.0, -1, "No users available")
 
-        # Cycle through registered users
-        user = self.users[index % len(self.users)]
+        if seed is None and self.base_seed is not None:
+            seed = request_seed(self.base_seed, "login", index)
+        if self.recorder:
+            self.recorder.record(index, seed)
+
+        # Cycle through registered users; login bodies are fixed at setup, the seed is only recorded
+        body = self.login_bodies[index % len(self.users)]
 
         try:
             start = time.time()
             response = requests.post(
                 self.endpoint,
-                json={
-                    "email": user["email"],
-                    "password": user["password"]
-                },
+                data=body,
+                headers=JSON_HEADERS,
                 timeout=10
             )
             elapsed = time.time() - start
+            status_code = self.validator.status("login", response, email=self.users[index % len(self.users)]["email"]) if self.validator else response.status_code
+            if self.timing:
+                self.timing.record(response, elapsed)
 
-            return (index, elapsed, response.status_code, response.text)
+            return (index, elapsed, status_code, response.text)
         except requests.exceptions.Timeout:
             return (index, 10.0, -1, "Timeout")
         except requests.exceptions.ConnectionError:
@@ -225,6 +265,27 @@ class LoginStressTest:
 
         return self.generate_report()
 
+    def replay(self, replayer: TraceReplayer) -> Dict:
+        """Replay a recorded trace instead of the fixed request loop"""
+        print(f"\n{'='*70}")
+        print(f"Login Endpoint Trace Replay")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.endpoint}")
+        print(f"Trace:         {replayer.path} ({replayer.total} requests)")
+        print(f"Speed:         {replayer.speed}x")
+        print(f"{'='*70}\n")
+
+        self.start_time = time.time()
+        replayer.run(
+            lambda index, event: self.send_request(event.index, seed=event.seed),
+            lambda result: self.process_response(*result)
+        )
+        self.end_time = time.time()
+
+        report = self.generate_report()
+        report["replay"] = replayer.summary()
+        return report
+
     def generate_report(self) -> Dict:
         """Generate test report with statistics"""
         total_time = self.end_time - self.start_time
@@ -280,6 +341,14 @@ class LoginStressTest:
                 print(
                     f"  Std Dev:          {stats['response_times']['stdev']}")
 
+        if self.validator:
+            stats["validation"] = self.validator.summary()
+            self.validator.print_summary()
+
+        if self.timing:
+            stats["server_timing"] = self.timing.summary()
+            self.timing.print_summary()
+
         if stats['errors']:
             print(f"\nError Distribution:")
             for code, count in stats['errors'].items():
@@ -327,6 +396,136 @@ Examples:
         default="http://localhost:3001",
         help="Base URL of the API (default: http://localhost:3001)"
     )
+    parser.add_argument(
+        "--duration",
+        type=str,
+        default=None,
+        help="Soak mode: run for a fixed duration (e.g. 4h, 30m, 90s) instead of a request count"
+    )
+    parser.add_argument(
+        "--window",
+        type=str,
+        default="60s",
+        help="Soak mode metrics window (default: 60s)"
+    )
+    parser.add_argument(
+        "--pids",
+        type=str,
+        default="",
+        help="Soak mode: comma-separated server PIDs whose RSS is sampled (default: none)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Base seed for deterministic payloads instead of uuid4 (default: random)"
+    )
+    parser.add_argument(
+        "--record-trace",
+        type=str,
+        default=None,
+        help="Record the measured requests (send offset, step, index, payload seed) to a trace file"
+    )
+    parser.add_argument(
+        "--replay-trace",
+        type=str,
+        default=None,
+        help="Replay a recorded trace instead of --requests"
+    )
+    parser.add_argument(
+        "--validate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of 2xx responses checked against the API contract, failures count as invalid_2xx (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--server-timing",
+        action="store_true",
+        help="Break latency down by the API's Server-Timing phases (start the API with SERVER_TIMING=true)"
+    )
+    parser.add_argument(
+        "--find-capacity",
+        action="store_true",
+        help="Search the highest sustainable request rate under --slo instead of a fixed --requests run"
+    )
+    parser.add_argument(
+        "--slo",
+        type=str,
+        default="p99<200ms,errors<0.1%",
+        help="Capacity search SLO (default: p99<200ms,errors<0.1%%)"
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=str,
+        default="10s",
+        help="Capacity search duration of each fixed-rate step (default: 10s)"
+    )
+    parser.add_argument(
+        "--start-rate",
+        type=float,
+        default=10.0,
+        help="Capacity search first arrival rate in req/s (default: 10)"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=5000.0,
+        help="Capacity search upper bound in req/s (default: 5000)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Capacity search verification runs at the result (default: 3)"
+    )
+    parser.add_argument(
+        "--profile-inspect",
+        type=str,
+        default=None,
+        help="Inspector URL of an API started with node --inspect (e.g. http://127.0.0.1:9229), enables profiling in capacity mode"
+    )
+    parser.add_argument(
+        "--profile-stages",
+        type=str,
+        default=None,
+        help="Comma-separated stages profiled when they start: capacity search steps step-1, step-2, ..., or all"
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=str,
+        default=None,
+        help="Profile a stage once its running p99 exceeds this, e.g. 200ms"
+    )
+    parser.add_argument(
+        "--profile-window",
+        type=str,
+        default="5s",
+        help="CPU profile length per capture (default: 5s)"
+    )
+    parser.add_argument(
+        "--heap-snapshot",
+        action="store_true",
+        help="Take a heap snapshot after each CPU profile"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay time compression, 2.0 replays twice as fast (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=str,
+        default=None,
+        help="Excluded warm-up before measuring: a request count (500) or a duration (30s), enables trials mode"
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=1,
+        help="Interleaved measured trials of --requests each, reported with bootstrap confidence intervals (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -341,12 +540,56 @@ Examples:
         print("Error: concurrency must be >= 1", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        duration = parse_duration(args.duration) if args.duration else None
+        window = parse_duration(args.window)
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        if duration is not None and duration <= 0:
+            raise ValueError("duration must be > 0")
+        warmup_seconds, warmup_requests = parse_warmup(args.warmup)
+        if args.trials < 1:
+            raise ValueError("trials must be >= 1")
+        if (args.trials > 1 or args.warmup) and (duration or args.find_capacity or args.replay_trace):
+            raise ValueError("--trials and --warmup only apply to fixed --requests runs")
+        slo = parse_slo(args.slo) if args.find_capacity else None
+        step_duration = parse_duration(args.step_duration)
+        if step_duration <= 0:
+            raise ValueError("step-duration must be > 0")
+        if not 0 < args.start_rate <= args.max_rate:
+            raise ValueError("start-rate must be > 0 and <= max-rate")
+        if args.repeats < 1:
+            raise ValueError("repeats must be >= 1")
+        pids = [int(pid) for pid in args.pids.split(",") if pid.strip()]
+        base_seed = args.seed
+        if args.replay_trace:
+            header = read_trace_header(args.replay_trace)
+            if header["step"] != "login":
+                raise ValueError(f"trace step is {header['step']}, expected login")
+            check_trace_setup(header, "users", args.users)
+            base_seed = header["seed"]
+        elif args.record_trace and base_seed is None:
+            base_seed = random.getrandbits(32)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.speed <= 0:
+        print("Error: speed must be > 0", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.validate_rate <= 1:
+        print("Error: validate-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    recorder = TraceRecorder(
+        args.record_trace, "login", "login", base_seed, payload_seeded=False) if args.record_trace else None
+
     try:
         # Phase 1: Register test users
         registration = RegistrationPhase(
             base_url=args.url,
             num_users=args.users,
-            concurrency=args.concurrency
+            concurrency=args.concurrency,
+            base_seed=base_seed
         )
         registered_users = registration.run()
 
@@ -360,12 +603,67 @@ Examples:
             base_url=args.url,
             num_requests=args.requests,
             concurrency=args.concurrency,
-            users=registered_users
+            users=registered_users,
+            base_seed=base_seed,
+            recorder=recorder,
+            validator=ResponseValidator(args.validate_rate) if args.validate_rate > 0 else None,
+            timing=ServerTimingCollector() if args.server_timing else None
         )
-        report = login_tester.run()
+        if args.replay_trace:
+            check_trace_setup(header, "registered", len(registered_users))
+        if recorder:
+            recorder.start({"users": args.users, "registered": len(registered_users)})
+        if args.replay_trace:
+            report = login_tester.replay(TraceReplayer(
+                args.replay_trace, speed=args.speed, concurrency=args.concurrency))
+        elif args.find_capacity:
+            # Capacity mode: open-loop rate steps, ramp then bisection under the SLO
+            report = CapacitySearch(
+                send_request=login_tester.send_request,
+                slo=slo,
+                step_duration=step_duration,
+                start_rate=args.start_rate,
+                max_rate=args.max_rate,
+                repeats=args.repeats,
+                profiler=build_profiler(args, "login_capacity_")
+            ).run()
+        elif duration:
+            # Soak mode: fixed duration, constant-memory metrics, drift detection
+            report = SoakRunner(
+                send_request=login_tester.send_request,
+                duration=duration,
+                concurrency=args.concurrency,
+                window=window,
+                pids=pids
+            ).run()
+            if login_tester.validator:
+                report["validation"] = login_tester.validator.summary()
+        elif args.trials > 1 or args.warmup:
+            # Trials mode: excluded warm-up, interleaved trials, bootstrap confidence intervals
+            report = TrialRunner(
+                send_request=login_tester.send_request,
+                num_requests=args.requests,
+                concurrency=args.concurrency,
+                trials=args.trials,
+                warmup_seconds=warmup_seconds,
+                warmup_requests=warmup_requests,
+                on_warmup_done=login_tester.timing.reset if login_tester.timing else None
+            ).run()
+            if login_tester.validator:
+                report["validation"] = login_tester.validator.summary()
+        else:
+            report = login_tester.run()
+
+        # Soak, capacity and trials reports are built outside the tester
+        if login_tester.timing and "server_timing" not in report:
+            report["server_timing"] = login_tester.timing.summary()
+            login_tester.timing.print_summary()
 
         # Save report to file
-        report_file = f"login_stress_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report_prefix = "login_capacity_report_" if args.find_capacity else \
+            "login_soak_report_" if duration else \
+            "login_trials_report_" if "trials" in report else "login_stress_test_report_"
+        report_file = f"{report_prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(report_file, 'w') as f:
             json.dump(report, f, indent=2)
         print(f"Report saved to: {report_file}\n")
@@ -376,6 +674,9 @@ Examples:
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if recorder:
+            recorder.close()
 
 
 if __name__ == "__main__":
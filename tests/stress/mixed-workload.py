@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Mixed-workload interference benchmark: Argon2-heavy auth vs cheap todo reads
+Offers two independent Poisson arrival streams at the same time, auth writes
+(POST /v1/auth/login and /v1/auth/register, both hash with Argon2 on libuv's
+threadpool) and reads (GET /v1/todo/list), and steps through a grid of
+read rate x auth rate. Each cell reports both classes' latency, measured from
+the scheduled arrival, and the interference matrix shows how read p99 grows
+with the auth rate relative to the same read rate with the lowest auth rate.
+"""
+
+import requests
+import random
+import threading
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, PayloadFactory, login_arena, register_renderer, todo_renderer
+from profiler import StageProfiler, build_profiler
+from soak import LatencyHistogram, parse_duration
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"{self.prefix}-{index}-{unique_id}@stress-test.com",
+            "password": f"MixedPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class SetupPhase:
+    """Setup phase: register, login and seed todos for each reader user"""
+
+    def __init__(self, base_url: str, num_users: int, todos_per_user: int, concurrency: int):
+        self.base_url = base_url
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.concurrency = concurrency
+        self.user_generator = UserGenerator("mixed-reader")
+        self.render_todo = todo_renderer("Mixed todo")
+        self.users: List[Dict[str, str]] = []
+        self.errors = 0
+
+    def send_request(self, index: int) -> Tuple[int, Optional[Dict[str, str]]]:
+        """Register, login and create the todos of one user"""
+        user = self.user_generator.generate(index)
+
+        try:
+            response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+            if response.status_code not in [200, 201]:
+                return (index, None)
+
+            response = requests.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user["email"], "password": user["password"]},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return (index, None)
+            data = response.json()["data"]
+
+            headers = {"Authorization": f"Bearer {data['accessToken']}", **JSON_HEADERS}
+            for i in range(self.todos_per_user):
+                requests.post(
+                    f"{self.base_url}/v1/todo/create",
+                    data=self.render_todo(index * self.todos_per_user + i)[0],
+                    headers=headers,
+                    timeout=10
+                )
+
+            # Credentials are kept: auth writes log the same users in again
+            return (index, {"access_token": data["accessToken"], **user})
+        except Exception:
+            return (index, None)
+
+    def run(self) -> List[Dict[str, str]]:
+        """Create all reader users"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Reader Users With Todos")
+        print(f"{'='*70}")
+        print(f"Users to create: {self.num_users}")
+        print(f"Todos per user:  {self.todos_per_user}")
+        print(f"Concurrency:     {self.concurrency}")
+        print(f"{'='*70}\n")
+
+        completed = 0
+        start_time = time.time()
+        sessions_by_index: Dict[int, Dict[str, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.send_request, i) for i in range(self.num_users)]
+            for future in as_completed(futures):
+                index, session = future.result()
+                completed += 1
+                if session:
+                    sessions_by_index[index] = session
+                else:
+                    self.errors += 1
+
+                progress = (completed / self.num_users) * 100
+                bar_length = 40
+                filled = int(bar_length * completed // self.num_users)
+                bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                print(
+                    f"\r{bar} {progress:.1f}% ({completed}/{self.num_users})", end="", flush=True)
+
+        self.users = [sessions_by_index[i] for i in sorted(sessions_by_index)]
+
+        print(f"\n\nSetup completed in {time.time() - start_time:.2f}s")
+        print(f"Users ready: {len(self.users)}/{self.num_users}")
+        if self.errors > 0:
+            print(f"Errors: {self.errors}")
+
+        return self.users
+
+
+class ClassResult:
+    """Latency and errors of one endpoint class within one cell"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.dropped = 0
+        self.error_codes: Dict[str, int] = {}
+
+    def record(self, latency: float, status_code: int):
+        self.requests += 1
+        if status_code in [200, 201]:
+            self.histogram.record(latency)
+        else:
+            self.errors += 1
+            status_key = str(status_code)
+            self.error_codes[status_key] = self.error_codes.get(status_key, 0) + 1
+
+    def to_dict(self, elapsed: float) -> Dict:
+        """Report row"""
+        return {
+            "requests": self.requests,
+            "achieved_rps": round(self.requests / elapsed, 2) if elapsed else 0,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "p50": f"{self.histogram.percentile(50):.4f}s",
+            "p99": f"{self.histogram.percentile(99):.4f}s",
+            "max": f"{self.histogram.max:.4f}s",
+            "error_codes": self.error_codes,
+        }
+
+
+class MixedWorkload:
+    """Read rate x auth rate grid with independent Poisson arrivals"""
+
+    def __init__(self, base_url: str, users: List[Dict[str, str]], read_rates: List[float],
+                 auth_rates: List[float], login_fraction: float, step_duration: float,
+                 page_size: int, max_in_flight: int, cooldown: float, seed: int,
+                 profiler: Optional[StageProfiler] = None):
+        self.base_url = base_url
+        self.users = users
+        self.read_rates = read_rates
+        self.auth_rates = auth_rates
+        self.login_fraction = login_fraction
+        self.step_duration = step_duration
+        self.page_size = page_size
+        self.max_in_flight = max_in_flight
+        self.cooldown = cooldown
+        self.random = random.Random(seed)
+        self.profiler = profiler
+        self.read_headers = [{"Authorization": f"Bearer {user['access_token']}"} for user in users]
+        self.login_bodies = login_arena(users)
+        self.register_payloads = PayloadFactory(register_renderer(UserGenerator("mixed-writer").generate))
+        self.next_register = 0
+        self.lock = threading.Lock()
+        self.cells: List[Dict] = []
+
+    def send_read(self, index: int) -> int:
+        """GET one user's first todo page"""
+        response = requests.get(
+            f"{self.base_url}/v1/todo/list",
+            params={"page": 1, "limit": self.page_size},
+            headers=self.read_headers[index % len(self.read_headers)],
+            timeout=10
+        )
+        return response.status_code
+
+    def send_auth(self, index: int) -> int:
+        """Login an existing user or register a new one, both hash with Argon2"""
+        with self.lock:
+            is_login = self.random.random() < self.login_fraction
+            if not is_login:
+                register_index = self.next_register
+                self.next_register += 1
+        if is_login:
+            response = requests.post(
+                f"{self.base_url}/v1/auth/login",
+                data=self.login_bodies[index % len(self.login_bodies)],
+                headers=JSON_HEADERS,
+                timeout=10
+            )
+        else:
+            response = requests.post(
+                f"{self.base_url}/v1/auth/register",
+                data=self.register_payloads.get(register_index)[0],
+                headers=JSON_HEADERS,
+                timeout=10
+            )
+        return response.status_code
+
+    def arrivals(self, rate: float, send: Callable[[int], int], result: ClassResult,
+                 lock: threading.Lock, start_time: float, seed: int, stage: str):
+        """One open-loop Poisson stream; latency counts from the scheduled arrival"""
+        if rate <= 0:
+            return
+        rng = random.Random(seed)
+        slots = threading.Semaphore(self.max_in_flight)
+
+        def task(index: int, scheduled: float):
+            try:
+                try:
+                    status_code = send(index)
+                except requests.exceptions.RequestException:
+                    status_code = -1
+                latency = time.time() - scheduled
+                with lock:
+                    result.record(latency, status_code)
+                    if self.profiler and result.requests % 50 == 0:
+                        self.profiler.observe(stage, result.histogram.percentile(99), result.histogram.count)
+            finally:
+                slots.release()
+
+        end_time = start_time + self.step_duration
+        scheduled = start_time + rng.expovariate(rate)
+        index = 0
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while scheduled < end_time:
+                delay = scheduled - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                # Harness saturated: the arrival is lost, not delayed
+                if slots.acquire(blocking=False):
+                    executor.submit(task, index, scheduled)
+                    index += 1
+                else:
+                    with lock:
+                        result.dropped += 1
+                scheduled += rng.expovariate(rate)
+
+    def run_cell(self, read_rate: float, auth_rate: float) -> Dict:
+        """Both streams for one step"""
+        reads, auths = ClassResult(), ClassResult()
+        lock = threading.Lock()
+        stage = f"cell-{len(self.cells) + 1}"
+        if self.profiler:
+            self.profiler.stage_started(stage, f"reads {read_rate:g}/s auth {auth_rate:g}/s")
+        start_time = time.time()
+        streams = [
+            threading.Thread(target=self.arrivals, args=(
+                read_rate, self.send_read, reads, lock, start_time, self.random.randrange(2**32), stage)),
+            threading.Thread(target=self.arrivals, args=(
+                auth_rate, self.send_auth, auths, lock, start_time, self.random.randrange(2**32), stage)),
+        ]
+        for stream in streams:
+            stream.start()
+        for stream in streams:
+            stream.join()
+        elapsed = time.time() - start_time
+
+        cell = {
+            "read_rate": read_rate,
+            "auth_rate": auth_rate,
+            "reads": reads.to_dict(elapsed),
+            "auth": auths.to_dict(elapsed),
+            "read_p99": reads.histogram.percentile(99),
+            "auth_p99": auths.histogram.percentile(99),
+        }
+        print(
+            f"  reads {read_rate:>7.1f}/s  auth {auth_rate:>6.1f}/s  "
+            f"read p50 {reads.histogram.percentile(50) * 1000:>7.1f}ms  "
+            f"read p99 {cell['read_p99'] * 1000:>7.1f}ms  "
+            f"auth p99 {cell['auth_p99'] * 1000:>7.1f}ms  "
+            f"err {reads.errors + auths.errors}  dropped {reads.dropped + auths.dropped}", flush=True)
+        time.sleep(self.cooldown)
+        return cell
+
+    def run(self) -> Dict:
+        """Execute every cell of the grid"""
+        print(f"\n{'='*70}")
+        print(f"Mixed Workload Interference")
+        print(f"{'='*70}")
+        print(f"Read rates:    {', '.join(f'{r:g}' for r in self.read_rates)} req/s (GET /v1/todo/list)")
+        print(f"Auth rates:    {', '.join(f'{r:g}' for r in self.auth_rates)} req/s "
+              f"({self.login_fraction * 100:.0f}% login, {(1 - self.login_fraction) * 100:.0f}% register)")
+        print(f"Step:          {self.step_duration:.0f}s per cell, {len(self.read_rates) * len(self.auth_rates)} cells")
+        print(f"Reader Users:  {len(self.users)}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        for read_rate in self.read_rates:
+            for auth_rate in self.auth_rates:
+                self.cells.append(self.run_cell(read_rate, auth_rate))
+
+        return self.generate_report(time.time() - start_time)
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Interference matrix: read p99 per (read rate, auth rate) and its growth"""
+        matrix: Dict[str, Dict[str, Dict]] = {}
+        for read_rate in self.read_rates:
+            row = [c for c in self.cells if c["read_rate"] == read_rate]
+            baseline = row[0]["read_p99"]
+            matrix[f"{read_rate:g}"] = {
+                f"{cell['auth_rate']:g}": {
+                    "read_p99": f"{cell['read_p99']:.4f}s",
+                    "slowdown": round(cell["read_p99"] / baseline, 2) if baseline else None,
+                    "auth_p99": f"{cell['auth_p99']:.4f}s",
+                }
+                for cell in row
+            }
+
+        stats = {
+            "summary": {
+                "read_rates": self.read_rates,
+                "auth_rates": self.auth_rates,
+                "login_fraction": self.login_fraction,
+                "step_duration": f"{self.step_duration:.0f}s",
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "interference": matrix,
+            "cells": [
+                {k: v for k, v in cell.items() if k not in ["read_p99", "auth_p99"]}
+                for cell in self.cells
+            ],
+        }
+        if self.profiler:
+            stats["profiles"] = self.profiler.finish()
+
+        # Print report
+        header = "".join(f"{'auth ' + f'{r:g}' + '/s':>14}" for r in self.auth_rates)
+        print(f"\n{'='*70}")
+        print(f"Interference Matrix: read p99 (slowdown vs auth {self.auth_rates[0]:g}/s)")
+        print(f"{'='*70}")
+        print(f"{'':<16}{header}")
+        for read_rate in self.read_rates:
+            row = [c for c in self.cells if c["read_rate"] == read_rate]
+            baseline = row[0]["read_p99"]
+            cells = ""
+            for cell in row:
+                slowdown = f"x{cell['read_p99'] / baseline:.1f}" if baseline else "-"
+                cells += f"{cell['read_p99'] * 1000:>8.1f}ms {slowdown:>4}"
+            print(f"{'reads ' + f'{read_rate:g}' + '/s':<16}{cells}")
+
+        print(f"\nAuth p99 per cell:")
+        print(f"{'':<16}{header}")
+        for read_rate in self.read_rates:
+            cells = "".join(
+                f"{c['auth_p99'] * 1000:>12.1f}ms" for c in self.cells if c["read_rate"] == read_rate)
+            print(f"{'reads ' + f'{read_rate:g}' + '/s':<16}{cells}")
+
+        print(f"\nTotal Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def parse_rates(value: str) -> List[float]:
+    """Comma-separated non-negative rates"""
+    rates = [float(part) for part in value.split(",") if part.strip()]
+    if not rates or any(rate < 0 for rate in rates):
+        raise ValueError(f"Invalid rate list: {value}")
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mixed-workload interference benchmark (auth writes vs todo list reads)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python mixed-workload.py --read-rates 100 --auth-rates 0,5,10,20,40
+  python mixed-workload.py --read-rates 50,200 --auth-rates 0,10,50 --step-duration 30s
+  python mixed-workload.py --auth-rates 0,20 --login-fraction 1.0
+        """
+    )
+
+    parser.add_argument(
+        "--read-rates",
+        type=str,
+        default="100",
+        help="Comma-separated GET /v1/todo/list arrival rates in req/s (default: 100)"
+    )
+    parser.add_argument(
+        "--auth-rates",
+        type=str,
+        default="0,5,10,20,40",
+        help="Comma-separated login/register arrival rates in req/s; the first is the baseline (default: 0,5,10,20,40)"
+    )
+    parser.add_argument(
+        "--login-fraction",
+        type=float,
+        default=0.5,
+        help="Fraction of auth arrivals that are logins, the rest register new users (default: 0.5)"
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=str,
+        default="20s",
+        help="Duration of each grid cell (default: 20s)"
+    )
+    parser.add_argument(
+        "-u", "--users",
+        type=int,
+        default=50,
+        help="Reader users set up first, also logged in again by auth writes (default: 50)"
+    )
+    parser.add_argument(
+        "--todos-per-user",
+        type=int,
+        default=20,
+        help="Todos created per reader user during setup (default: 20)"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=10,
+        help="limit query parameter of each list request, 1-100 (default: 10)"
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=256,
+        help="Maximum in-flight requests per class, arrivals beyond it are dropped (default: 256)"
+    )
+    parser.add_argument(
+        "--cooldown",
+        type=str,
+        default="2s",
+        help="Pause between cells (default: 2s)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Seed of the arrival processes and the login/register split (default: 1)"
+    )
+    parser.add_argument(
+        "--profile-inspect",
+        type=str,
+        default=None,
+        help="Inspector URL of an API started with node --inspect (e.g. http://127.0.0.1:9229), enables profiling"
+    )
+    parser.add_argument(
+        "--profile-stages",
+        type=str,
+        default=None,
+        help="Comma-separated stages profiled when they start: grid cells cell-1, cell-2, ... in run order, or all"
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=str,
+        default=None,
+        help="Profile a stage once its running p99 exceeds this, e.g. 200ms"
+    )
+    parser.add_argument(
+        "--profile-window",
+        type=str,
+        default="5s",
+        help="CPU profile length per capture (default: 5s)"
+    )
+    parser.add_argument(
+        "--heap-snapshot",
+        action="store_true",
+        help="Take a heap snapshot after each CPU profile"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.users < 1:
+        print("Error: users must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.todos_per_user < 0:
+        print("Error: todos-per-user must be >= 0", file=sys.stderr)
+        sys.exit(1)
+    if not 1 <= args.page_size <= 100:
+        print("Error: page-size must be between 1 and 100", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.login_fraction <= 1:
+        print("Error: login-fraction must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+    if args.max_in_flight < 1:
+        print("Error: max-in-flight must be >= 1", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        read_rates = parse_rates(args.read_rates)
+        auth_rates = parse_rates(args.auth_rates)
+        step_duration = parse_duration(args.step_duration)
+        cooldown = parse_duration(args.cooldown)
+        if step_duration <= 0:
+            raise ValueError("step-duration must be > 0")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        users = SetupPhase(
+            base_url=args.url,
+            num_users=args.users,
+            todos_per_user=args.todos_per_user,
+            concurrency=min(args.users, 25)
+        ).run()
+
+        if not users:
+            print(
+                "Error: No users were set up successfully. Cannot proceed with the benchmark.", file=sys.stderr)
+            sys.exit(1)
+
+        report = MixedWorkload(
+            base_url=args.url,
+            users=users,
+            read_rates=read_rates,
+            auth_rates=auth_rates,
+            login_fraction=args.login_fraction,
+            step_duration=step_duration,
+            page_size=args.page_size,
+            max_in_flight=args.max_in_flight,
+            cooldown=cooldown,
+            seed=args.seed,
+            profiler=build_profiler(args, "mixed_workload_")
+        ).run()
+
+        # Save report to file
+        report_file = f"mixed_workload_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
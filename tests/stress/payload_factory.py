@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Pre-serialized request bodies for the stress scripts
+Renders register, login and todo-create JSON bodies into compact byte arenas
+ahead of time (up front, or in batches on a background producer thread), so
+workers only slice ready-to-send bytes instead of building dicts, f-strings
+and JSON per request.
+"""
+
+import json
+import threading
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+PRIORITIES = ["low", "medium", "high"]
+
+Rendered = Tuple[bytes, Optional[Dict[str, str]]]
+
+
+def encode_body(payload: Dict[str, Any]) -> bytes:
+    """Compact JSON encoding, byte-identical to what the workers send"""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class PayloadArena:
+    """Many small bodies packed into one bytearray plus an offsets table"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array("Q", [0])
+        self.metas: List[Optional[Dict[str, str]]] = []
+
+    @classmethod
+    def from_payloads(cls, payloads: Iterable[Dict[str, Any]]) -> "PayloadArena":
+        """Arena holding one encoded body per payload"""
+        arena = cls()
+        for payload in payloads:
+            arena.append(encode_body(payload))
+        return arena
+
+    def append(self, body: bytes, meta: Optional[Dict[str, str]] = None):
+        """Add an encoded body"""
+        self.buffer += body
+        self.offsets.append(len(self.buffer))
+        self.metas.append(meta)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]])
+
+    def meta(self, index: int) -> Optional[Dict[str, str]]:
+        """Metadata rendered with the body (e.g. credentials of a register body)"""
+        return self.metas[index]
+
+
+class PayloadFactory:
+    """Background producer rendering consecutive request indexes in batches
+
+    get(index) returns the body rendered for that index. Batches are produced
+    up to `prefetch` batches ahead of the highest requested index and dropped
+    once workers move past them, so memory stays bounded on unbounded runs.
+    Indexes behind the window are rendered on demand by the caller.
+    """
+
+    def __init__(self, render: Callable[[int], Rendered], total: Optional[int] = None,
+                 batch_size: int = 1000, prefetch: int = 4):
+        self.render = render
+        self.total = total
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.batches: Dict[int, PayloadArena] = {}
+        self.next_batch = 0
+        self.highest_requested = 0
+        self.dropped_below = 0
+        self.error: Optional[BaseException] = None
+        self.condition = threading.Condition()
+        self.producer = threading.Thread(target=self.produce, daemon=True)
+        self.producer.start()
+
+    def produce(self):
+        """Render batches ahead of the consumers"""
+        try:
+            while True:
+                with self.condition:
+                    while self.next_batch > self.highest_requested + self.prefetch:
+                        self.condition.wait()
+                    number = self.next_batch
+                    self.next_batch += 1
+
+                first = number * self.batch_size
+                last = first + self.batch_size
+                if self.total is not None:
+                    if first >= self.total:
+                        return
+                    last = min(last, self.total)
+
+                arena = PayloadArena()
+                for index in range(first, last):
+                    body, meta = self.render(index)
+                    arena.append(body, meta)
+
+                with self.condition:
+                    if number >= self.dropped_below:
+                        self.batches[number] = arena
+                    self.condition.notify_all()
+        except BaseException as e:
+            # Waiting consumers re-raise it instead of blocking forever
+            with self.condition:
+                self.error = e
+                self.condition.notify_all()
+
+    def get(self, index: int) -> Rendered:
+        """Ready-to-send body (and metadata) for a request index"""
+        if index < 0 or (self.total is not None and index >= self.total):
+            raise IndexError(f"payload index {index} out of range")
+
+        number, offset = divmod(index, self.batch_size)
+        arena = None
+        with self.condition:
+            if number > self.highest_requested:
+                self.highest_requested = number
+                # Drop batches the workers have moved past
+                self.dropped_below = max(self.dropped_below, number - 1)
+                for stale in [n for n in self.batches if n < self.dropped_below]:
+                    del self.batches[stale]
+                self.condition.notify_all()
+
+            # The batch may be dropped while we wait for it, re-check every wakeup
+            while number not in self.batches and number >= self.dropped_below:
+                if self.error is not None:
+                    raise RuntimeError("payload producer failed") from self.error
+                self.condition.wait()
+            arena = self.batches.get(number)
+
+        if arena is None:
+            # Straggler behind the window: render on demand
+            return self.render(index)
+        return arena[offset], arena.meta(offset)
+
+    def prefill(self):
+        """Block until the first batch is rendered, before timing starts"""
+        with self.condition:
+            while 0 not in self.batches and self.dropped_below == 0:
+                if self.error is not None:
+                    raise RuntimeError("payload producer failed") from self.error
+                self.condition.wait()
+
+
+def register_renderer(generate: Callable[[int], Dict[str, str]]) -> Callable[[int], Rendered]:
+    """Render register bodies; the generated user is kept as metadata for later logins"""
+    def render(index: int) -> Rendered:
+        user = generate(index)
+        return encode_body(user), user
+    return render
+
+
+def login_arena(users: List[Dict[str, str]]) -> PayloadArena:
+    """Login bodies for a fixed set of users, indexed like the user list"""
+    return PayloadArena.from_payloads(
+        {"email": user["email"], "password": user["password"]} for user in users)
+
+
+def todo_renderer(prefix: str = "Stress todo") -> Callable[[int], Rendered]:
+    """Render todo-create bodies with rotating priorities"""
+    def render(index: int) -> Rendered:
+        return encode_body({"name": f"{prefix} {index}", "priority": PRIORITIES[index % len(PRIORITIES)]}), None
+    return render
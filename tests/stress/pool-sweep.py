@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Sequelize connection-pool sizing sweep
+Restarts the API for every point of a POSTGRES_POOL_MAX x POSTGRES_POOL_MIN x
+POSTGRES_POOL_ACQUIRE grid and runs two DB-bound scenarios against it: todo
+list reads (GET /v1/todo/list) and refresh-token rotation (a lookup, a revoke,
+a user read and an insert per call). Each point reports throughput, p99 and the
+number of pool acquire timeouts, counted from responses carrying the
+sequelize-pool "ResourceRequest timed out" message and from server log lines.
+Users, todos and sessions are created once, on the first server, and reused:
+they live in PostgreSQL, so they survive the restarts.
+"""
+
+import requests
+import itertools
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, todo_renderer
+from server_process import DEFAULT_COMMAND, REPO_ROOT, ApiServer, parse_env_overrides
+from soak import LatencyHistogram
+
+# sequelize-pool TimeoutError, surfaced as ConnectionAcquireTimeoutError
+ACQUIRE_TIMEOUT_MESSAGES = ["ResourceRequest timed out", "ConnectionAcquireTimeoutError"]
+
+SCENARIOS = ["todo-list", "refresh-token"]
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"poolsweep-{index}-{unique_id}@stress-test.com",
+            "password": f"PoolSweepPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class SetupPhase:
+    """Setup phase: users with todos and a logged-in cookie jar each"""
+
+    def __init__(self, base_url: str, num_users: int, todos_per_user: int, concurrency: int):
+        self.base_url = base_url
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.concurrency = concurrency
+        self.user_generator = UserGenerator()
+        self.render_todo = todo_renderer("Pool todo")
+        self.users: List[Dict] = []
+        self.errors = 0
+
+    def send_request(self, index: int) -> Tuple[int, Optional[Dict]]:
+        """Register, login and create the todos of one user"""
+        user = self.user_generator.generate(index)
+
+        try:
+            response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+            if response.status_code not in [200, 201]:
+                return (index, None)
+
+            session = requests.Session()
+            response = session.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user["email"], "password": user["password"]},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return (index, None)
+
+            headers = {"Authorization": f"Bearer {response.json()['data']['accessToken']}"}
+            for i in range(self.todos_per_user):
+                requests.post(
+                    f"{self.base_url}/v1/todo/create",
+                    data=self.render_todo(index * self.todos_per_user + i)[0],
+                    headers={**headers, **JSON_HEADERS},
+                    timeout=10
+                )
+
+            return (index, {"headers": headers, "session": session})
+        except Exception:
+            return (index, None)
+
+    def run(self) -> List[Dict]:
+        """Create all test users"""
+        print(f"Setup: {self.num_users} users with {self.todos_per_user} todos each...", flush=True)
+        start_time = time.time()
+        users_by_index: Dict[int, Dict] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.send_request, i) for i in range(self.num_users)]
+            for future in as_completed(futures):
+                index, user = future.result()
+                if user:
+                    users_by_index[index] = user
+                else:
+                    self.errors += 1
+
+        self.users = [users_by_index[i] for i in sorted(users_by_index)]
+        print(f"Setup completed in {time.time() - start_time:.2f}s: "
+              f"{len(self.users)}/{self.num_users} users ready\n", flush=True)
+        return self.users
+
+
+class ScenarioResult:
+    """Throughput, latency and acquire timeouts of one scenario at one pool setting"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.acquire_timeouts = 0
+        self.error_codes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def record(self, elapsed: float, status_code: int, text: str):
+        self.requests += 1
+        if status_code in [200, 201]:
+            self.histogram.record(elapsed)
+            return
+        self.errors += 1
+        status_key = str(status_code)
+        self.error_codes[status_key] = self.error_codes.get(status_key, 0) + 1
+        if any(message in text for message in ACQUIRE_TIMEOUT_MESSAGES):
+            self.acquire_timeouts += 1
+
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        """Report row"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "acquire_timeouts": self.acquire_timeouts,
+            "requests_per_second": round(self.rps(), 2),
+            "p50": f"{self.histogram.percentile(50):.4f}s",
+            "p99": f"{self.histogram.percentile(99):.4f}s",
+            "error_codes": self.error_codes,
+        }
+
+
+def timed(send: Callable[[], requests.Response]) -> Tuple[float, int, str]:
+    """Elapsed time, status and body of one request"""
+    try:
+        start = time.time()
+        response = send()
+        return (time.time() - start, response.status_code, response.text)
+    except requests.exceptions.Timeout:
+        return (10.0, -1, "Timeout")
+    except Exception as e:
+        return (0.0, -1, str(e))
+
+
+class PoolSweep:
+    """Restart the API per pool setting and run the DB-bound scenarios"""
+
+    def __init__(self, url: str, grid: List[Dict[str, int]], num_users: int, todos_per_user: int,
+                 num_requests: int, concurrency: int, command: str, cwd: str, env: Dict[str, str],
+                 log_path: Optional[str]):
+        self.url = url
+        self.grid = grid
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.log_path = log_path
+        self.users: List[Dict] = []
+        self.points: List[Dict] = []
+
+    def measure(self, tasks: List[Callable[[], List[Tuple[float, int, str]]]]) -> ScenarioResult:
+        """Run tasks on the pool; each returns (elapsed, status, body) of its requests"""
+        result = ScenarioResult()
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(task) for task in tasks]
+            for future in as_completed(futures):
+                for elapsed, status_code, text in future.result():
+                    result.record(elapsed, status_code, text)
+        result.elapsed = time.time() - start_time
+        return result
+
+    def todo_list(self, index: int) -> List[Tuple[float, int, str]]:
+        headers = self.users[index % len(self.users)]["headers"]
+        return [timed(lambda: requests.get(
+            f"{self.url}/v1/todo/list", params={"page": 1, "limit": 10}, headers=headers, timeout=10))]
+
+    def refresh_chain(self, session: requests.Session, count: int) -> List[Tuple[float, int, str]]:
+        # Refreshes of one session are sequential: each rotates the cookie
+        return [
+            timed(lambda: session.post(f"{self.url}/v1/auth/refresh-token", json={}, timeout=10))
+            for _ in range(count)
+        ]
+
+    def run_point(self, pool: Dict[str, int]) -> Dict:
+        """One server with one pool setting"""
+        env = {**self.env, **{f"POSTGRES_POOL_{key.upper()}": str(value) for key, value in pool.items()}}
+        server = ApiServer(self.url, command=self.command, cwd=self.cwd, env=env, log_path=self.log_path)
+        server.watch = list(ACQUIRE_TIMEOUT_MESSAGES)
+        point = {"pool": pool, "scenarios": {}}
+        try:
+            server.start()
+            server.wait_for_health()
+            if not self.users:
+                self.users = SetupPhase(
+                    self.url, self.num_users, self.todos_per_user, min(self.num_users, 25)).run()
+                if not self.users:
+                    raise RuntimeError("no users were set up")
+
+            results = {
+                "todo-list": self.measure(
+                    [lambda i=i: self.todo_list(i) for i in range(self.num_requests)]),
+            }
+            sessions = [user["session"] for user in self.users[:self.concurrency]]
+            per_session, extra = divmod(self.num_requests, len(sessions))
+            results["refresh-token"] = self.measure([
+                lambda s=session, n=per_session + (1 if i < extra else 0): self.refresh_chain(s, n)
+                for i, session in enumerate(sessions)
+            ])
+            point["scenarios"] = results
+            point["log_acquire_timeouts"] = sum(server.count_lines(m) for m in ACQUIRE_TIMEOUT_MESSAGES)
+        except Exception as e:
+            point["error"] = str(e)
+        finally:
+            server.stop()
+        return point
+
+    def run(self) -> Dict:
+        """Every grid point in order"""
+        print(f"\n{'='*70}")
+        print(f"Connection Pool Sweep")
+        print(f"{'='*70}")
+        print(f"Command:       {self.command} (in {self.cwd})")
+        print(f"Grid:          {len(self.grid)} points (max x min x acquire)")
+        print(f"Scenarios:     {', '.join(SCENARIOS)}, {self.num_requests} requests each")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        for pool in self.grid:
+            point = self.run_point(pool)
+            self.points.append(point)
+            label = f"max {pool['max']:>3} min {pool['min']:>3} acquire {pool['acquire']:>6}ms"
+            if "error" in point:
+                print(f"  {label}  failed: {point['error']}", flush=True)
+                continue
+            cells = "  ".join(
+                f"{name} {r.rps():>7.1f}/s p99 {r.histogram.percentile(99) * 1000:>6.1f}ms "
+                f"timeouts {r.acquire_timeouts}"
+                for name, r in point["scenarios"].items())
+            print(f"  {label}  {cells}", flush=True)
+
+        return self.generate_report(time.time() - start_time)
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Throughput, p99 and acquire timeouts per pool setting"""
+        stats = {
+            "summary": {
+                "points": len(self.grid),
+                "requests_per_scenario": self.num_requests,
+                "concurrency": self.concurrency,
+                "users": len(self.users),
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "points": [
+                {
+                    "pool": point["pool"],
+                    **({"error": point["error"]} if "error" in point else {
+                        "scenarios": {name: r.to_dict() for name, r in point["scenarios"].items()},
+                        "log_acquire_timeouts": point["log_acquire_timeouts"],
+                    }),
+                }
+                for point in self.points
+            ],
+        }
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Connection Pool Sweep Results")
+        print(f"{'='*70}")
+        header = "".join(f"{name + ' req/s':>20}{'p99':>9}{'timeouts':>10}" for name in SCENARIOS)
+        print(f"{'max':>4}{'min':>5}{'acquire':>9}{header}")
+        best: Dict[str, Tuple[float, Dict[str, int]]] = {}
+        for point in self.points:
+            pool = point["pool"]
+            row = f"{pool['max']:>4}{pool['min']:>5}{pool['acquire']:>7}ms"
+            for name in SCENARIOS:
+                r = point.get("scenarios", {}).get(name)
+                if r is None:
+                    row += f"{'-':>20}{'-':>9}{'-':>10}"
+                    continue
+                row += f"{r.rps():>20.1f}{r.histogram.percentile(99) * 1000:>7.1f}ms{r.acquire_timeouts:>10}"
+                if r.acquire_timeouts == 0 and r.rps() > best.get(name, (0.0, {}))[0]:
+                    best[name] = (r.rps(), pool)
+            print(row)
+
+        if best:
+            print(f"\nBest Throughput Without Acquire Timeouts:")
+            for name, (rps, pool) in best.items():
+                print(f"  {name:<14} {rps:>8.1f} req/s at max={pool['max']} min={pool['min']} "
+                      f"acquire={pool['acquire']}ms")
+            stats["best"] = {name: {"requests_per_second": round(rps, 2), "pool": pool}
+                             for name, (rps, pool) in best.items()}
+
+        print(f"\nTotal Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def parse_ints(value: str, name: str, minimum: int) -> List[int]:
+    """Comma-separated integers"""
+    try:
+        values = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid {name} list: {value}")
+    if not values or any(v < minimum for v in values):
+        raise ValueError(f"{name} values must be >= {minimum}: {value}")
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Restart the API per connection-pool setting and compare throughput, p99 and acquire timeouts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  npm run build && python pool-sweep.py --pool-max 2,5,10,20,40 --concurrency 100
+  python pool-sweep.py --pool-max 5,20 --pool-min 0,5 --pool-acquire 1000,60000 -r 5000
+        """
+    )
+
+    parser.add_argument(
+        "--pool-max",
+        type=str,
+        default="2,5,10,20",
+        help="Comma-separated POSTGRES_POOL_MAX values (default: 2,5,10,20)"
+    )
+    parser.add_argument(
+        "--pool-min",
+        type=str,
+        default="0",
+        help="Comma-separated POSTGRES_POOL_MIN values, points with min > max are skipped (default: 0)"
+    )
+    parser.add_argument(
+        "--pool-acquire",
+        type=str,
+        default="5000",
+        help="Comma-separated POSTGRES_POOL_ACQUIRE values in ms (default: 5000)"
+    )
+    parser.add_argument(
+        "--pool-idle",
+        type=int,
+        default=10000,
+        help="POSTGRES_POOL_IDLE in ms for every point (default: 10000)"
+    )
+    parser.add_argument(
+        "-u", "--users",
+        type=int,
+        default=100,
+        help="Users set up once on the first server, also the refresh sessions (default: 100)"
+    )
+    parser.add_argument(
+        "--todos-per-user",
+        type=int,
+        default=10,
+        help="Todos created per user during setup (default: 10)"
+    )
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=2000,
+        help="Requests per scenario and grid point (default: 2000)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=50,
+        help="Number of concurrent requests (default: 50)"
+    )
+    parser.add_argument(
+        "--command",
+        type=str,
+        default=DEFAULT_COMMAND,
+        help=f"Command that starts the API (default: {DEFAULT_COMMAND})"
+    )
+    parser.add_argument(
+        "--cwd",
+        type=str,
+        default=REPO_ROOT,
+        help="Working directory for the command (default: repository root)"
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        help="Environment override for the server, KEY=VALUE (repeatable)"
+    )
+    parser.add_argument(
+        "--server-log",
+        type=str,
+        default=None,
+        help="Append timestamped server output to this file (default: not kept)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL the spawned API listens on; its port is passed as PORT (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.users < 1 or args.requests < 1 or args.concurrency < 1:
+        print("Error: users, requests and concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.todos_per_user < 0 or args.pool_idle < 0:
+        print("Error: todos-per-user and pool-idle must be >= 0", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        grid = [
+            {"max": pool_max, "min": pool_min, "acquire": acquire, "idle": args.pool_idle}
+            for pool_max, pool_min, acquire in itertools.product(
+                parse_ints(args.pool_max, "pool-max", 1),
+                parse_ints(args.pool_min, "pool-min", 0),
+                parse_ints(args.pool_acquire, "pool-acquire", 1))
+            if pool_min <= pool_max
+        ]
+        if not grid:
+            raise ValueError("every grid point has pool-min > pool-max")
+        env = parse_env_overrides(args.env)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        report = PoolSweep(
+            url=args.url,
+            grid=grid,
+            num_users=args.users,
+            todos_per_user=args.todos_per_user,
+            num_requests=args.requests,
+            concurrency=args.concurrency,
+            command=args.command,
+            cwd=args.cwd,
+            env=env,
+            log_path=args.server_log
+        ).run()
+
+        # Save report to file
+        report_file = f"pool_sweep_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+On-demand Node CPU/heap profile capture for the stress scripts
+Talks the Chrome DevTools Protocol to an API started with the inspector
+enabled (node --inspect=9229 dist/index.js) and captures a CPU profile for a
+configurable window, optionally followed by a heap snapshot, when a chosen
+load stage starts or when a stage's running p99 crosses a latency threshold.
+Artifacts (.cpuprofile opens in Chrome DevTools / speedscope, .heapsnapshot in
+the DevTools Memory tab) are written to one directory next to the report,
+named after the stage that triggered them.
+Needs the optional websocket-client package (pip install websocket-client).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+import requests
+
+from soak import parse_duration
+
+try:
+    import websocket
+except ImportError:  # optional: only needed when profiling is enabled
+    websocket = None
+
+
+class InspectorClient:
+    """Minimal CDP client over the inspector websocket of one Node process"""
+
+    def __init__(self, inspect_url: str, timeout: float = 30.0):
+        if websocket is None:
+            raise RuntimeError("profiling needs websocket-client: pip install websocket-client")
+        targets = requests.get(f"{inspect_url.rstrip('/')}/json/list", timeout=5).json()
+        if not targets:
+            raise RuntimeError(f"no inspector target at {inspect_url}")
+        self.ws = websocket.create_connection(
+            targets[0]["webSocketDebuggerUrl"], timeout=timeout, suppress_origin=True)
+        self.next_id = 0
+
+    def call(self, method: str, params: Optional[Dict] = None, on_event=None) -> Dict:
+        """Send one command and wait for its result, passing events to on_event"""
+        self.next_id += 1
+        self.ws.send(json.dumps({"id": self.next_id, "method": method, "params": params or {}}))
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get("id") == self.next_id:
+                if "error" in message:
+                    raise RuntimeError(f"{method}: {message['error'].get('message')}")
+                return message.get("result", {})
+            if on_event and "method" in message:
+                on_event(message)
+
+    def close(self):
+        self.ws.close()
+
+
+def stage_filename(stage: str) -> str:
+    """Stage name usable as a file name"""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", stage).strip("_") or "stage"
+
+
+class StageProfiler:
+    """Capture CPU profiles / heap snapshots keyed by load stage"""
+
+    def __init__(self, inspect_url: str, out_dir: str, stages: Optional[Set[str]] = None,
+                 threshold: Optional[float] = None, window: float = 5.0, heap: bool = False,
+                 min_samples: int = 50):
+        self.inspect_url = inspect_url
+        self.out_dir = out_dir
+        self.stages = stages  # None = no stage is captured at its start
+        self.threshold = threshold
+        self.window = window
+        self.heap = heap
+        self.min_samples = min_samples
+        self.captured: Set[str] = set()
+        self.artifacts: List[Dict] = []
+        self.failures: List[str] = []
+        self.lock = threading.Lock()
+        self.busy = False
+        self.threads: List[threading.Thread] = []
+        # Fail early when the inspector is not reachable
+        InspectorClient(inspect_url).close()
+        os.makedirs(out_dir, exist_ok=True)
+
+    def stage_started(self, stage: str, label: str = ""):
+        """Capture at the start of a chosen stage (stages are only chosen when listed)"""
+        if self.stages is not None and (stage in self.stages or "all" in self.stages):
+            self.trigger(stage, f"stage start {label}".strip())
+
+    def observe(self, stage: str, p99: float, samples: int):
+        """Capture once per stage when its running p99 crosses the threshold"""
+        if self.threshold is not None and samples >= self.min_samples and p99 > self.threshold:
+            self.trigger(stage, f"p99 {p99 * 1000:.0f}ms > {self.threshold * 1000:.0f}ms")
+
+    def trigger(self, stage: str, reason: str):
+        """Start a capture in the background unless one is running or the stage has one"""
+        with self.lock:
+            if self.busy or stage in self.captured:
+                return
+            self.busy = True
+            self.captured.add(stage)
+        thread = threading.Thread(target=self.capture, args=(stage, reason), daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def capture(self, stage: str, reason: str):
+        """CPU profile for the window, then an optional heap snapshot"""
+        name = stage_filename(stage)
+        started = datetime.now().strftime('%H:%M:%S')
+        print(f"\n[profiler] {stage}: capturing {self.window:.0f}s CPU profile ({reason})", flush=True)
+        client = None
+        try:
+            client = InspectorClient(self.inspect_url, timeout=self.window + 60)
+            client.call("Profiler.enable")
+            client.call("Profiler.setSamplingInterval", {"interval": 100})
+            client.call("Profiler.start")
+            time.sleep(self.window)
+            profile = client.call("Profiler.stop")["profile"]
+            client.call("Profiler.disable")
+            path = os.path.join(self.out_dir, f"{name}.cpuprofile")
+            with open(path, "w") as f:
+                json.dump(profile, f)
+            self.add_artifact(stage, "cpu_profile", path, reason, started)
+
+            if self.heap:
+                path = os.path.join(self.out_dir, f"{name}.heapsnapshot")
+                with open(path, "w") as f:
+                    def write_chunk(event: Dict):
+                        if event["method"] == "HeapProfiler.addHeapSnapshotChunk":
+                            f.write(event["params"]["chunk"])
+                    client.call("HeapProfiler.takeHeapSnapshot", {"reportProgress": False}, on_event=write_chunk)
+                self.add_artifact(stage, "heap_snapshot", path, reason, started)
+        except Exception as e:
+            with self.lock:
+                self.failures.append(f"{stage}: {e}")
+            print(f"\n[profiler] {stage}: capture failed ({e})", flush=True)
+        finally:
+            if client:
+                client.close()
+            with self.lock:
+                self.busy = False
+
+    def add_artifact(self, stage: str, kind: str, path: str, reason: str, started: str):
+        with self.lock:
+            self.artifacts.append({
+                "stage": stage,
+                "kind": kind,
+                "path": path,
+                "reason": reason,
+                "started": started,
+                "bytes": os.path.getsize(path),
+            })
+
+    def finish(self) -> Dict:
+        """Wait for running captures and return the report section"""
+        for thread in self.threads:
+            thread.join()
+        if self.artifacts:
+            print(f"\nProfiles ({self.out_dir}):")
+            for artifact in self.artifacts:
+                print(f"  {artifact['stage']:<24} {artifact['kind']:<14} {artifact['bytes'] / 1024:>9.0f} KiB  "
+                      f"({artifact['reason']})")
+        return {
+            "directory": self.out_dir,
+            "artifacts": self.artifacts,
+            "failures": self.failures,
+        }
+
+
+def profile_dir(prefix: str) -> str:
+    """Directory for this run's artifacts, next to the report files"""
+    return f"{prefix}profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def build_profiler(args, prefix: str) -> Optional[StageProfiler]:
+    """StageProfiler from the --profile-* flags, None unless --profile-inspect is set"""
+    if not args.profile_inspect:
+        return None
+    stages = {s.strip() for s in args.profile_stages.split(",") if s.strip()} if args.profile_stages else None
+    threshold = parse_duration(args.profile_threshold) if args.profile_threshold else None
+    if stages is None and threshold is None:
+        raise ValueError("--profile-inspect needs --profile-stages and/or --profile-threshold")
+    return StageProfiler(args.profile_inspect, profile_dir(prefix), stages=stages, threshold=threshold,
+                         window=parse_duration(args.profile_window), heap=args.heap_snapshot)
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Thundering-herd refresh storm against the refresh token endpoint
+Holds M logged-in sessions and releases all their /v1/auth/refresh-token
+calls inside a short burst window, the way a cohort of clients refreshes at
+the same moment after a deploy or an expiry boundary. A separate prober keeps
+refreshing a few dedicated sessions at a fixed interval before, during and
+after the burst, which gives the baseline latency, the latency seen by
+unrelated clients during the storm, and the recovery time back to baseline.
+"""
+
+import requests
+import math
+import threading
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import sys
+
+from soak import parse_duration
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class SessionPool:
+    """Setup phase: register and login users, keeping one cookie jar each"""
+
+    def __init__(self, base_url: str, num_sessions: int, concurrency: int):
+        self.base_url = base_url
+        self.num_sessions = num_sessions
+        self.concurrency = concurrency
+        self.sessions: List[requests.Session] = []
+        self.errors = 0
+
+    def create_session(self, index: int) -> Optional[requests.Session]:
+        """Register and login one user"""
+        unique_id = str(uuid.uuid4())[:8]
+        user = {
+            "email": f"refreshstorm-{index}-{unique_id}@stress-test.com",
+            "password": f"StormPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+        try:
+            response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+            if response.status_code not in [200, 201]:
+                return None
+            session = requests.Session()
+            response = session.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user["email"], "password": user["password"]},
+                timeout=10
+            )
+            return session if response.status_code in [200, 201] else None
+        except Exception:
+            return None
+
+    def run(self) -> List[requests.Session]:
+        """Create all sessions"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Logging In Sessions")
+        print(f"{'='*70}")
+        print(f"Sessions:      {self.num_sessions}")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"{'='*70}\n")
+
+        completed = 0
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.create_session, i) for i in range(self.num_sessions)]
+            for future in as_completed(futures):
+                session = future.result()
+                completed += 1
+                if session:
+                    self.sessions.append(session)
+                else:
+                    self.errors += 1
+
+                progress = (completed / self.num_sessions) * 100
+                bar_length = 40
+                filled = int(bar_length * completed // self.num_sessions)
+                bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                print(
+                    f"\r{bar} {progress:.1f}% ({completed}/{self.num_sessions})", end="", flush=True)
+
+        print(f"\n\nSetup completed in {time.time() - start_time:.2f}s")
+        print(f"Sessions ready: {len(self.sessions)}/{self.num_sessions}")
+        if self.errors > 0:
+            print(f"Errors: {self.errors}")
+        return self.sessions
+
+
+class Prober:
+    """Background refreshes of dedicated sessions at a fixed interval"""
+
+    def __init__(self, endpoint: str, sessions: List[requests.Session], interval: float):
+        self.endpoint = endpoint
+        self.sessions = sessions
+        self.interval = interval
+        self.samples: List[Tuple[float, float, int]] = []  # (offset, latency, status)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.start_time = 0.0
+
+    def start(self, start_time: float):
+        self.start_time = start_time
+        self.thread.start()
+
+    def run(self):
+        """Sequential probes, one session at a time so no cookie jar is shared"""
+        index = 0
+        next_probe = time.time()
+        while not self.stop_event.is_set():
+            session = self.sessions[index % len(self.sessions)]
+            index += 1
+            offset = time.time() - self.start_time
+            try:
+                start = time.time()
+                response = session.post(self.endpoint, json={}, timeout=10)
+                self.samples.append((offset, time.time() - start, response.status_code))
+            except requests.exceptions.RequestException:
+                self.samples.append((offset, 10.0, -1))
+            next_probe += self.interval
+            self.stop_event.wait(max(0.0, next_probe - time.time()))
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def latencies(self, start: float, end: float) -> List[float]:
+        """Successful probe latencies sent between two offsets"""
+        return [latency for offset, latency, status in self.samples
+                if start <= offset < end and status in [200, 201]]
+
+
+class RefreshStorm:
+    """Release every session's refresh inside the burst window"""
+
+    def __init__(self, base_url: str, sessions: List[requests.Session], probe_sessions: List[requests.Session],
+                 burst_window: float, concurrency: int, baseline: float, observe: float,
+                 probe_interval: float, recovery_factor: float, recovery_probes: int):
+        self.base_url = base_url
+        self.endpoint = f"{base_url}/v1/auth/refresh-token"
+        self.sessions = sessions
+        self.burst_window = burst_window
+        self.concurrency = concurrency
+        self.baseline = baseline
+        self.observe = observe
+        self.recovery_factor = recovery_factor
+        self.recovery_probes = recovery_probes
+        self.prober = Prober(self.endpoint, probe_sessions, probe_interval)
+        self.results: List[Tuple[float, float, float, int]] = []  # (scheduled, send lag, latency, status)
+        self.error_codes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def send_request(self, session: requests.Session, scheduled: float) -> Tuple[float, float, float, int]:
+        """Wait for the scheduled moment, then refresh"""
+        delay = scheduled - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        sent = time.time()
+        try:
+            response = session.post(self.endpoint, json={}, timeout=10)
+            status_code = response.status_code
+        except requests.exceptions.Timeout:
+            status_code = -1
+        except Exception:
+            status_code = -1
+        done = time.time()
+        # Latency counts from the scheduled moment: harness queueing is storm queueing too
+        return (scheduled, sent - scheduled, done - scheduled, status_code)
+
+    def run(self) -> Dict:
+        """Baseline, burst, observe"""
+        print(f"\n{'='*70}")
+        print(f"Refresh Storm")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.endpoint}")
+        print(f"Sessions:      {len(self.sessions)} released within {self.burst_window:.3f}s")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Probing:       {len(self.prober.sessions)} sessions every {self.prober.interval * 1000:.0f}ms")
+        print(f"Baseline:      {self.baseline:.0f}s, observe {self.observe:.0f}s after the burst")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        self.prober.start(start_time)
+        print(f"Measuring baseline for {self.baseline:.0f}s...", flush=True)
+        time.sleep(self.baseline)
+
+        burst_start = time.time()
+        spacing = self.burst_window / len(self.sessions)
+        completed = 0
+        print("Releasing the storm...", flush=True)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(self.send_request, session, burst_start + i * spacing)
+                for i, session in enumerate(self.sessions)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                self.results.append(result)
+                if result[3] not in [200, 201]:
+                    status_key = str(result[3])
+                    self.error_codes[status_key] = self.error_codes.get(status_key, 0) + 1
+                completed += 1
+
+                progress = (completed / len(self.sessions)) * 100
+                bar_length = 40
+                filled = int(bar_length * completed // len(self.sessions))
+                bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                print(
+                    f"\r{bar} {progress:.1f}% ({completed}/{len(self.sessions)})", end="", flush=True)
+        burst_end = time.time()
+
+        print(f"\n\nObserving recovery for {self.observe:.0f}s...", flush=True)
+        time.sleep(self.observe)
+        self.prober.stop()
+
+        return self.generate_report(start_time, burst_start - start_time, burst_end - start_time)
+
+    def first_breach(self, burst_offset: float, baseline_p50: float) -> Optional[float]:
+        """Offset of the first probe from burst start on that left the baseline band, None if none did"""
+        threshold = baseline_p50 * self.recovery_factor
+        for offset, latency, status in self.prober.samples:
+            if offset >= burst_offset and (status not in [200, 201] or latency > threshold):
+                return offset
+        return None
+
+    def recovery_time(self, burst_offset: float, breach_offset: float, baseline_p50: float) -> Optional[float]:
+        """Seconds from burst start until N consecutive probes after the first breach are back within the baseline band"""
+        threshold = baseline_p50 * self.recovery_factor
+        streak, streak_start = 0, None
+        for offset, latency, status in self.prober.samples:
+            if offset <= breach_offset:
+                continue
+            if status in [200, 201] and latency <= threshold:
+                if streak == 0:
+                    streak_start = offset
+                streak += 1
+                if streak >= self.recovery_probes:
+                    return streak_start - burst_offset
+            else:
+                streak = 0
+        return None
+
+    def generate_report(self, start_time: float, burst_offset: float, burst_end: float) -> Dict:
+        """Storm, prober and recovery summary"""
+        storm_duration = burst_end - burst_offset
+        ok = [r for r in self.results if r[3] in [200, 201]]
+        latencies = [r[2] for r in ok]
+        send_lags = [r[1] for r in self.results]
+
+        baseline = self.prober.latencies(0.0, burst_offset)
+        during = self.prober.latencies(burst_offset, burst_end)
+        after = self.prober.latencies(burst_end, math.inf)
+        baseline_p50 = percentile(baseline, 50)
+        breach = self.first_breach(burst_offset, baseline_p50) if baseline else None
+        recovery = self.recovery_time(burst_offset, breach, baseline_p50) if breach is not None else None
+        if not baseline:
+            recovery_text = "no baseline"
+        elif breach is None:
+            # Probes never left the baseline band, there is nothing to recover from
+            recovery_text = "never degraded"
+        else:
+            recovery_text = f"{recovery:.3f}s" if recovery is not None else "not recovered"
+        probe_errors = sum(1 for _, _, status in self.prober.samples if status not in [200, 201])
+
+        def latency_row(values: List[float]) -> Dict[str, str]:
+            return {
+                "samples": len(values),
+                "p50": f"{percentile(values, 50):.4f}s",
+                "p90": f"{percentile(values, 90):.4f}s",
+                "p99": f"{percentile(values, 99):.4f}s",
+                "max": f"{max(values):.4f}s" if values else "0",
+            }
+
+        stats = {
+            "summary": {
+                "sessions": len(self.sessions),
+                "burst_window": f"{self.burst_window:.3f}s",
+                "successful": len(ok),
+                "failed": len(self.results) - len(ok),
+                "error_rate": f"{(len(self.results) - len(ok)) / len(self.results) * 100 if self.results else 0:.2f}%",
+                "storm_duration": f"{storm_duration:.3f}s",
+                "storm_throughput": f"{len(self.results) / storm_duration:.2f}" if storm_duration else "0",
+                "degraded_after": f"{breach - burst_offset:.3f}s" if breach is not None else None,
+                "recovery_time": recovery_text,
+            },
+            "storm_latency": latency_row(latencies),
+            "storm_queueing": latency_row(send_lags),
+            "errors": self.error_codes,
+            "probes": {
+                "baseline": latency_row(baseline),
+                "during_storm": latency_row(during),
+                "after_storm": latency_row(after),
+                "errors": probe_errors,
+                "recovery_threshold": f"{baseline_p50 * self.recovery_factor:.4f}s",
+                "timeline": [
+                    {"offset": f"{offset - burst_offset:.3f}s", "latency": f"{latency:.4f}s", "status": status}
+                    for offset, latency, status in self.prober.samples
+                ],
+            },
+        }
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Refresh Storm Results")
+        print(f"{'='*70}")
+        print(f"Sessions Released:  {stats['summary']['sessions']} in {stats['summary']['burst_window']}")
+        print(f"Successful:         {stats['summary']['successful']} ✓")
+        print(f"Failed:             {stats['summary']['failed']} ✗")
+        print(f"Error Rate:         {stats['summary']['error_rate']}")
+        print(f"Storm Duration:     {stats['summary']['storm_duration']}")
+        print(f"Storm Throughput:   {stats['summary']['storm_throughput']} req/s")
+
+        print(f"\n{'':<22} {'P50':>9} {'P90':>9} {'P99':>9} {'Max':>9}")
+        for name, row in [("storm latency", stats["storm_latency"]),
+                          ("storm queueing", stats["storm_queueing"]),
+                          ("probe baseline", stats["probes"]["baseline"]),
+                          ("probe during storm", stats["probes"]["during_storm"]),
+                          ("probe after storm", stats["probes"]["after_storm"])]:
+            print(f"{name:<22} {row['p50']:>9} {row['p90']:>9} {row['p99']:>9} {row['max']:>9}")
+
+        print()
+        if stats['summary']['degraded_after'] is not None:
+            print(f"Degraded After:     {stats['summary']['degraded_after']} (first probe outside the band)")
+        print(f"Recovery:           {stats['summary']['recovery_time']} "
+              f"(p50 back under {stats['probes']['recovery_threshold']} for {self.recovery_probes} probes)")
+
+        if stats['errors']:
+            print(f"\nError Distribution:")
+            for code, count in stats['errors'].items():
+                print(f"  Status {code}: {count} requests")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Thundering-herd refresh storm (M sessions refresh within a burst window)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python refresh-storm.py --sessions 500 --burst-window 1s
+  python refresh-storm.py -s 2000 --burst-window 0.2s -c 500 --observe 60s
+        """
+    )
+
+    parser.add_argument(
+        "-s", "--sessions",
+        type=int,
+        default=500,
+        help="Number of logged-in sessions released in the storm (default: 500)"
+    )
+    parser.add_argument(
+        "--burst-window",
+        type=str,
+        default="1s",
+        help="Window the storm's refreshes are spread evenly over, 0 = all at once (default: 1s)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=200,
+        help="Maximum number of in-flight storm requests (default: 200)"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default="5s",
+        help="Probing time before the storm (default: 5s)"
+    )
+    parser.add_argument(
+        "--observe",
+        type=str,
+        default="30s",
+        help="Probing time after the storm completes (default: 30s)"
+    )
+    parser.add_argument(
+        "--probe-interval",
+        type=str,
+        default="0.1s",
+        help="Interval between probe refreshes (default: 0.1s)"
+    )
+    parser.add_argument(
+        "--probe-sessions",
+        type=int,
+        default=5,
+        help="Dedicated sessions the prober rotates (default: 5)"
+    )
+    parser.add_argument(
+        "--recovery-factor",
+        type=float,
+        default=1.5,
+        help="Recovered when probes are back under this multiple of baseline p50 (default: 1.5)"
+    )
+    parser.add_argument(
+        "--recovery-probes",
+        type=int,
+        default=5,
+        help="Consecutive probes under the threshold that count as recovered (default: 5)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.sessions < 1:
+        print("Error: sessions must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.probe_sessions < 1 or args.recovery_probes < 1:
+        print("Error: probe-sessions and recovery-probes must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.recovery_factor < 1:
+        print("Error: recovery-factor must be >= 1", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        burst_window = parse_duration(args.burst_window)
+        baseline = parse_duration(args.baseline)
+        observe = parse_duration(args.observe)
+        probe_interval = parse_duration(args.probe_interval)
+        if baseline <= 0 or probe_interval <= 0:
+            raise ValueError("baseline and probe-interval must be > 0")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # Setup: storm sessions plus the prober's own sessions
+        sessions = SessionPool(
+            base_url=args.url,
+            num_sessions=args.sessions + args.probe_sessions,
+            concurrency=min(args.concurrency, 50)
+        ).run()
+
+        if len(sessions) <= args.probe_sessions:
+            print(
+                "Error: Not enough sessions were created. Cannot proceed with the storm.", file=sys.stderr)
+            sys.exit(1)
+
+        report = RefreshStorm(
+            base_url=args.url,
+            sessions=sessions[args.probe_sessions:],
+            probe_sessions=sessions[:args.probe_sessions],
+            burst_window=burst_window,
+            concurrency=args.concurrency,
+            baseline=baseline,
+            observe=observe,
+            probe_interval=probe_interval,
+            recovery_factor=args.recovery_factor,
+            recovery_probes=args.recovery_probes
+        ).run()
+
+        # Save report to file
+        report_file = f"refresh_storm_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,34 @@
 Stress test for the refresh token endpoint
 Tests concurrent refresh token requests with metrics collection
 Three phases: Register users -> Login to get tokens -> Refresh tokens
+With --pipeline the phases overlap: registered users stream into login and
+logged-in sessions stream into the refresh phase over bounded queues.
 """
 
 from operator import index
 import requests
+import random
 import time
 import uuid
 import json
 import argparse
+import queue
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from statistics import mean, stdev, median
-from typing import Dict, Tuple, List, Optional
+from typing import Callable, Dict, Tuple, List, Optional
 from datetime import datetime
 import sys
 
+from capacity_search import DROPPED, CapacitySearch, parse_slo
+from payload_factory import JSON_HEADERS, PayloadFactory, encode_body, login_arena, register_renderer
+from profiler import build_profiler
+from server_timing import ServerTimingCollector
+from soak import SoakRunner, parse_duration
+from trace_replay import TraceRecorder, TraceReplayer, check_trace_setup, read_trace_header, request_seed, seeded_unique_id
+from trials import TrialRunner, parse_warmup
+from validation import ResponseValidator
+
 
 class UserGenerator:
     """Generate unique user credentials for testing"""
@@ -24,9 +38,9 @@ class UserGenerator:
     def __init__(self):
         self.users: List[Dict[str, str]] = []
 
-    def generate(self, index: int) -> Dict[str, str]:
-        """Generate unique user data"""
-        unique_id = str(uuid.uuid4())[:8]
+    def generate(self, index: int, seed: Optional[int] = None) -> Dict[str, str]:
+        """Generate unique user data (deterministic when seeded)"""
+        unique_id = seeded_unique_id(seed) if seed is not None else str(uuid.uuid4())[:8]
         return {
             "email": f"refreshtest-{index}-{unique_id}@stress-test.com",
             "password": f"RefreshPass123_{unique_id}",
@@ -37,35 +51,48 @@ class UserGenerator:
 class RegistrationPhase:
     """Setup phase 1: Register test users"""
 
-    def __init__(self, base_url: str, num_users: int, concurrency: int):
+    def __init__(self, base_url: str, num_users: int, concurrency: int, base_seed: Optional[int] = None):
         self.base_url = base_url
         self.endpoint = f"{base_url}/v1/auth/register"
         self.num_users = num_users
         self.concurrency = concurrency
+        self.base_seed = base_seed
         self.user_generator = UserGenerator()
+        self.payloads = PayloadFactory(
+            register_renderer(lambda index: self.user_generator.generate(index, self.payload_seed(index))),
+            total=num_users
+        )
         self.registered_users: List[Dict[str, str]] = []
         self.errors = 0
 
-    def send_request(self, index: int) -> Tuple[int, bool, str]:
+    def payload_seed(self, index: int) -> Optional[int]:
+        """Payload seed of a setup user in seeded runs"""
+        return request_seed(self.base_seed, "setup-register", index) if self.base_seed is not None else None
+
+    def send_request(self, index: int) -> Tuple[int, bool, str, Dict[str, str]]:
         """Register a single user"""
-        user = self.user_generator.generate(index)
+        seed = self.payload_seed(index)
+        body, user = self.payloads.get(index)
 
         try:
             start = time.time()
             response = requests.post(
                 self.endpoint,
-                json=user,
+                data=body,
+                headers=JSON_HEADERS,
                 timeout=10
             )
             elapsed = time.time() - start
 
-            is_success = response.status_code in [200, 201]
+            # Seeded users are reproducible, so a 409 means a previous run created them
+            is_success = response.status_code in [200, 201] or (
+                seed is not None and response.status_code == 409)
             if is_success:
                 self.registered_users.append(user)
 
-            return (index, is_success, response.status_code)
+            return (index, is_success, response.status_code, user)
         except Exception as e:
-            return (index, False, str(e))
+            return (index, False, str(e), user)
 
     def run(self) -> List[Dict[str, str]]:
         """Register all test users"""
@@ -88,7 +115,7 @@ class RegistrationPhase:
 
             for future in as_completed(futures):
                 try:
-                    index, is_success, status = future.result()
+                    index, is_success, status, _ = future.result()
                     completed += 1
 
                     if not is_success:
@@ -110,6 +137,8 @@ class RegistrationPhase:
         if self.errors > 0:
             print(f"Errors: {self.errors}")
 
+        # Stable order so replays map request indexes onto the same users
+        self.registered_users.sort(key=lambda user: user["email"])
         return self.registered_users
 
 
@@ -121,32 +150,29 @@ class LoginPhase:
         self.endpoint = f"{base_url}/v1/auth/login"
         self.concurrency = concurrency
         self.users = users
+        self.login_bodies = login_arena(users)
         self.sessions: List[requests.Session] = []
         self.errors = 0
 
     def send_request(self, index: int) -> Tuple[int, bool, Optional[requests.Session]]:
         """Login a single user and capture session with cookies"""
-        user = self.users[index % len(self.users)]
+        session = self.open_session(self.login_bodies[index % len(self.users)])
+        return (index, session is not None, session)
 
+    def open_session(self, body: bytes) -> Optional[requests.Session]:
+        """Login with a ready-to-send body, the session keeps the refresh token cookie"""
         try:
             session = requests.Session()
-            json = {
-                "email": user["email"],
-                "password": user["password"]
-            }
             response = session.post(
                 self.endpoint,
-                json=json,
+                data=body,
+                headers=JSON_HEADERS,
                 timeout=10
             )
 
-            is_success = response.status_code in [200, 201]
-            if is_success:
-                return (index, is_success, session)
-            else:
-                return (index, is_success, None)
+            return session if response.status_code in [200, 201] else None
         except Exception as e:
-            return (index, False, None)
+            return None
 
     def run(self) -> List[requests.Session]:
         """Login all users to get refresh tokens"""
@@ -160,6 +186,7 @@ class LoginPhase:
 
         completed = 0
         start_time = time.time()
+        sessions_by_index: Dict[int, requests.Session] = {}
 
         with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
             futures = {
@@ -173,7 +200,7 @@ class LoginPhase:
                     completed += 1
 
                     if is_success and session:
-                        self.sessions.append(session)
+                        sessions_by_index[index] = session
                     else:
                         self.errors += 1
 
@@ -186,6 +213,9 @@ class LoginPhase:
                 except Exception as e:
                     print(f"\nError: {e}")
 
+        # Stable order so replays map request indexes onto the same sessions
+        self.sessions = [sessions_by_index[i] for i in sorted(sessions_by_index)]
+
         elapsed = time.time() - start_time
         print(f"\n\nLogin phase completed in {elapsed:.2f}s")
         print(
@@ -196,15 +226,156 @@ class LoginPhase:
         return self.sessions
 
 
+class SetupPipeline:
+    """Streaming setup: register -> login -> measured phase over bounded queues
+
+    Register workers hand every created user to the login workers, and login
+    workers hand every session to the measured phase as soon as it is ready, so
+    setup overlaps the load instead of adding up phase by phase. The queues are
+    bounded, so a stage that runs ahead blocks instead of piling up work.
+    Setup requests never reach the measured phase's metrics.
+    """
+
+    def __init__(self, registration: RegistrationPhase, login: LoginPhase, concurrency: int,
+                 queue_size: int):
+        self.registration = registration
+        self.login = login
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.registered: "queue.Queue[Optional[Dict[str, str]]]" = queue.Queue(maxsize=queue_size)
+        self.ready: "queue.Queue[requests.Session]" = queue.Queue(maxsize=queue_size)
+        self.next_index = 0
+        self.register_errors = 0
+        self.login_errors = 0
+        self.logged_in = 0
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.done = threading.Event()
+        self.start_time = None
+        self.first_session_at = None
+        self.end_time = None
+        self.coordinator = threading.Thread(target=self.coordinate, daemon=True)
+
+    def start(self):
+        """Start both setup stages in the background"""
+        self.start_time = time.time()
+        self.coordinator.start()
+
+    def coordinate(self):
+        """Run the stages and close them in order: register, then login"""
+        registers = [threading.Thread(target=self.register_worker, daemon=True) for _ in range(self.concurrency)]
+        logins = [threading.Thread(target=self.login_worker, daemon=True) for _ in range(self.concurrency)]
+        for thread in registers + logins:
+            thread.start()
+        for thread in registers:
+            thread.join()
+        # One end marker per login worker, queued behind the last registered user
+        for _ in logins:
+            self.registered.put(None)
+        for thread in logins:
+            thread.join()
+        self.end_time = time.time()
+        self.done.set()
+
+    def register_worker(self):
+        """Register users until all are created or the measured phase is over"""
+        while not self.stopping.is_set():
+            with self.lock:
+                index = self.next_index
+                if index >= self.registration.num_users:
+                    return
+                self.next_index += 1
+
+            _, is_success, _, user = self.registration.send_request(index)
+            if is_success:
+                self.registered.put(user)
+            else:
+                with self.lock:
+                    self.register_errors += 1
+
+    def login_worker(self):
+        """Log registered users in and hand their sessions to the measured phase"""
+        while True:
+            user = self.registered.get()
+            if user is None:
+                return
+            session = self.login.open_session(encode_body({"email": user["email"], "password": user["password"]}))
+            if session is None:
+                with self.lock:
+                    self.login_errors += 1
+                continue
+
+            with self.lock:
+                self.logged_in += 1
+                if self.first_session_at is None:
+                    self.first_session_at = time.time()
+            # Nobody takes sessions once the measured phase is over
+            while not self.stopping.is_set():
+                try:
+                    self.ready.put(session, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def take(self) -> Optional[requests.Session]:
+        """A freshly logged-in session, None when none is waiting"""
+        try:
+            return self.ready.get_nowait()
+        except queue.Empty:
+            return None
+
+    def exhausted(self) -> bool:
+        """No session is waiting and none will come"""
+        return self.done.is_set() and self.ready.empty()
+
+    def stop(self):
+        """Stop registering new users and wait for the users in flight"""
+        self.stopping.set()
+        self.coordinator.join()
+
+    def summary(self) -> Dict:
+        """Report section"""
+        end_time = self.end_time or time.time()
+        return {
+            "users_requested": self.registration.num_users,
+            "registered": len(self.registration.registered_users),
+            "logged_in": self.logged_in,
+            "register_errors": self.register_errors,
+            "login_errors": self.login_errors,
+            "queue_size": self.queue_size,
+            "time_to_first_session": f"{self.first_session_at - self.start_time:.2f}s" if self.first_session_at else None,
+            "setup_duration": f"{end_time - self.start_time:.2f}s",
+        }
+
+    def print_summary(self, overlapped: int):
+        """Print the setup section of the report"""
+        summary = self.summary()
+        print(f"\nStreaming Setup:")
+        print(f"  Registered:       {summary['registered']}/{summary['users_requested']}")
+        print(f"  Logged in:        {summary['logged_in']}")
+        if summary['register_errors'] or summary['login_errors']:
+            print(f"  Errors:           {summary['register_errors']} register, {summary['login_errors']} login")
+        print(f"  First session:    {summary['time_to_first_session'] or 'never'}")
+        print(f"  Setup duration:   {summary['setup_duration']}")
+        print(f"  Measured requests sent while setup was running: {overlapped}")
+
+
 class RefreshTokenStressTest:
     """Refresh token stress testing phase"""
 
-    def __init__(self, base_url: str, num_requests: int, concurrency: int, sessions: List[requests.Session]):
+    def __init__(self, base_url: str, num_requests: int, concurrency: int, sessions: List[requests.Session],
+                 base_seed: Optional[int] = None, recorder: Optional[TraceRecorder] = None,
+                 validator: Optional[ResponseValidator] = None,
+                 timing: Optional[ServerTimingCollector] = None):
         self.base_url = base_url
         self.endpoint = f"{base_url}/v1/auth/refresh-token"
         self.num_requests = num_requests
         self.concurrency = concurrency
         self.sessions = sessions
+        self.base_seed = base_seed
+        self.recorder = recorder
+        self.validator = validator
+        self.timing = timing
         self.results = {
             "success": [],
             "failed": [],
@@ -212,14 +383,24 @@ class RefreshTokenStressTest:
         }
         self.start_time = None
         self.end_time = None
+        self.pipeline: Optional[SetupPipeline] = None
+        self.during_setup = 0
 
-    def send_request(self, index: int) -> Tuple[int, float, int, str]:
+    def send_request(self, index: int, seed: Optional[int] = None,
+                     session: Optional[requests.Session] = None, pause: bool = True) -> Tuple[int, float, int, str]:
         """Send a single refresh token request"""
-        if not self.sessions:
+        if session is None and not self.sessions:
             return (index, 0.0, -1, "No sessions available")
 
-        # Cycle through sessions
-        session = self.sessions[index % len(self.sessions)]
+        if seed is None and self.base_seed is not None:
+            seed = request_seed(self.base_seed, "refresh", index)
+        if self.recorder:
+            self.recorder.record(index, seed)
+
+        # Cycle through sessions; the body is empty and the cookie jar carries the token, the seed is only recorded.
+        # Round robin keeps two in-flight refreshes off the same cookie jar
+        if session is None:
+            session = self.sessions[index % len(self.sessions)]
 
         last_cookies = session.cookies.get_dict()
 
@@ -232,15 +413,19 @@ class RefreshTokenStressTest:
                 timeout=10
             )
             elapsed = time.time() - start
+            status_code = self.validator.status("refresh", response, previous=last_cookies.get("refreshToken")) if self.validator else response.status_code
+            if self.timing:
+                self.timing.record(response, elapsed)
 
             # Slight delay to mimic real-world usage
-            random_sleep = 0.1 + (0.4 * (index % 5) / 5)  # 0.1s to 0.5s
-            time.sleep(random_sleep)
+            if pause:
+                random_sleep = 0.1 + (0.4 * (index % 5) / 5)  # 0.1s to 0.5s
+                time.sleep(random_sleep)
 
             if response.status_code == 401:
                 print(f"index: {index} {response.json()['message']}")
 
-            return (index, elapsed, response.status_code, response.text)
+            return (index, elapsed, status_code, response.text)
         except requests.exceptions.Timeout:
             return (index, 10.0, -1, "Timeout")
         except requests.exceptions.ConnectionError:
@@ -248,6 +433,30 @@ class RefreshTokenStressTest:
         except Exception as e:
             return (index, 0.0, -1, str(e))
 
+    def exclusive_sender(self) -> Callable[[int], Tuple]:
+        """send_request for open-loop arrivals (capacity search)
+
+        Every arrival checks a session out of an idle queue, so no two refreshes
+        ever share a cookie jar (a rotated token would be reported as revoked).
+        An arrival that finds every session in flight is dropped, and there is
+        no think time: the arrival rate is the offered load.
+        """
+        idle: "queue.Queue[requests.Session]" = queue.Queue()
+        for session in self.sessions:
+            idle.put(session)
+
+        def send(index: int) -> Tuple:
+            try:
+                session = idle.get_nowait()
+            except queue.Empty:
+                return (index, 0.0, DROPPED, "No idle session")
+            try:
+                return self.send_request(index, session=session, pause=False)
+            finally:
+                idle.put(session)
+
+        return send
+
     def process_response(self, index: int, elapsed: float, status_code: int, response_text: str):
         """Process response and collect metrics"""
         is_success = status_code in [200, 201]
@@ -316,6 +525,107 @@ class RefreshTokenStressTest:
 
         return self.generate_report()
 
+    def stream(self, pipeline: SetupPipeline) -> Dict:
+        """Execute the stress test while the setup pipeline is still producing sessions"""
+        print(f"\n{'='*70}")
+        print(f"Streaming Setup Into Refresh Token Endpoint Stress Test")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.endpoint}")
+        print(f"Total Requests: {self.num_requests}")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Users to create: {pipeline.registration.num_users}")
+        print(f"Queue size:    {pipeline.queue_size}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        self.pipeline = pipeline
+        # Sessions between two refreshes; a session is only used by one worker at a time
+        idle: "queue.Queue[requests.Session]" = queue.Queue()
+        lock = threading.Lock()
+        next_index = 0
+        completed = 0
+
+        def checkout() -> Optional[requests.Session]:
+            # New sessions join the rotation first, otherwise wait for an idle one
+            while True:
+                session = pipeline.take()
+                if session is not None:
+                    with lock:
+                        self.sessions.append(session)
+                    return session
+                try:
+                    return idle.get(timeout=0.05)
+                except queue.Empty:
+                    if pipeline.exhausted() and not self.sessions:
+                        return None
+
+        def worker():
+            nonlocal next_index, completed
+            while True:
+                with lock:
+                    index = next_index
+                    if index >= self.num_requests:
+                        return
+                    next_index += 1
+
+                session = checkout()
+                if session is None:
+                    result = (index, 0.0, -1, "No sessions available")
+                else:
+                    with lock:
+                        # The measured phase starts with its first request, not with setup
+                        if self.start_time is None:
+                            self.start_time = time.time()
+                        if not pipeline.done.is_set():
+                            self.during_setup += 1
+                    result = self.send_request(index, session=session)
+                    idle.put(session)
+
+                with lock:
+                    self.process_response(*result)
+                    completed += 1
+
+                    progress = (completed / self.num_requests) * 100
+                    bar_length = 40
+                    filled = int(bar_length * completed // self.num_requests)
+                    bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                    print(
+                        f"\r{bar} {progress:.1f}% ({completed}/{self.num_requests})", end="", flush=True)
+
+        pipeline.start()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(self.concurrency)]
+            for future in as_completed(futures):
+                future.result()
+        self.end_time = time.time()
+        if self.start_time is None:
+            self.start_time = pipeline.start_time
+        pipeline.stop()
+        print("\n")
+
+        return self.generate_report()
+
+    def replay(self, replayer: TraceReplayer) -> Dict:
+        """Replay a recorded trace instead of the fixed request loop"""
+        print(f"\n{'='*70}")
+        print(f"Refresh Token Endpoint Trace Replay")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.endpoint}")
+        print(f"Trace:         {replayer.path} ({replayer.total} requests)")
+        print(f"Speed:         {replayer.speed}x")
+        print(f"{'='*70}\n")
+
+        self.start_time = time.time()
+        replayer.run(
+            lambda index, event: self.send_request(event.index, seed=event.seed),
+            lambda result: self.process_response(*result)
+        )
+        self.end_time = time.time()
+
+        report = self.generate_report()
+        report["replay"] = replayer.summary()
+        return report
+
     def generate_report(self) -> Dict:
         """Generate test report with statistics"""
         total_time = self.end_time - self.start_time
@@ -371,6 +681,19 @@ class RefreshTokenStressTest:
                 print(
                     f"  Std Dev:          {stats['response_times']['stdev']}")
 
+        if self.validator:
+            stats["validation"] = self.validator.summary()
+            self.validator.print_summary()
+
+        if self.timing:
+            stats["server_timing"] = self.timing.summary()
+            self.timing.print_summary()
+
+        if self.pipeline:
+            stats["setup_pipeline"] = self.pipeline.summary()
+            stats["setup_pipeline"]["requests_during_setup"] = self.during_setup
+            self.pipeline.print_summary(self.during_setup)
+
         if stats['errors']:
             print(f"\nError Distribution:")
             for code, count in stats['errors'].items():
@@ -391,6 +714,7 @@ def main():
 Examples:
   python refresh-token.py --users 50 --requests 500 --concurrency 25
   python refresh-token.py -u 100 -r 1000 -c 50 --url http://localhost:3001
+  python refresh-token.py -u 5000 -r 20000 -c 50 --pipeline --queue-size 100
         """
     )
 
@@ -418,6 +742,147 @@ Examples:
         default="http://localhost:3001",
         help="Base URL of the API (default: http://localhost:3001)"
     )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Stream registered users into login and sessions into the refresh phase instead of running the phases one after another"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=50,
+        help="Pipeline mode: capacity of the register->login and login->refresh queues (default: 50)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=str,
+        default=None,
+        help="Soak mode: run for a fixed duration (e.g. 4h, 30m, 90s) instead of a request count"
+    )
+    parser.add_argument(
+        "--window",
+        type=str,
+        default="60s",
+        help="Soak mode metrics window (default: 60s)"
+    )
+    parser.add_argument(
+        "--pids",
+        type=str,
+        default="",
+        help="Soak mode: comma-separated server PIDs whose RSS is sampled (default: none)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Base seed for deterministic payloads instead of uuid4 (default: random)"
+    )
+    parser.add_argument(
+        "--record-trace",
+        type=str,
+        default=None,
+        help="Record the measured requests (send offset, step, index, payload seed) to a trace file"
+    )
+    parser.add_argument(
+        "--replay-trace",
+        type=str,
+        default=None,
+        help="Replay a recorded trace instead of --requests"
+    )
+    parser.add_argument(
+        "--validate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of 2xx responses checked against the API contract, failures count as invalid_2xx (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--server-timing",
+        action="store_true",
+        help="Break latency down by the API's Server-Timing phases (start the API with SERVER_TIMING=true)"
+    )
+    parser.add_argument(
+        "--find-capacity",
+        action="store_true",
+        help="Search the highest sustainable request rate under --slo instead of a fixed --requests run"
+    )
+    parser.add_argument(
+        "--slo",
+        type=str,
+        default="p99<200ms,errors<0.1%",
+        help="Capacity search SLO (default: p99<200ms,errors<0.1%%)"
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=str,
+        default="10s",
+        help="Capacity search duration of each fixed-rate step (default: 10s)"
+    )
+    parser.add_argument(
+        "--start-rate",
+        type=float,
+        default=10.0,
+        help="Capacity search first arrival rate in req/s (default: 10)"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=5000.0,
+        help="Capacity search upper bound in req/s (default: 5000)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Capacity search verification runs at the result (default: 3)"
+    )
+    parser.add_argument(
+        "--profile-inspect",
+        type=str,
+        default=None,
+        help="Inspector URL of an API started with node --inspect (e.g. http://127.0.0.1:9229), enables profiling in capacity mode"
+    )
+    parser.add_argument(
+        "--profile-stages",
+        type=str,
+        default=None,
+        help="Comma-separated stages profiled when they start: capacity search steps step-1, step-2, ..., or all"
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=str,
+        default=None,
+        help="Profile a stage once its running p99 exceeds this, e.g. 200ms"
+    )
+    parser.add_argument(
+        "--profile-window",
+        type=str,
+        default="5s",
+        help="CPU profile length per capture (default: 5s)"
+    )
+    parser.add_argument(
+        "--heap-snapshot",
+        action="store_true",
+        help="Take a heap snapshot after each CPU profile"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay time compression, 2.0 replays twice as fast (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=str,
+        default=None,
+        help="Excluded warm-up before measuring: a request count (500) or a duration (30s), enables trials mode"
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=1,
+        help="Interleaved measured trials of --requests each, reported with bootstrap confidence intervals (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -431,45 +896,171 @@ Examples:
     if args.concurrency < 1:
         print("Error: concurrency must be >= 1", file=sys.stderr)
         sys.exit(1)
+    if args.queue_size < 1:
+        print("Error: queue-size must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    # Replays map indexes onto the sorted session list, soak and capacity runs need every session up front
+    if args.pipeline and (args.duration or args.find_capacity or args.record_trace or args.replay_trace):
+        print("Error: --pipeline only applies to fixed --requests runs", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        duration = parse_duration(args.duration) if args.duration else None
+        window = parse_duration(args.window)
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        if duration is not None and duration <= 0:
+            raise ValueError("duration must be > 0")
+        warmup_seconds, warmup_requests = parse_warmup(args.warmup)
+        if args.trials < 1:
+            raise ValueError("trials must be >= 1")
+        if (args.trials > 1 or args.warmup) and (duration or args.find_capacity or args.replay_trace or args.pipeline):
+            raise ValueError("--trials and --warmup only apply to fixed --requests runs")
+        slo = parse_slo(args.slo) if args.find_capacity else None
+        step_duration = parse_duration(args.step_duration)
+        if step_duration <= 0:
+            raise ValueError("step-duration must be > 0")
+        if not 0 < args.start_rate <= args.max_rate:
+            raise ValueError("start-rate must be > 0 and <= max-rate")
+        if args.repeats < 1:
+            raise ValueError("repeats must be >= 1")
+        pids = [int(pid) for pid in args.pids.split(",") if pid.strip()]
+        base_seed = args.seed
+        if args.replay_trace:
+            header = read_trace_header(args.replay_trace)
+            if header["step"] != "refresh":
+                raise ValueError(f"trace step is {header['step']}, expected refresh")
+            check_trace_setup(header, "users", args.users)
+            base_seed = header["seed"]
+        elif args.record_trace and base_seed is None:
+            base_seed = random.getrandbits(32)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.speed <= 0:
+        print("Error: speed must be > 0", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.validate_rate <= 1:
+        print("Error: validate-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    recorder = TraceRecorder(
+        args.record_trace, "refresh", "refresh", base_seed, payload_seeded=False) if args.record_trace else None
 
     try:
         # Phase 1: Register test users
         registration = RegistrationPhase(
             base_url=args.url,
             num_users=args.users,
-            concurrency=args.concurrency
-        )
-        registered_users = registration.run()
-
-        if not registered_users:
-            print(
-                "Error: No users were registered. Cannot proceed with login.", file=sys.stderr)
-            sys.exit(1)
-
-        # Phase 2: Login users to get refresh tokens
-        login = LoginPhase(
-            base_url=args.url,
             concurrency=args.concurrency,
-            users=registered_users
+            base_seed=base_seed
         )
-        sessions = login.run()
+        if args.pipeline:
+            # Users and sessions are produced while the refresh phase runs
+            login = LoginPhase(
+                base_url=args.url,
+                concurrency=args.concurrency,
+                users=[]
+            )
+            sessions = []
+        else:
+            registered_users = registration.run()
 
-        if not sessions:
-            print(
-                "Error: No users were logged in. Cannot proceed with refresh token test.", file=sys.stderr)
-            sys.exit(1)
+            if not registered_users:
+                print(
+                    "Error: No users were registered. Cannot proceed with login.", file=sys.stderr)
+                sys.exit(1)
+
+            # Phase 2: Login users to get refresh tokens
+            login = LoginPhase(
+                base_url=args.url,
+                concurrency=args.concurrency,
+                users=registered_users
+            )
+            sessions = login.run()
+
+            if not sessions:
+                print(
+                    "Error: No users were logged in. Cannot proceed with refresh token test.", file=sys.stderr)
+                sys.exit(1)
 
         # Phase 3: Refresh token stress test
         refresh_tester = RefreshTokenStressTest(
             base_url=args.url,
             num_requests=args.requests,
             concurrency=args.concurrency,
-            sessions=sessions
+            sessions=sessions,
+            base_seed=base_seed,
+            recorder=recorder,
+            validator=ResponseValidator(args.validate_rate) if args.validate_rate > 0 else None,
+            timing=ServerTimingCollector() if args.server_timing else None
         )
-        report = refresh_tester.run()
+        if args.replay_trace:
+            check_trace_setup(header, "sessions", len(sessions))
+        if recorder:
+            recorder.start({"users": args.users, "sessions": len(sessions)})
+        if args.replay_trace:
+            report = refresh_tester.replay(TraceReplayer(
+                args.replay_trace, speed=args.speed, concurrency=args.concurrency))
+        elif args.find_capacity:
+            # Capacity mode: open-loop rate steps, ramp then bisection under the SLO
+            report = CapacitySearch(
+                send_request=refresh_tester.exclusive_sender(),
+                slo=slo,
+                step_duration=step_duration,
+                start_rate=args.start_rate,
+                max_rate=args.max_rate,
+                repeats=args.repeats,
+                profiler=build_profiler(args, "refresh_token_capacity_")
+            ).run()
+        elif duration:
+            # Soak mode: fixed duration, constant-memory metrics, drift detection
+            report = SoakRunner(
+                send_request=refresh_tester.send_request,
+                duration=duration,
+                concurrency=args.concurrency,
+                window=window,
+                pids=pids
+            ).run()
+            if refresh_tester.validator:
+                report["validation"] = refresh_tester.validator.summary()
+        elif args.pipeline:
+            report = refresh_tester.stream(SetupPipeline(
+                registration=registration,
+                login=login,
+                concurrency=args.concurrency,
+                queue_size=args.queue_size
+            ))
+            if not refresh_tester.sessions:
+                print(
+                    "Error: No users were logged in during streaming setup.", file=sys.stderr)
+                sys.exit(1)
+        elif args.trials > 1 or args.warmup:
+            # Trials mode: excluded warm-up, interleaved trials, bootstrap confidence intervals
+            report = TrialRunner(
+                send_request=refresh_tester.send_request,
+                num_requests=args.requests,
+                concurrency=args.concurrency,
+                trials=args.trials,
+                warmup_seconds=warmup_seconds,
+                warmup_requests=warmup_requests,
+                on_warmup_done=refresh_tester.timing.reset if refresh_tester.timing else None
+            ).run()
+            if refresh_tester.validator:
+                report["validation"] = refresh_tester.validator.summary()
+        else:
+            report = refresh_tester.run()
+
+        # Soak, capacity and trials reports are built outside the tester
+        if refresh_tester.timing and "server_timing" not in report:
+            report["server_timing"] = refresh_tester.timing.summary()
+            refresh_tester.timing.print_summary()
 
         # Save report to file
-        report_file = f"refresh_token_stress_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report_prefix = "refresh_token_capacity_report_" if args.find_capacity else \
+            "refresh_token_soak_report_" if duration else \
+            "refresh_token_trials_report_" if "trials" in report else "refresh_token_stress_test_report_"
+        report_file = f"{report_prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(report_file, 'w') as f:
             json.dump(report, f, indent=2)
         print(f"Report saved to: {report_file}\n")
@@ -480,6 +1071,9 @@ Examples:
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if recorder:
+            recorder.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Registration uniqueness contention and duplicate-email benchmark
+/v1/auth/register looks the email up, hashes the password with Argon2 and then
+inserts, relying on the users.email UNIQUE constraint for anything the lookup
+missed. Two scenarios show where duplicates are rejected and what they cost:
+- mixed: a stream of registrations where --duplicate-ratio of the requests
+  reuse an email that was already submitted (a client retrying)
+- bursts: groups of threads released together by a barrier, all submitting the
+  same new email at once (a retry storm)
+Every response is classified as created (201), conflict (409, rejected by the
+lookup) or race_lost (5xx unique violation, rejected by the insert after the
+hash). Latency is reported per outcome, together with the Argon2 work spent on
+rejected requests: measured from the Server-Timing argon2 phase when the API
+runs with SERVER_TIMING=true, otherwise estimated from latency against the
+cost of a hash (created p50 minus cheap-conflict p50). More than one 201 for
+the same email is reported as duplicate users created.
+"""
+
+import requests
+import math
+import random
+import re
+import threading
+import time
+import uuid
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime
+import sys
+
+from payload_factory import JSON_HEADERS, encode_body
+from server_timing import parse_server_timing
+
+OUTCOMES = ["created", "conflict", "race_lost", "error"]
+
+# Sequelize UniqueConstraintError surfaces as "Validation error", Postgres as a duplicate key
+UNIQUE_VIOLATION = re.compile(r"validation error|unique|duplicate key", re.IGNORECASE)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Attempt(NamedTuple):
+    email: str
+    duplicate: bool
+    outcome: str
+    status: str
+    latency: float
+    argon2: Optional[float]  # seconds from Server-Timing, None without the header
+
+
+def classify(status_code: int, text: str) -> str:
+    """Outcome of one register response"""
+    if status_code in [200, 201]:
+        return "created"
+    if status_code == 409:
+        return "conflict"
+    if status_code >= 500 and UNIQUE_VIOLATION.search(text):
+        return "race_lost"
+    return "error"
+
+
+class Registrar:
+    """Send register requests and keep every attempt"""
+
+    def __init__(self, base_url: str):
+        self.endpoint = f"{base_url}/v1/auth/register"
+        self.attempts: List[Attempt] = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def user(email: str) -> Dict[str, str]:
+        return {"email": email, "password": "DuplicatePass123_x", "name": "Duplicate Test User"}
+
+    def send(self, email: str, duplicate: bool) -> Attempt:
+        """Register one email"""
+        try:
+            start = time.time()
+            response = requests.post(self.endpoint, data=encode_body(self.user(email)), headers=JSON_HEADERS,
+                                     timeout=30)
+            elapsed = time.time() - start
+            header = response.headers.get("Server-Timing")
+            argon2 = parse_server_timing(header).get("argon2", 0.0) if header else None
+            attempt = Attempt(email, duplicate, classify(response.status_code, response.text),
+                              str(response.status_code), elapsed, argon2)
+        except requests.exceptions.Timeout:
+            attempt = Attempt(email, duplicate, "error", "Timeout", 30.0, None)
+        except requests.exceptions.RequestException:
+            attempt = Attempt(email, duplicate, "error", "Connection Error", 0.0, None)
+        with self.lock:
+            self.attempts.append(attempt)
+        return attempt
+
+
+def new_email(tag: str) -> str:
+    unique_id = str(uuid.uuid4())[:8]
+    return f"regdup-{tag}-{unique_id}@stress-test.com"
+
+
+class MixedScenario:
+    """Registration stream with a share of resubmitted emails"""
+
+    def __init__(self, base_url: str, num_requests: int, concurrency: int, duplicate_ratio: float, seed: int):
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.duplicate_ratio = duplicate_ratio
+        self.random = random.Random(seed)
+        self.registrar = Registrar(base_url)
+        self.submitted: List[str] = []
+        self.lock = threading.Lock()
+
+    def pick(self, index: int):
+        """Email for one request: a resubmission of an earlier email or a new one"""
+        with self.lock:
+            if self.submitted and self.random.random() < self.duplicate_ratio:
+                return self.random.choice(self.submitted), True
+            email = new_email(f"mixed-{index}")
+            self.submitted.append(email)
+            return email, False
+
+    def run(self) -> List[Attempt]:
+        print(f"\n{'='*70}")
+        print(f"Scenario 1: Mixed Stream With Resubmitted Emails")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.registrar.endpoint}")
+        print(f"Requests:      {self.num_requests}")
+        print(f"Duplicates:    {self.duplicate_ratio * 100:g}%")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"{'='*70}\n")
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(lambda i: self.registrar.send(*self.pick(i)), i)
+                       for i in range(self.num_requests)]
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                progress = (completed / self.num_requests) * 100
+                bar_length = 40
+                filled = int(bar_length * completed // self.num_requests)
+                bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                print(
+                    f"\r{bar} {progress:.1f}% ({completed}/{self.num_requests})", end="", flush=True)
+        print("\n")
+        return self.registrar.attempts
+
+
+class BurstScenario:
+    """Groups of concurrent requests for the same new email, released by a barrier"""
+
+    def __init__(self, base_url: str, bursts: int, burst_size: int):
+        self.bursts = bursts
+        self.burst_size = burst_size
+        self.registrar = Registrar(base_url)
+
+    def run_burst(self, number: int):
+        email = new_email(f"burst-{number}")
+        barrier = threading.Barrier(self.burst_size)
+
+        def send():
+            barrier.wait()
+            # No request of a burst is first, they all race for the same email
+            self.registrar.send(email, True)
+
+        threads = [threading.Thread(target=send, daemon=True) for _ in range(self.burst_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run(self) -> List[Attempt]:
+        print(f"\n{'='*70}")
+        print(f"Scenario 2: Concurrent Same-Email Bursts")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.registrar.endpoint}")
+        print(f"Bursts:        {self.bursts} x {self.burst_size} requests")
+        print(f"{'='*70}\n")
+
+        for number in range(self.bursts):
+            self.run_burst(number)
+            completed = number + 1
+            progress = (completed / self.bursts) * 100
+            bar_length = 40
+            filled = int(bar_length * completed // self.bursts)
+            bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+            print(f"\r{bar} {progress:.1f}% ({completed}/{self.bursts})", end="", flush=True)
+        print("\n")
+        return self.registrar.attempts
+
+
+def argon2_cost_estimate(attempts: List[Attempt]) -> Optional[Dict[str, float]]:
+    """Hash cost from latency: created p50 minus the p50 of conflicts rejected by the lookup"""
+    created = [a.latency for a in attempts if a.outcome == "created"]
+    conflicts = [a.latency for a in attempts if a.outcome == "conflict"]
+    if not created or not conflicts:
+        return None
+    cheap = percentile(conflicts, 50)
+    hash_cost = percentile(created, 50) - cheap
+    # A hash costs far more than a lookup; a smaller gap is noise, not a measurable hash
+    if hash_cost < cheap:
+        return None
+    return {"hash_cost": hash_cost, "cheap_rejection": cheap}
+
+
+def summarize(name: str, attempts: List[Attempt], estimate: Optional[Dict[str, float]]) -> Dict:
+    """Per-outcome latency and Argon2 work of one scenario"""
+    timed = any(a.argon2 is not None for a in attempts)
+    outcomes = {}
+    for outcome in OUTCOMES:
+        selected = [a for a in attempts if a.outcome == outcome]
+        latencies = [a.latency for a in selected]
+        row = {
+            "count": len(selected),
+            "duplicates": sum(a.duplicate for a in selected),
+            "mean": f"{sum(latencies) / len(latencies):.4f}s" if latencies else None,
+            "p50": f"{percentile(latencies, 50):.4f}s" if latencies else None,
+            "p99": f"{percentile(latencies, 99):.4f}s" if latencies else None,
+        }
+        if outcome != "created" and selected:
+            if timed:
+                hashed = [a for a in selected if a.argon2]
+                row["hashed"] = len(hashed)
+                row["argon2_seconds"] = round(sum(a.argon2 for a in hashed), 4)
+                row["argon2_source"] = "server-timing"
+            elif estimate:
+                # Slower than a lookup rejection by more than half a hash
+                cutoff = estimate["cheap_rejection"] + estimate["hash_cost"] / 2
+                hashed = [a for a in selected if a.latency > cutoff]
+                row["hashed"] = len(hashed)
+                row["argon2_seconds"] = round(len(hashed) * estimate["hash_cost"], 4)
+                row["argon2_source"] = "latency estimate"
+        outcomes[outcome] = row
+
+    created_by_email: Dict[str, int] = {}
+    for a in attempts:
+        if a.outcome == "created":
+            created_by_email[a.email] = created_by_email.get(a.email, 0) + 1
+    status_codes: Dict[str, int] = {}
+    for a in attempts:
+        status_codes[a.status] = status_codes.get(a.status, 0) + 1
+
+    return {
+        "scenario": name,
+        "requests": len(attempts),
+        "outcomes": outcomes,
+        "duplicate_users_created": sum(1 for count in created_by_email.values() if count > 1),
+        "status_codes": status_codes,
+    }
+
+
+def print_summary(summary: Dict):
+    print(f"\n{summary['scenario']} ({summary['requests']} requests):")
+    print(f"  {'Outcome':<10} {'Count':>6} {'Dups':>6} {'P50':>9} {'P99':>9} {'Hashed':>7} {'Argon2':>9}")
+    for outcome, row in summary["outcomes"].items():
+        if not row["count"]:
+            continue
+        hashed = row.get("hashed")
+        argon2 = row.get("argon2_seconds")
+        print(f"  {outcome:<10} {row['count']:>6} {row['duplicates']:>6} "
+              f"{float(row['p50'][:-1]) * 1000:>7.1f}ms {float(row['p99'][:-1]) * 1000:>7.1f}ms "
+              f"{hashed if hashed is not None else '-':>7} "
+              f"{f'{argon2:.3f}s' if argon2 is not None else '-':>9}")
+    if summary["duplicate_users_created"]:
+        print(f"  ✗ {summary['duplicate_users_created']} emails were created more than once")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Registration uniqueness contention: duplicate emails, same-email bursts, Argon2 work before rejection",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python register-duplicates.py --requests 500 --duplicate-ratio 0.3 --bursts 20 --burst-size 8
+  SERVER_TIMING=true npm start & python register-duplicates.py --burst-size 16
+        """
+    )
+
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=200,
+        help="Requests in the mixed scenario, 0 skips it (default: 200)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=10,
+        help="Concurrency of the mixed scenario (default: 10)"
+    )
+    parser.add_argument(
+        "--duplicate-ratio",
+        type=float,
+        default=0.3,
+        help="Share of mixed-scenario requests that resubmit an earlier email (default: 0.3)"
+    )
+    parser.add_argument(
+        "--bursts",
+        type=int,
+        default=20,
+        help="Same-email bursts, 0 skips the scenario (default: 20)"
+    )
+    parser.add_argument(
+        "--burst-size",
+        type=int,
+        default=8,
+        help="Concurrent requests per burst (default: 8)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for picking resubmitted emails (default: random)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.requests < 0 or args.bursts < 0:
+        print("Error: requests and bursts must be >= 0", file=sys.stderr)
+        sys.exit(1)
+    if not args.requests and not args.bursts:
+        print("Error: nothing to run, set --requests or --bursts", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.burst_size < 2:
+        print("Error: burst-size must be >= 2", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.duplicate_ratio < 1:
+        print("Error: duplicate-ratio must be >= 0 and < 1", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        start_time = time.time()
+        seed = args.seed if args.seed is not None else random.getrandbits(32)
+        scenarios = []
+        if args.requests:
+            scenarios.append(("mixed", MixedScenario(
+                args.url, args.requests, args.concurrency, args.duplicate_ratio, seed).run()))
+        if args.bursts:
+            scenarios.append(("bursts", BurstScenario(args.url, args.bursts, args.burst_size).run()))
+
+        # One hash cost estimate for both scenarios, from the mixed stream when it ran:
+        # its resubmissions mostly arrive after the original and are the cheap conflicts
+        estimate = argon2_cost_estimate(scenarios[0][1])
+        summaries = [summarize(name, attempts, estimate) for name, attempts in scenarios]
+
+        print(f"{'='*70}")
+        print(f"Registration Duplicate Results")
+        print(f"{'='*70}")
+        for summary in summaries:
+            print_summary(summary)
+        timed = any(a.argon2 is not None for _, attempts in scenarios for a in attempts)
+        if timed:
+            print(f"\nArgon2 work: measured from Server-Timing")
+        elif estimate:
+            print(f"\nArgon2 work: estimated, one hash ≈ {estimate['hash_cost'] * 1000:.1f}ms "
+                  f"(created p50 - conflict p50); start the API with SERVER_TIMING=true to measure it")
+        else:
+            print(f"\nArgon2 work: unknown, created and conflict latencies do not separate a hash "
+                  f"(start the API with SERVER_TIMING=true to measure it)")
+        rejected_hashed = sum(summary["outcomes"][o].get("hashed", 0)
+                              for summary in summaries for o in OUTCOMES if o != "created")
+        if rejected_hashed:
+            print(f"Rejected requests that paid for a hash: {rejected_hashed} "
+                  f"(the lookup did not stop them before Argon2)")
+        print(f"Total Duration:     {time.time() - start_time:.2f}s")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        report = {
+            "summary": {
+                "duplicate_ratio": args.duplicate_ratio,
+                "bursts": args.bursts,
+                "burst_size": args.burst_size,
+                "seed": seed,
+                "argon2_source": "server-timing" if timed else "latency estimate" if estimate else None,
+                "hash_cost_estimate": f"{estimate['hash_cost']:.4f}s" if estimate else None,
+                "rejected_requests_hashed": rejected_hashed,
+                "total_duration": f"{time.time() - start_time:.2f}s",
+            },
+            "scenarios": summaries,
+        }
+
+        # Save report to file
+        report_file = f"register_duplicates_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,39 @@ Tests concurrent registration requests with metrics collection
 """
 
 import requests
+import random
 import time
 import uuid
 import json
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from statistics import mean, stdev, median
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import sys
 
+from payload_factory import JSON_HEADERS, PayloadFactory, encode_body, register_renderer
+from server_timing import ServerTimingCollector
+from soak import SoakRunner, parse_duration
+from trace_replay import TraceRecorder, TraceReplayer, read_trace_header, request_seed, seeded_unique_id
+from trials import TrialRunner, parse_warmup
+from validation import ResponseValidator
+
 
 class RegistrationStressTest:
-    def __init__(self, base_url: str, num_requests: int, concurrency: int):
+    def __init__(self, base_url: str, num_requests: int, concurrency: int,
+                 base_seed: Optional[int] = None, recorder: Optional[TraceRecorder] = None,
+                 validator: Optional[ResponseValidator] = None,
+                 timing: Optional[ServerTimingCollector] = None):
         self.base_url = base_url
         self.endpoint = f"{base_url}/v1/auth/register"
         self.num_requests = num_requests
         self.concurrency = concurrency
+        self.base_seed = base_seed
+        self.recorder = recorder
+        self.validator = validator
+        self.timing = timing
+        self.payloads: Optional[PayloadFactory] = None
         self.results = {
             "success": [],
             "failed": [],
@@ -30,29 +46,55 @@ class RegistrationStressTest:
         self.start_time = None
         self.end_time = None
 
-    def generate_user(self, index: int) -> Dict[str, str]:
-        """Generate unique user data for each request"""
-        unique_id = str(uuid.uuid4())[:8]
+    def generate_user(self, index: int, seed: Optional[int] = None) -> Dict[str, str]:
+        """Generate unique user data for each request (deterministic when seeded)"""
+        unique_id = seeded_unique_id(seed) if seed is not None else str(uuid.uuid4())[:8]
         return {
             "email": f"testuser-{index}-{unique_id}@stress-test.com",
             "password": f"StressPass123_{unique_id}",
             "name": f"Test User {index}"
         }
 
-    def send_request(self, index: int) -> Tuple[int, float, int, str]:
+    def payload_seed(self, index: int) -> Optional[int]:
+        """Payload seed of a request index in seeded runs"""
+        return request_seed(self.base_seed, "register", index) if self.base_seed is not None else None
+
+    def prepare(self, total: Optional[int]):
+        """Start pre-rendering request bodies off the hot path (total=None: unbounded)"""
+        self.payloads = PayloadFactory(
+            register_renderer(lambda index: self.generate_user(index, self.payload_seed(index))),
+            total=total
+        )
+        self.payloads.prefill()
+
+    def send_request(self, index: int, seed: Optional[int] = None) -> Tuple[int, float, int, str]:
         """Send a single registration request"""
-        user_data = self.generate_user(index)
+        if seed is None and self.payloads:
+            body, user = self.payloads.get(index)
+            seed = self.payload_seed(index)
+        else:
+            # Replayed seeds are rendered on demand
+            if seed is None:
+                seed = self.payload_seed(index)
+            user = self.generate_user(index, seed)
+            body = encode_body(user)
+        if self.recorder:
+            self.recorder.record(index, seed)
 
         try:
             start = time.time()
             response = requests.post(
                 self.endpoint,
-                json=user_data,
+                data=body,
+                headers=JSON_HEADERS,
                 timeout=10
             )
             elapsed = time.time() - start
+            status_code = self.validator.status("register", response, email=user["email"]) if self.validator else response.status_code
+            if self.timing:
+                self.timing.record(response, elapsed)
 
-            return (index, elapsed, response.status_code, response.text)
+            return (index, elapsed, status_code, response.text)
         except requests.exceptions.Timeout:
             return (index, 10.0, -1, "Timeout")
         except requests.exceptions.ConnectionError:
@@ -94,6 +136,7 @@ class RegistrationStressTest:
             f"Started:            {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*70}\n")
 
+        self.prepare(self.num_requests)
         self.start_time = time.time()
         completed = 0
 
@@ -131,6 +174,27 @@ class RegistrationStressTest:
 
         return self.generate_report()
 
+    def replay(self, replayer: TraceReplayer) -> Dict:
+        """Replay a recorded trace instead of the fixed request loop"""
+        print(f"\n{'='*70}")
+        print("Registration Endpoint Trace Replay")
+        print(f"{'='*70}")
+        print(f"Endpoint:           {self.endpoint}")
+        print(f"Trace:              {replayer.path} ({replayer.total} requests)")
+        print(f"Speed:              {replayer.speed}x")
+        print(f"{'='*70}\n")
+
+        self.start_time = time.time()
+        replayer.run(
+            lambda index, event: self.send_request(event.index, seed=event.seed),
+            lambda result: self.process_response(*result)
+        )
+        self.end_time = time.time()
+
+        report = self.generate_report()
+        report["replay"] = replayer.summary()
+        return report
+
     def generate_report(self) -> Dict:
         """Generate test report with statistics"""
         total_time = self.end_time - self.start_time
@@ -186,6 +250,14 @@ class RegistrationStressTest:
                 print(
                     f"  Std Dev:          {stats['response_times']['stdev']}")
 
+        if self.validator:
+            stats["validation"] = self.validator.summary()
+            self.validator.print_summary()
+
+        if self.timing:
+            stats["server_timing"] = self.timing.summary()
+            self.timing.print_summary()
+
         if stats['errors']:
             print(f"\nError Distribution:")
             for code, count in stats['errors'].items():
@@ -227,6 +299,72 @@ Examples:
         default="http://localhost:3001",
         help="Base URL of the API (default: http://localhost:3001)"
     )
+    parser.add_argument(
+        "--duration",
+        type=str,
+        default=None,
+        help="Soak mode: run for a fixed duration (e.g. 4h, 30m, 90s) instead of a request count"
+    )
+    parser.add_argument(
+        "--window",
+        type=str,
+        default="60s",
+        help="Soak mode metrics window (default: 60s)"
+    )
+    parser.add_argument(
+        "--pids",
+        type=str,
+        default="",
+        help="Soak mode: comma-separated server PIDs whose RSS is sampled (default: none)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Base seed for deterministic payloads instead of uuid4 (default: random)"
+    )
+    parser.add_argument(
+        "--record-trace",
+        type=str,
+        default=None,
+        help="Record the measured requests (send offset, step, index, payload seed) to a trace file"
+    )
+    parser.add_argument(
+        "--replay-trace",
+        type=str,
+        default=None,
+        help="Replay a recorded trace instead of --requests (use a fresh database per replay)"
+    )
+    parser.add_argument(
+        "--validate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of 2xx responses checked against the API contract, failures count as invalid_2xx (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--server-timing",
+        action="store_true",
+        help="Break latency down by the API's Server-Timing phases (start the API with SERVER_TIMING=true)"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay time compression, 2.0 replays twice as fast (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=str,
+        default=None,
+        help="Excluded warm-up before measuring: a request count (500) or a duration (30s), enables trials mode"
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=1,
+        help="Interleaved measured trials of --requests each, reported with bootstrap confidence intervals (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -240,17 +378,94 @@ Examples:
         print("Error: concurrency must be >= 1", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        duration = parse_duration(args.duration) if args.duration else None
+        window = parse_duration(args.window)
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        if duration is not None and duration <= 0:
+            raise ValueError("duration must be > 0")
+        warmup_seconds, warmup_requests = parse_warmup(args.warmup)
+        if args.trials < 1:
+            raise ValueError("trials must be >= 1")
+        if (args.trials > 1 or args.warmup) and (duration or args.replay_trace):
+            raise ValueError("--trials and --warmup only apply to fixed --requests runs")
+        pids = [int(pid) for pid in args.pids.split(",") if pid.strip()]
+        base_seed = args.seed
+        if args.replay_trace:
+            header = read_trace_header(args.replay_trace)
+            if header["step"] != "register":
+                raise ValueError(f"trace step is {header['step']}, expected register")
+            base_seed = header["seed"]
+        elif args.record_trace and base_seed is None:
+            base_seed = random.getrandbits(32)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.speed <= 0:
+        print("Error: speed must be > 0", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.validate_rate <= 1:
+        print("Error: validate-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    recorder = TraceRecorder(
+        args.record_trace, "register", "register", base_seed) if args.record_trace else None
+
     try:
         # Run stress test
         tester = RegistrationStressTest(
             base_url=args.url,
             num_requests=args.requests,
-            concurrency=args.concurrency
+            concurrency=args.concurrency,
+            base_seed=base_seed,
+            recorder=recorder,
+            validator=ResponseValidator(args.validate_rate) if args.validate_rate > 0 else None,
+            timing=ServerTimingCollector() if args.server_timing else None
         )
-        report = tester.run()
+        if recorder:
+            recorder.start()
+        if args.replay_trace:
+            report = tester.replay(TraceReplayer(
+                args.replay_trace, speed=args.speed, concurrency=args.concurrency))
+        elif duration:
+            # Soak mode: fixed duration, constant-memory metrics, drift detection
+            tester.prepare(None)
+            report = SoakRunner(
+                send_request=tester.send_request,
+                duration=duration,
+                concurrency=args.concurrency,
+                window=window,
+                pids=pids
+            ).run()
+            if tester.validator:
+                report["validation"] = tester.validator.summary()
+        elif args.trials > 1 or args.warmup:
+            # Trials mode: excluded warm-up, interleaved trials, bootstrap confidence intervals
+            tester.prepare(None)
+            report = TrialRunner(
+                send_request=tester.send_request,
+                num_requests=args.requests,
+                concurrency=args.concurrency,
+                trials=args.trials,
+                warmup_seconds=warmup_seconds,
+                warmup_requests=warmup_requests,
+                on_warmup_done=tester.timing.reset if tester.timing else None
+            ).run()
+            if tester.validator:
+                report["validation"] = tester.validator.summary()
+        else:
+            report = tester.run()
+
+        # Soak, capacity and trials reports are built outside the tester
+        if tester.timing and "server_timing" not in report:
+            report["server_timing"] = tester.timing.summary()
+            tester.timing.print_summary()
 
         # Save report to file
-        report_file = f"stress_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report_prefix = "register_soak_report_" if duration else \
+            "register_trials_report_" if "trials" in report else "stress_test_report_"
+        report_file = f"{report_prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(report_file, 'w') as f:
             json.dump(report, f, indent=2)
         print(f"Report saved to: {report_file}\n")
@@ -261,6 +476,9 @@ Examples:
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if recorder:
+            recorder.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Local API server process control for the stress scripts
+Spawns the API (node dist/index.js by default) with environment overrides,
+timestamps every line it logs, and exposes readiness probes (TCP port open,
+first successful HTTP response) measured from the moment of the spawn, so
+benchmarks can restart the server per trial or per configuration.
+"""
+
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# tests/stress -> repository root
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DEFAULT_COMMAND = "node dist/index.js"
+
+
+class ServerExited(RuntimeError):
+    """The server process died before it became ready"""
+
+
+class ApiServer:
+    """One spawned API process"""
+
+    def __init__(
+        self,
+        url: str,
+        command: str = DEFAULT_COMMAND,
+        cwd: str = REPO_ROOT,
+        env: Optional[Dict[str, str]] = None,
+        log_path: Optional[str] = None,
+    ):
+        self.url = url.rstrip("/")
+        parsed = urlparse(self.url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 80
+        self.command = command
+        self.cwd = cwd
+        self.env = {"PORT": str(self.port), **(env or {})}
+        self.log_path = log_path
+        self.process: Optional[subprocess.Popen] = None
+        self.spawned_at = 0.0
+        self.lines: Deque[Tuple[float, str]] = deque(maxlen=5000)
+        self.line_counts: Dict[str, int] = {}
+        self.watch: List[str] = []
+        self.lock = threading.Lock()
+        self.reader: Optional[threading.Thread] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def start(self):
+        """Spawn the server; offsets of every probe are relative to this moment"""
+        if self.port_open():
+            raise RuntimeError(f"{self.host}:{self.port} is already in use, stop the running API first")
+        env = {**os.environ, **self.env}
+        self.spawned_at = time.time()
+        self.process = subprocess.Popen(
+            shlex.split(self.command),
+            cwd=self.cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.reader = threading.Thread(target=self.read_output, daemon=True)
+        self.reader.start()
+
+    def read_output(self):
+        """Timestamp server log lines (and keep counts of watched substrings)"""
+        log = open(self.log_path, "a") if self.log_path else None
+        try:
+            for raw in self.process.stdout:
+                line = raw.decode(errors="replace").rstrip("\n")
+                offset = time.time() - self.spawned_at
+                with self.lock:
+                    self.lines.append((offset, line))
+                    for pattern in self.watch:
+                        if pattern in line:
+                            self.line_counts[pattern] = self.line_counts.get(pattern, 0) + 1
+                if log:
+                    log.write(f"[{offset:9.3f}s] {line}\n")
+        finally:
+            if log:
+                log.close()
+
+    def count_lines(self, pattern: str) -> int:
+        """How many log lines contained a watched pattern"""
+        with self.lock:
+            return self.line_counts.get(pattern, 0)
+
+    def first_line(self, pattern: str) -> Optional[float]:
+        """Offset of the first retained log line containing pattern"""
+        with self.lock:
+            for offset, line in self.lines:
+                if pattern in line:
+                    return offset
+        return None
+
+    def log_tail(self, lines: int = 20) -> str:
+        """Last lines the server printed"""
+        with self.lock:
+            return "\n".join(line for _, line in list(self.lines)[-lines:])
+
+    def check_alive(self):
+        """Raise if the process has exited"""
+        if self.process and self.process.poll() is not None:
+            raise ServerExited(
+                f"server exited with code {self.process.returncode}:\n{self.log_tail()}")
+
+    def port_open(self) -> bool:
+        """Whether something accepts TCP connections on the API port"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+
+    def wait_for_port(self, timeout: float = 60.0, interval: float = 0.005) -> float:
+        """Seconds from spawn until the port accepts connections"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            self.check_alive()
+            if self.port_open():
+                return time.time() - self.spawned_at
+            time.sleep(interval)
+        raise TimeoutError(f"port {self.port} not open after {timeout:.0f}s")
+
+    def wait_until(self, probe: Callable[[], bool], timeout: float = 60.0, interval: float = 0.01) -> Tuple[float, int]:
+        """Seconds from spawn until probe() succeeds, and the number of attempts"""
+        deadline = time.time() + timeout
+        attempts = 0
+        while time.time() < deadline:
+            self.check_alive()
+            attempts += 1
+            try:
+                if probe():
+                    return time.time() - self.spawned_at, attempts
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(interval)
+        raise TimeoutError(f"server not ready after {timeout:.0f}s ({attempts} attempts)")
+
+    def wait_for_health(self, timeout: float = 60.0) -> Tuple[float, int]:
+        """Seconds from spawn until GET /health answers 200"""
+        return self.wait_until(
+            lambda: requests.get(f"{self.url}/health", timeout=2).status_code == 200, timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """SIGTERM the process group, SIGKILL if it does not exit"""
+        if not self.process or self.process.poll() is not None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+        # The port can linger briefly after exit
+        deadline = time.time() + timeout
+        while self.port_open() and time.time() < deadline:
+            time.sleep(0.05)
+
+    def __enter__(self) -> "ApiServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_env_overrides(values: List[str]) -> Dict[str, str]:
+    """KEY=VALUE pairs from repeated --env flags"""
+    env = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Invalid --env value (expected KEY=VALUE): {value}")
+        env[key] = val
+    return env
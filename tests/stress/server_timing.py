@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Server-Timing breakdown for the stress scripts
+With SERVER_TIMING=true the API adds a Server-Timing header to every response:
+argon2, jwt and one db-<verb> entry per kind of SQL statement (durations are
+summed per request, desc carries the count), plus total for the whole handler.
+ServerTimingCollector keeps a latency histogram per phase next to the
+client-observed latency, so end-to-end time can be split into hashing, token
+work, queries, the rest of the handler and what happened outside the server
+(network, harness queueing).
+"""
+
+import re
+import threading
+from typing import Dict
+
+import requests
+
+from soak import LatencyHistogram
+
+# name;dur=1.23;desc="2" (parameters in any order, desc optional)
+_ENTRY = re.compile(r"^\s*([^;,\s]+)((?:\s*;\s*[^;,]+)*)\s*$")
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Phase durations in seconds from a Server-Timing header (repeated names are summed)"""
+    phases: Dict[str, float] = {}
+    for entry in header.split(","):
+        match = _ENTRY.match(entry)
+        if not match:
+            continue
+        name, params = match.group(1), match.group(2)
+        duration = re.search(r";\s*dur\s*=\s*([0-9.]+)", params)
+        if duration:
+            phases[name] = phases.get(name, 0.0) + float(duration.group(1)) / 1000
+    return phases
+
+
+class ServerTimingCollector:
+    """Per-phase histograms from Server-Timing headers, alongside client latency"""
+
+    def __init__(self):
+        self.client = LatencyHistogram()
+        self.phases: Dict[str, LatencyHistogram] = {}
+        self.outside = LatencyHistogram()
+        self.untimed = 0
+        self.lock = threading.Lock()
+
+    def record(self, response: requests.Response, elapsed: float):
+        """Add one response; responses without the header only count as untimed"""
+        header = response.headers.get("Server-Timing")
+        phases = parse_server_timing(header) if header else {}
+        with self.lock:
+            self.client.record(elapsed)
+            if not phases:
+                self.untimed += 1
+                return
+            for name, seconds in phases.items():
+                self.phases.setdefault(name, LatencyHistogram()).record(seconds)
+            if "total" in phases:
+                named = sum(seconds for name, seconds in phases.items() if name != "total")
+                self.phases.setdefault("handler-other", LatencyHistogram()).record(
+                    max(0.0, phases["total"] - named))
+                self.outside.record(max(0.0, elapsed - phases["total"]))
+
+    def reset(self):
+        """Drop everything recorded so far (e.g. warm-up traffic)"""
+        with self.lock:
+            self.client = LatencyHistogram()
+            self.phases = {}
+            self.outside = LatencyHistogram()
+            self.untimed = 0
+
+    def timed_count(self) -> int:
+        return self.client.count - self.untimed
+
+    def summary(self) -> Dict:
+        """Report section"""
+
+        def row(histogram: LatencyHistogram) -> Dict:
+            return {
+                "count": histogram.count,
+                "mean": f"{histogram.mean():.4f}s",
+                "p50": f"{histogram.percentile(50):.4f}s",
+                "p99": f"{histogram.percentile(99):.4f}s",
+            }
+
+        with self.lock:
+            return {
+                "timed_responses": self.timed_count(),
+                "untimed_responses": self.untimed,
+                "client": row(self.client),
+                "phases": {name: row(h) for name, h in sorted(self.phases.items())},
+                "outside_server": row(self.outside),
+            }
+
+    def print_summary(self):
+        """Print the breakdown"""
+        print(f"\nServer-Timing Breakdown ({self.timed_count()} timed responses):")
+        if not self.timed_count():
+            print("  No Server-Timing headers received (start the API with SERVER_TIMING=true)")
+            return
+        print(f"  {'Phase':<16} {'Count':>7} {'Mean':>9} {'P50':>9} {'P99':>9}")
+        rows = [("client", self.client)] + sorted(self.phases.items()) + [("outside server", self.outside)]
+        for name, histogram in rows:
+            print(f"  {name:<16} {histogram.count:>7} {histogram.mean() * 1000:>7.2f}ms "
+                  f"{histogram.percentile(50) * 1000:>7.2f}ms {histogram.percentile(99) * 1000:>7.2f}ms")
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Slow-client and network-fault degradation sweep
+Real mobile clients upload bodies slowly and drop connections, which ties up
+Express sockets and express.json() body parsing in a way the loopback-fast
+harness never does. This scenario keeps a fixed number of healthy clients
+reading GET /v1/todo/list and adds faulty clients that POST /v1/todo/create
+with padded bodies through a local fault proxy (latency, bandwidth limit,
+partial writes, resets), stepping through the share of faulty clients.
+Healthy clients go through a fault-free proxy so every step pays the same
+proxy overhead, and the report shows how healthy throughput and tail latency
+degrade as the faulty share rises.
+With --proxy-only the fault proxy just runs in front of the API, so any other
+stress script can be pointed at it with --url.
+"""
+
+import requests
+import random
+import threading
+import time
+import uuid
+import json
+import argparse
+from typing import Dict, List, Optional
+from datetime import datetime
+import sys
+
+from fault_proxy import FaultProfile, FaultProxy, parse_size
+from payload_factory import JSON_HEADERS, PRIORITIES, encode_body, todo_renderer
+from soak import LatencyHistogram, parse_duration
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def generate(self, role: str) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"slowclients-{role}-{unique_id}@stress-test.com",
+            "password": f"SlowClientsPass123_{unique_id}",
+            "name": f"Test User {role}"
+        }
+
+
+class SetupPhase:
+    """Setup phase: a reader with todos for healthy clients, a writer for faulty clients"""
+
+    def __init__(self, base_url: str, todos: int):
+        self.base_url = base_url
+        self.todos = todos
+        self.user_generator = UserGenerator()
+
+    def login(self, role: str) -> Optional[Dict[str, str]]:
+        """Register and login one user, returning its request headers"""
+        user = self.user_generator.generate(role)
+        response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+        if response.status_code not in [200, 201]:
+            return None
+        response = requests.post(
+            f"{self.base_url}/v1/auth/login",
+            json={"email": user["email"], "password": user["password"]},
+            timeout=10
+        )
+        if response.status_code not in [200, 201]:
+            return None
+        return {"Authorization": f"Bearer {response.json()['data']['accessToken']}", **JSON_HEADERS}
+
+    def run(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Create both accounts and the reader's todos"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Reader And Writer Accounts")
+        print(f"{'='*70}")
+        print(f"Reader todos:  {self.todos}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        reader, writer = self.login("reader"), self.login("writer")
+        if not reader or not writer:
+            return None
+        render_todo = todo_renderer("Slow clients todo")
+        for i in range(self.todos):
+            response = requests.post(
+                f"{self.base_url}/v1/todo/create",
+                data=render_todo(i)[0],
+                headers=reader,
+                timeout=10
+            )
+            # An empty list would make the healthy read path trivially cheap
+            if response.status_code not in [200, 201]:
+                print(f"Todo create failed: {response.status_code} {response.text[:200]}", file=sys.stderr)
+                return None
+        print(f"Setup completed in {time.time() - start_time:.2f}s")
+        return {"reader": reader, "writer": writer}
+
+
+class ClassResult:
+    """Outcome of one client class during one step"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.connection_errors = 0
+        self.error_codes: Dict[str, int] = {}
+
+    def to_dict(self, elapsed: float, clients: int) -> Dict:
+        """Report row"""
+        return {
+            "clients": clients,
+            "requests": self.requests,
+            "errors": self.errors,
+            "connection_errors": self.connection_errors,
+            "requests_per_second": round(self.requests / elapsed, 2) if elapsed else 0,
+            "successful_per_second": round(self.histogram.count / elapsed, 2) if elapsed else 0,
+            "p50": f"{self.histogram.percentile(50):.4f}s",
+            "p99": f"{self.histogram.percentile(99):.4f}s",
+            "error_codes": self.error_codes,
+        }
+
+
+class SlowClientSweep:
+    """Healthy-client throughput as the share of faulty clients rises"""
+
+    def __init__(self, base_url: str, headers: Dict[str, Dict[str, str]], healthy_clients: int,
+                 fractions: List[float], step_duration: float, profile: FaultProfile, body_size: int,
+                 timeout: float, cooldown: float, seed: Optional[int]):
+        self.base_url = base_url
+        self.headers = headers
+        self.healthy_clients = healthy_clients
+        self.fractions = fractions
+        self.step_duration = step_duration
+        self.profile = profile
+        self.body_size = body_size
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.seed = seed
+        self.steps: List[Dict] = []
+
+    def faulty_clients(self, fraction: float) -> int:
+        """Faulty clients so they make up `fraction` of all clients"""
+        return round(self.healthy_clients * fraction / (1 - fraction))
+
+    def create_body(self, rng: random.Random) -> bytes:
+        """Todo create body padded to --body-size; the schema drops the unknown field after parsing"""
+        body = {"name": f"Slow client todo {rng.getrandbits(32):08x}", "priority": rng.choice(PRIORITIES),
+                "padding": ""}
+        body["padding"] = "x" * max(0, self.body_size - len(encode_body(body)))
+        return encode_body(body)
+
+    def client(self, healthy: bool, url: str, result: ClassResult, lock: threading.Lock,
+               deadline: float, rng: random.Random):
+        """Closed-loop client; a broken connection is replaced by a new one"""
+        session = requests.Session()
+        while time.time() < deadline:
+            try:
+                start = time.time()
+                if healthy:
+                    response = session.get(
+                        f"{url}/v1/todo/list",
+                        params={"page": 1, "limit": 10},
+                        headers=self.headers["reader"],
+                        timeout=self.timeout
+                    )
+                else:
+                    response = session.post(
+                        f"{url}/v1/todo/create",
+                        data=self.create_body(rng),
+                        headers=self.headers["writer"],
+                        timeout=self.timeout
+                    )
+                elapsed = time.time() - start
+                with lock:
+                    result.requests += 1
+                    if response.status_code in [200, 201]:
+                        result.histogram.record(elapsed)
+                    else:
+                        result.errors += 1
+                        status_key = str(response.status_code)
+                        result.error_codes[status_key] = result.error_codes.get(status_key, 0) + 1
+            except requests.exceptions.RequestException as e:
+                with lock:
+                    result.requests += 1
+                    result.errors += 1
+                    if isinstance(e, requests.exceptions.ConnectionError):
+                        result.connection_errors += 1
+                    status_key = "Timeout" if isinstance(e, requests.exceptions.Timeout) else "Connection Error"
+                    result.error_codes[status_key] = result.error_codes.get(status_key, 0) + 1
+                session.close()
+                session = requests.Session()
+        session.close()
+
+    def run_step(self, step: int, fraction: float, healthy_proxy: FaultProxy, faulty_proxy: FaultProxy) -> Dict:
+        """Run healthy and faulty clients side by side for one step"""
+        faulty = self.faulty_clients(fraction)
+        healthy_result, faulty_result = ClassResult(), ClassResult()
+        lock = threading.Lock()
+        resets_before = faulty_proxy.stats["resets"]
+        deadline = time.time() + self.step_duration
+        base_seed = self.seed if self.seed is not None else random.getrandbits(32)
+
+        threads = [
+            threading.Thread(target=self.client, args=(
+                True, healthy_proxy.url, healthy_result, lock, deadline, random.Random(base_seed + i)), daemon=True)
+            for i in range(self.healthy_clients)
+        ] + [
+            threading.Thread(target=self.client, args=(
+                False, faulty_proxy.url, faulty_result, lock, deadline,
+                random.Random(base_seed + self.healthy_clients + i)), daemon=True)
+            for i in range(faulty)
+        ]
+        start_time = time.time()
+        for thread in threads:
+            thread.start()
+        # Healthy throughput is measured over the step itself, not the faulty stragglers
+        for thread in threads[:self.healthy_clients]:
+            thread.join()
+        healthy_elapsed = time.time() - start_time
+        for thread in threads[self.healthy_clients:]:
+            thread.join()
+        elapsed = time.time() - start_time
+
+        row = {
+            "step": step + 1,
+            "faulty_fraction": fraction,
+            "healthy": healthy_result.to_dict(healthy_elapsed, self.healthy_clients),
+            "faulty": faulty_result.to_dict(elapsed, faulty),
+            "proxy_resets": faulty_proxy.stats["resets"] - resets_before,
+        }
+        print(
+            f"  faulty {fraction * 100:>5.1f}% ({faulty:>4} clients)  "
+            f"healthy {row['healthy']['successful_per_second']:>8.1f}/s  "
+            f"p50 {healthy_result.histogram.percentile(50) * 1000:>7.1f}ms  "
+            f"p99 {healthy_result.histogram.percentile(99) * 1000:>7.1f}ms  "
+            f"err {healthy_result.errors:>5}  "
+            f"faulty done {faulty_result.histogram.count:>5}  resets {row['proxy_resets']:>4}", flush=True)
+        time.sleep(self.cooldown)
+        return row
+
+    def run(self) -> Dict:
+        """Sweep the faulty share"""
+        print(f"\n{'='*70}")
+        print(f"Slow-Client Degradation Sweep")
+        print(f"{'='*70}")
+        print(f"API:           {self.base_url}")
+        print(f"Healthy:       {self.healthy_clients} clients, GET /v1/todo/list")
+        print(f"Faulty:        POST /v1/todo/create, {self.body_size} byte bodies")
+        print(f"Faults:        {self.profile.describe()}")
+        print(f"Fractions:     {', '.join(f'{f:g}' for f in self.fractions)}")
+        print(f"Step:          {self.step_duration:g}s")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        healthy_proxy = FaultProxy(self.base_url).start()
+        faulty_proxy = FaultProxy(self.base_url, self.profile, seed=self.seed).start()
+        try:
+            for step, fraction in enumerate(self.fractions):
+                self.steps.append(self.run_step(step, fraction, healthy_proxy, faulty_proxy))
+        finally:
+            healthy_proxy.stop()
+            faulty_proxy.stop()
+
+        return self.generate_report(time.time() - start_time, faulty_proxy)
+
+    def generate_report(self, total_time: float, faulty_proxy: FaultProxy) -> Dict:
+        """Degradation relative to the first step"""
+        baseline = self.steps[0]["healthy"]["successful_per_second"] if self.steps else 0
+        for row in self.steps:
+            rate = row["healthy"]["successful_per_second"]
+            row["healthy_throughput_vs_first"] = f"{rate / baseline * 100:.1f}%" if baseline else None
+
+        stats = {
+            "summary": {
+                "healthy_clients": self.healthy_clients,
+                "faults": self.profile.describe(),
+                "body_size": self.body_size,
+                "steps": len(self.steps),
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "steps": self.steps,
+            "faulty_proxy": faulty_proxy.summary(),
+        }
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Healthy-Client Degradation")
+        print(f"{'='*70}")
+        print(f"{'Faulty':>7} {'Clients':>8} {'Healthy/s':>10} {'vs first':>9} {'P50':>9} {'P99':>9} {'Faulty ok':>10}")
+        for row in self.steps:
+            healthy = row["healthy"]
+            print(f"{row['faulty_fraction'] * 100:>6.1f}% {row['faulty']['clients']:>8} "
+                  f"{healthy['successful_per_second']:>10.1f} {row['healthy_throughput_vs_first'] or '-':>9} "
+                  f"{float(healthy['p50'][:-1]) * 1000:>7.1f}ms {float(healthy['p99'][:-1]) * 1000:>7.1f}ms "
+                  f"{row['faulty']['successful_per_second']:>8.1f}/s")
+        proxy = stats["faulty_proxy"]
+        print(f"\nFault proxy: {proxy['connections']} connections, {proxy['resets']} resets, "
+              f"peak {proxy['peak_active']} open")
+        print(f"Total Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def run_proxy_only(base_url: str, profile: FaultProfile, listen_port: int, seed: Optional[int]):
+    """Serve the fault proxy in front of the API until interrupted"""
+    proxy = FaultProxy(base_url, profile, listen_port=listen_port, seed=seed).start()
+    print(f"Fault proxy {proxy.url} -> {base_url} ({profile.describe()})")
+    print(f"Point any stress script at it with --url {proxy.url}, Ctrl-C to stop\n")
+    try:
+        while True:
+            time.sleep(10)
+            stats = proxy.stats
+            print(f"  {stats['connections']} connections, {stats['active']} open, {stats['resets']} resets, "
+                  f"{stats['bytes_up'] / 1024:.0f} KiB up, {stats['bytes_down'] / 1024:.0f} KiB down", flush=True)
+    finally:
+        proxy.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Healthy-client throughput under a rising share of slow and faulty clients (local fault proxy)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python slow-clients.py --fractions 0,0.25,0.5,0.75 --bandwidth 4KB --latency 150ms
+  python slow-clients.py -c 20 --body-size 64KB --chunk-size 512 --reset-rate 0.2
+  python slow-clients.py --proxy-only --listen 3100 --bandwidth 8KB --reset-rate 0.05
+        """
+    )
+
+    parser.add_argument(
+        "-c", "--clients",
+        type=int,
+        default=10,
+        help="Healthy clients, faulty clients are added on top of them (default: 10)"
+    )
+    parser.add_argument(
+        "--fractions",
+        type=str,
+        default="0,0.25,0.5,0.75",
+        help="Comma-separated shares of faulty clients among all clients, each < 1 (default: 0,0.25,0.5,0.75)"
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=str,
+        default="20s",
+        help="Duration of each step (default: 20s)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=str,
+        default="100ms",
+        help="Faulty clients: one-way latency added to every chunk (default: 100ms)"
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=str,
+        default="16KB",
+        help="Faulty clients: bytes/second per connection and direction, 0 = unlimited (default: 16KB)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=str,
+        default="256",
+        help="Faulty clients: forward writes in pieces of this size, 0 = as read (default: 256)"
+    )
+    parser.add_argument(
+        "--reset-rate",
+        type=float,
+        default=0.1,
+        help="Faulty clients: share of connections reset part-way through their first request (default: 0.1)"
+    )
+    parser.add_argument(
+        "--body-size",
+        type=str,
+        default="16KB",
+        help="Faulty clients: size of each padded todo create body (default: 16KB)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Client request timeout in seconds (default: 60)"
+    )
+    parser.add_argument(
+        "--todos",
+        type=int,
+        default=10,
+        help="Todos created for the healthy clients' reader (default: 10)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for resets, cut points and bodies (default: random)"
+    )
+    parser.add_argument(
+        "--proxy-only",
+        action="store_true",
+        help="Only run the fault proxy on --listen in front of --url, for use with other scripts"
+    )
+    parser.add_argument(
+        "--listen",
+        type=int,
+        default=3100,
+        help="Proxy-only mode listen port (default: 3100)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        fractions = [float(part) for part in args.fractions.split(",") if part.strip()]
+        if not fractions or any(not 0 <= f < 1 for f in fractions):
+            raise ValueError(f"fractions must be >= 0 and < 1: {args.fractions}")
+        step_duration = parse_duration(args.step_duration)
+        if step_duration <= 0:
+            raise ValueError("step-duration must be > 0")
+        bandwidth = parse_size(args.bandwidth)
+        profile = FaultProfile(
+            latency=parse_duration(args.latency),
+            bandwidth=bandwidth or None,
+            chunk_size=parse_size(args.chunk_size),
+            reset_rate=args.reset_rate
+        )
+        body_size = parse_size(args.body_size)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.clients < 1:
+        print("Error: clients must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.reset_rate <= 1:
+        print("Error: reset-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+    if args.timeout <= 0:
+        print("Error: timeout must be > 0", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.proxy_only:
+            run_proxy_only(args.url, profile, args.listen, args.seed)
+            return
+
+        headers = SetupPhase(args.url, args.todos).run()
+        if not headers:
+            print("Error: Setup failed. Cannot proceed with slow-client sweep.", file=sys.stderr)
+            sys.exit(1)
+
+        report = SlowClientSweep(
+            base_url=args.url,
+            headers=headers,
+            healthy_clients=args.clients,
+            fractions=fractions,
+            step_duration=step_duration,
+            profile=profile,
+            body_size=body_size,
+            timeout=args.timeout,
+            cooldown=1.0,
+            seed=args.seed
+        ).run()
+
+        # Save report to file
+        report_file = f"slow_clients_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
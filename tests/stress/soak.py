@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Soak/endurance mode shared by the stress scripts
+Runs a scenario's send_request for a fixed duration with constant-memory
+metrics (log-bucketed histograms per time window), then fits trend lines to
+latency, error rate and server RSS and flags statistically significant drift
+"""
+
+import math
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def parse_duration(value: str) -> float:
+    """Parse durations like 4h, 30m, 90s, 250ms or plain seconds"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(ms|[hms]?)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    amount, unit = float(match.group(1)), match.group(2)
+    return amount * {"h": 3600, "m": 60, "s": 1, "ms": 0.001, "": 1}[unit]
+
+
+def format_offset(seconds: float) -> str:
+    """Format an offset in seconds as HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    """Resident set size of a local process in kB, None if unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with constant memory (~5% bucket width)"""
+
+    MIN_SECONDS = 0.0001
+    GROWTH = 1.05
+    BUCKETS = 280  # covers 0.1ms .. ~85s
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def bucket(self, seconds: float) -> int:
+        """Bucket index for a latency"""
+        if seconds <= self.MIN_SECONDS:
+            return 0
+        index = int(math.log(seconds / self.MIN_SECONDS, self.GROWTH)) + 1
+        return min(index, self.BUCKETS - 1)
+
+    def record(self, seconds: float):
+        """Add one observation"""
+        self.counts[self.bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Fold another histogram into this one"""
+        for i, value in enumerate(other.counts):
+            self.counts[i] += value
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        """Mean latency"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile (upper bound of the bucket holding the rank)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for i, value in enumerate(self.counts):
+            seen += value
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.GROWTH ** i, self.max)
+        return self.max
+
+
+class SoakWindow:
+    """Metrics for one time window of the soak run"""
+
+    def __init__(self, start: float, length: float):
+        self.start = start
+        self.length = length
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.rss: Dict[int, int] = {}
+
+    def merge(self, other: "SoakWindow"):
+        """Fold the following window into this one"""
+        self.histogram.merge(other.histogram)
+        self.requests += other.requests
+        self.errors += other.errors
+        self.length += other.length
+        for pid, rss in other.rss.items():
+            self.rss[pid] = max(self.rss.get(pid, 0), rss)
+
+    def error_rate(self) -> float:
+        """Fraction of failed requests in the window"""
+        return self.errors / self.requests if self.requests else 0.0
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta function"""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > 1e-30 else 1e-30)
+    h = d
+    for m in range(1, 200):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > 1e-30 else 1e-30)
+        c = 1.0 + aa / c
+        c = c if abs(c) > 1e-30 else 1e-30
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > 1e-30 else 1e-30)
+        c = 1.0 + aa / c
+        c = c if abs(c) > 1e-30 else 1e-30
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 3e-12:
+            break
+    return h
+
+
+def student_t_sf(t: float, df: int) -> float:
+    """One-sided upper tail probability P(T > t) of Student's t distribution"""
+    x = df / (df + t * t)
+    log_front = (math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - math.lgamma(0.5)
+                 + (df / 2) * math.log(x) + 0.5 * math.log1p(-x)) if 0 < x < 1 else None
+    if log_front is None:
+        return 0.5 if t == 0 else (0.0 if t > 0 else 1.0)
+    a, b = df / 2, 0.5
+    if x < (a + 1) / (a + b + 2):
+        ibeta = math.exp(log_front) * _betacf(a, b, x) / a
+    else:
+        ibeta = 1.0 - math.exp(log_front) * _betacf(b, a, 1 - x) / b
+    tail = 0.5 * ibeta
+    return tail if t > 0 else 1.0 - tail
+
+
+def linear_trend(xs: List[float], ys: List[float]) -> Optional[Dict[str, float]]:
+    """Least-squares trend with a one-sided test for a positive slope"""
+    n = len(xs)
+    if n < 3:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, ys))
+    stderr = math.sqrt(residual / (n - 2) / sxx)
+    if stderr == 0:
+        p_value = 0.0 if slope > 0 else 1.0
+    else:
+        p_value = student_t_sf(slope / stderr, n - 2)
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "start": intercept + slope * xs[0],
+        "end": intercept + slope * xs[-1],
+        "p_value": p_value,
+        "windows": n,
+    }
+
+
+class SoakRunner:
+    """Run a scenario's send_request for a fixed duration and detect drift"""
+
+    def __init__(
+        self,
+        send_request: Callable[[int], Tuple],
+        duration: float,
+        concurrency: int,
+        window: float = 60.0,
+        pids: Optional[List[int]] = None,
+        alpha: float = 0.01,
+        min_growth: float = 0.10,
+        max_windows: int = 720,
+        is_success: Optional[Callable[[Tuple], bool]] = None,
+    ):
+        self.send_request = send_request
+        self.duration = duration
+        self.concurrency = concurrency
+        self.window = window
+        self.pids = pids or []
+        self.alpha = alpha
+        self.min_growth = min_growth
+        self.max_windows = max_windows
+        self.is_success = is_success or (lambda result: result[2] in [200, 201])
+        self.windows: List[SoakWindow] = []
+        self.overall = LatencyHistogram()
+        self.error_codes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.start_time = 0.0
+        self.deadline = 0.0
+        self.printed = 0
+        self.interrupted = False
+
+    def claim_index(self) -> int:
+        """Hand out request indexes to workers"""
+        with self.lock:
+            index = self.next_index
+            self.next_index += 1
+            return index
+
+    def window_for(self, offset: float) -> SoakWindow:
+        """Window holding a request started at offset seconds (caller holds the lock)"""
+        while not self.windows or offset >= self.windows[-1].start + self.windows[-1].length:
+            last = self.windows[-1] if self.windows else None
+            start = last.start + last.length if last else 0.0
+            self.windows.append(SoakWindow(start, self.window))
+            if len(self.windows) > self.max_windows:
+                self.compact()
+        for window in reversed(self.windows):
+            if offset >= window.start:
+                return window
+        return self.windows[0]
+
+    def compact(self):
+        """Merge adjacent windows pairwise so memory stays bounded"""
+        merged = []
+        for i in range(0, len(self.windows), 2):
+            window = self.windows[i]
+            if i + 1 < len(self.windows):
+                window.merge(self.windows[i + 1])
+            merged.append(window)
+        self.windows = merged
+        self.window *= 2
+        # Progress counts completed windows, which just halved
+        self.printed = len(self.windows) - 1
+
+    def worker(self):
+        """Send requests back to back until the deadline"""
+        while time.time() < self.deadline:
+            index = self.claim_index()
+            started = time.time() - self.start_time
+            result = self.send_request(index)
+            success = self.is_success(result)
+
+            with self.lock:
+                window = self.window_for(started)
+                window.requests += 1
+                if success:
+                    window.histogram.record(result[1])
+                    self.overall.record(result[1])
+                else:
+                    window.errors += 1
+                    status_key = str(result[2])
+                    self.error_codes[status_key] = self.error_codes.get(status_key, 0) + 1
+
+    def sample_rss(self):
+        """Record server RSS into the current window"""
+        offset = time.time() - self.start_time
+        for pid in self.pids:
+            rss = read_rss_kb(pid)
+            if rss is None:
+                continue
+            with self.lock:
+                window = self.window_for(offset)
+                window.rss[pid] = max(window.rss.get(pid, 0), rss)
+
+    def print_progress(self):
+        """Print the last completed window"""
+        with self.lock:
+            if len(self.windows) < 2:
+                return
+            window = self.windows[-2]
+            rss = ", ".join(f"{pid}={kb // 1024}MB" for pid, kb in window.rss.items())
+            print(
+                f"[{format_offset(window.start + window.length)}] "
+                f"req={window.requests} rps={window.requests / window.length:.1f} "
+                f"p50={window.histogram.percentile(50) * 1000:.1f}ms "
+                f"p99={window.histogram.percentile(99) * 1000:.1f}ms "
+                f"err={window.error_rate() * 100:.2f}%"
+                + (f" rss: {rss}" if rss else ""), flush=True)
+
+    def run(self) -> Dict:
+        """Execute the soak run"""
+        print(f"\n{'='*70}")
+        print(f"Soak Mode")
+        print(f"{'='*70}")
+        print(f"Duration:      {format_offset(self.duration)}")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Window:        {self.window:.0f}s")
+        print(f"Server PIDs:   {', '.join(str(p) for p in self.pids) or '-'}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        self.start_time = time.time()
+        self.deadline = self.start_time + self.duration
+        threads = [threading.Thread(target=self.worker, daemon=True)
+                   for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(min(1.0, self.window / 4))
+                self.sample_rss()
+                with self.lock:
+                    completed = len(self.windows) - 1
+                    due = completed > self.printed
+                    if due:
+                        self.printed = completed
+                if due:
+                    self.print_progress()
+        except KeyboardInterrupt:
+            # Keep the windows collected so far: stop the workers and still report
+            print("\n\nSoak interrupted, finishing in-flight requests...", file=sys.stderr)
+            self.interrupted = True
+            self.deadline = 0.0
+
+        for thread in threads:
+            thread.join(timeout=15)
+
+        return self.generate_report(time.time() - self.start_time)
+
+    def detect_drift(self, name: str, xs: List[float], ys: List[float], absolute: float = 0.0) -> Dict:
+        """Fit a trend and decide whether it is a significant upward drift"""
+        trend = linear_trend(xs, ys)
+        if trend is None:
+            return {"metric": name, "drift": False, "reason": "not enough windows"}
+
+        growth = trend["end"] - trend["start"]
+        relative = growth / trend["start"] if trend["start"] > 0 else math.inf if growth > 0 else 0.0
+        significant = trend["slope"] > 0 and trend["p_value"] < self.alpha
+        large_enough = relative >= self.min_growth and growth > absolute
+
+        return {
+            "metric": name,
+            "drift": significant and large_enough,
+            "slope_per_hour": trend["slope"] * 3600,
+            "start": trend["start"],
+            "end": trend["end"],
+            "relative_growth": f"{relative * 100:.1f}%" if math.isfinite(relative) else "inf",
+            "p_value": trend["p_value"],
+            "windows": trend["windows"],
+        }
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Summarize the run and the drift analysis"""
+        # The last window is usually partial and would bias the trend
+        windows = [w for w in self.windows if w.requests > 0]
+        if len(windows) > 1 and windows[-1].length * 0.5 > total_time - windows[-1].start:
+            windows = windows[:-1]
+
+        mids = [w.start + w.length / 2 for w in windows]
+        drift = [
+            self.detect_drift("latency_p50", mids, [w.histogram.percentile(50) for w in windows]),
+            self.detect_drift("latency_p99", mids, [w.histogram.percentile(99) for w in windows]),
+            self.detect_drift("error_rate", mids, [w.error_rate() for w in windows], absolute=0.001),
+        ]
+        for pid in self.pids:
+            points = [(m, w.rss[pid]) for m, w in zip(mids, windows) if pid in w.rss]
+            drift.append(self.detect_drift(
+                f"rss_kb_{pid}", [p[0] for p in points], [p[1] for p in points]))
+
+        total_requests = sum(w.requests for w in self.windows)
+        total_errors = sum(w.errors for w in self.windows)
+
+        stats = {
+            "summary": {
+                "total_requests": total_requests,
+                "successful": total_requests - total_errors,
+                "failed": total_errors,
+                "success_rate": f"{((total_requests - total_errors) / total_requests * 100) if total_requests else 0:.2f}%",
+                "total_duration": f"{total_time:.2f}s",
+                "requests_per_second": f"{total_requests / total_time:.2f}",
+            },
+            "response_times": {
+                "mean": f"{self.overall.mean():.3f}s",
+                "median": f"{self.overall.percentile(50):.3f}s",
+                "p99": f"{self.overall.percentile(99):.3f}s",
+                "max": f"{self.overall.max:.3f}s",
+            },
+            "errors": self.error_codes,
+            "windows": [
+                {
+                    "start": format_offset(w.start),
+                    "requests": w.requests,
+                    "errors": w.errors,
+                    "p50": f"{w.histogram.percentile(50):.4f}s",
+                    "p99": f"{w.histogram.percentile(99):.4f}s",
+                    "rss_kb": {str(pid): rss for pid, rss in w.rss.items()},
+                }
+                for w in self.windows
+            ],
+            "drift": drift,
+        }
+        if self.interrupted:
+            stats["summary"]["interrupted"] = True
+
+        # Print report
+        print(f"\n{'='*70}")
+        print(f"Soak Results Summary")
+        print(f"{'='*70}")
+        if self.interrupted:
+            print(f"Interrupted:        yes, partial run")
+        print(f"Total Requests:     {stats['summary']['total_requests']}")
+        print(f"Failed:             {stats['summary']['failed']}")
+        print(f"Success Rate:       {stats['summary']['success_rate']}")
+        print(f"Total Duration:     {stats['summary']['total_duration']}")
+        print(f"Requests/Second:    {stats['summary']['requests_per_second']}")
+        print(f"Median / P99:       {stats['response_times']['median']} / {stats['response_times']['p99']}")
+
+        print(f"\nDrift Analysis (alpha={self.alpha}, min growth={self.min_growth * 100:.0f}%):")
+        for result in drift:
+            if "p_value" not in result:
+                print(f"  {result['metric']:<16} {result['reason']}")
+                continue
+            flag = "DRIFT ✗" if result["drift"] else "stable ✓"
+            print(
+                f"  {result['metric']:<16} {flag:<9} growth {result['relative_growth']:>7}  "
+                f"p={result['p_value']:.4f}  ({result['windows']} windows)")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Stress test for the todo list endpoint
+Tests concurrent GET /v1/todo/list requests with metrics collection
+Setup registers and logs in test users and seeds their todos, then pages
+through each user's list with the user's access token
+"""
+
+import requests
+import time
+import uuid
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from statistics import mean, stdev, median
+from typing import Dict, Tuple, List, Optional
+from datetime import datetime
+import sys
+
+from capacity_search import CapacitySearch, parse_slo
+from payload_factory import JSON_HEADERS, todo_renderer
+from profiler import build_profiler
+from server_timing import ServerTimingCollector
+from soak import parse_duration
+from trials import TrialRunner, parse_warmup
+from validation import ResponseValidator
+
+
+class UserGenerator:
+    """Generate unique user credentials for testing"""
+
+    def generate(self, index: int) -> Dict[str, str]:
+        """Generate unique user data"""
+        unique_id = str(uuid.uuid4())[:8]
+        return {
+            "email": f"todolist-{index}-{unique_id}@stress-test.com",
+            "password": f"TodoListPass123_{unique_id}",
+            "name": f"Test User {index}"
+        }
+
+
+class SetupPhase:
+    """Setup phase: register, login and seed todos for each test user"""
+
+    def __init__(self, base_url: str, num_users: int, todos_per_user: int, concurrency: int):
+        self.base_url = base_url
+        self.num_users = num_users
+        self.todos_per_user = todos_per_user
+        self.concurrency = concurrency
+        self.user_generator = UserGenerator()
+        self.render_todo = todo_renderer("List todo")
+        self.users: List[Dict[str, str]] = []
+        self.errors = 0
+        self.todo_errors = 0
+        self.lock = threading.Lock()
+
+    def send_request(self, index: int) -> Tuple[int, Optional[Dict[str, str]]]:
+        """Register, login and create the todos of one user"""
+        user = self.user_generator.generate(index)
+
+        try:
+            response = requests.post(f"{self.base_url}/v1/auth/register", json=user, timeout=10)
+            if response.status_code not in [200, 201]:
+                return (index, None)
+
+            response = requests.post(
+                f"{self.base_url}/v1/auth/login",
+                json={"email": user["email"], "password": user["password"]},
+                timeout=10
+            )
+            if response.status_code not in [200, 201]:
+                return (index, None)
+            data = response.json()["data"]
+            session = {"access_token": data["accessToken"], "user_id": data["user"]["id"]}
+
+            headers = {"Authorization": f"Bearer {session['access_token']}", **JSON_HEADERS}
+            for i in range(self.todos_per_user):
+                response = requests.post(
+                    f"{self.base_url}/v1/todo/create",
+                    data=self.render_todo(index * self.todos_per_user + i)[0],
+                    headers=headers,
+                    timeout=10
+                )
+                # Missing todos would shrink the measured pages
+                if response.status_code not in [200, 201]:
+                    with self.lock:
+                        self.todo_errors += 1
+                    return (index, None)
+
+            return (index, session)
+        except Exception:
+            return (index, None)
+
+    def run(self) -> List[Dict[str, str]]:
+        """Create all test users"""
+        print(f"\n{'='*70}")
+        print(f"Setup Phase: Users With Todos")
+        print(f"{'='*70}")
+        print(f"Users to create: {self.num_users}")
+        print(f"Todos per user:  {self.todos_per_user}")
+        print(f"Concurrency:     {self.concurrency}")
+        print(f"{'='*70}\n")
+
+        completed = 0
+        start_time = time.time()
+        sessions_by_index: Dict[int, Dict[str, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self.send_request, i): i
+                for i in range(self.num_users)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    index, session = future.result()
+                    completed += 1
+
+                    if session:
+                        sessions_by_index[index] = session
+                    else:
+                        self.errors += 1
+
+                    progress = (completed / self.num_users) * 100
+                    bar_length = 40
+                    filled = int(bar_length * completed // self.num_users)
+                    bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                    print(
+                        f"\r{bar} {progress:.1f}% ({completed}/{self.num_users})", end="", flush=True)
+                except Exception as e:
+                    print(f"\nError: {e}")
+
+        self.users = [sessions_by_index[i] for i in sorted(sessions_by_index)]
+
+        elapsed = time.time() - start_time
+        print(f"\n\nSetup completed in {elapsed:.2f}s")
+        print(f"Users ready: {len(self.users)}/{self.num_users}")
+        if self.errors > 0:
+            print(f"Errors: {self.errors}")
+        if self.todo_errors > 0:
+            print(f"Todo create failures: {self.todo_errors}")
+
+        return self.users
+
+
+class TodoListStressTest:
+    """Todo list stress testing phase"""
+
+    def __init__(self, base_url: str, num_requests: int, concurrency: int, users: List[Dict[str, str]],
+                 page_size: int, validator: Optional[ResponseValidator] = None,
+                 timing: Optional[ServerTimingCollector] = None):
+        self.base_url = base_url
+        self.endpoint = f"{base_url}/v1/todo/list"
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.users = users
+        self.page_size = page_size
+        self.validator = validator
+        self.timing = timing
+        # Auth headers are built once, workers only pick one
+        self.headers = [{"Authorization": f"Bearer {user['access_token']}"} for user in users]
+        self.results = {
+            "success": [],
+            "failed": [],
+            "error_codes": {},
+        }
+        self.start_time = None
+        self.end_time = None
+
+    def send_request(self, index: int) -> Tuple[int, float, int, str]:
+        """Send a single todo list request"""
+        if not self.users:
+            return (index, 0.0, -1, "No users available")
+
+        # Cycle through users
+        user = index % len(self.users)
+
+        try:
+            start = time.time()
+            response = requests.get(
+                self.endpoint,
+                params={"page": 1, "limit": self.page_size},
+                headers=self.headers[user],
+                timeout=10
+            )
+            elapsed = time.time() - start
+            status_code = self.validator.status(
+                "todo_list", response, user_id=self.users[user]["user_id"]) if self.validator else response.status_code
+            if self.timing:
+                self.timing.record(response, elapsed)
+
+            return (index, elapsed, status_code, response.text)
+        except requests.exceptions.Timeout:
+            return (index, 10.0, -1, "Timeout")
+        except requests.exceptions.ConnectionError:
+            return (index, 0.0, -1, "Connection Error")
+        except Exception as e:
+            return (index, 0.0, -1, str(e))
+
+    def process_response(self, index: int, elapsed: float, status_code: int, response_text: str):
+        """Process response and collect metrics"""
+        is_success = status_code in [200, 201]
+
+        result = {
+            "index": index,
+            "status_code": status_code,
+            "response_time": elapsed,
+            "success": is_success,
+        }
+
+        if is_success:
+            self.results["success"].append(result)
+        else:
+            self.results["failed"].append(result)
+
+            # Track error codes
+            status_key = str(status_code)
+            if status_key not in self.results["error_codes"]:
+                self.results["error_codes"][status_key] = 0
+            self.results["error_codes"][status_key] += 1
+
+    def run(self) -> Dict:
+        """Execute the todo list stress test"""
+        print(f"\n{'='*70}")
+        print(f"Todo List Endpoint Stress Test")
+        print(f"{'='*70}")
+        print(f"Endpoint:      {self.endpoint}")
+        print(f"Total Requests: {self.num_requests}")
+        print(f"Concurrency:   {self.concurrency}")
+        print(f"Test Users:    {len(self.users)}")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        self.start_time = time.time()
+        completed = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self.send_request, i): i
+                for i in range(self.num_requests)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    index, elapsed, status_code, response_text = future.result()
+                    self.process_response(
+                        index, elapsed, status_code, response_text)
+                    completed += 1
+
+                    progress = (completed / self.num_requests) * 100
+                    bar_length = 40
+                    filled = int(bar_length * completed // self.num_requests)
+                    bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+                    print(
+                        f"\r{bar} {progress:.1f}% ({completed}/{self.num_requests})", end="", flush=True)
+                except Exception as e:
+                    print(f"\nError processing response: {e}")
+
+        self.end_time = time.time()
+        print("\n")
+
+        return self.generate_report()
+
+    def generate_report(self) -> Dict:
+        """Generate test report with statistics"""
+        total_time = self.end_time - self.start_time
+        total_requests = len(
+            self.results["success"]) + len(self.results["failed"])
+        success_count = len(self.results["success"])
+        failed_count = len(self.results["failed"])
+
+        # Calculate response time statistics
+        response_times = [r["response_time"] for r in self.results["success"]]
+
+        stats = {
+            "summary": {
+                "total_requests": total_requests,
+                "successful": success_count,
+                "failed": failed_count,
+                "success_rate": f"{(success_count / total_requests * 100):.2f}%",
+                "total_duration": f"{total_time:.2f}s",
+                "requests_per_second": f"{total_requests / total_time:.2f}",
+            },
+            "response_times": {},
+            "errors": self.results["error_codes"],
+        }
+
+        if response_times:
+            stats["response_times"] = {
+                "min": f"{min(response_times):.3f}s",
+                "max": f"{max(response_times):.3f}s",
+                "mean": f"{mean(response_times):.3f}s",
+                "median": f"{median(response_times):.3f}s",
+            }
+            if len(response_times) > 1:
+                stats["response_times"]["stdev"] = f"{stdev(response_times):.3f}s"
+
+        # Print report
+        print(f"{'='*70}")
+        print(f"Test Results Summary")
+        print(f"{'='*70}")
+        print(f"Total Requests:     {stats['summary']['total_requests']}")
+        print(f"Successful:         {stats['summary']['successful']} ✓")
+        print(f"Failed:             {stats['summary']['failed']} ✗")
+        print(f"Success Rate:       {stats['summary']['success_rate']}")
+        print(f"Total Duration:     {stats['summary']['total_duration']}")
+        print(f"Requests/Second:    {stats['summary']['requests_per_second']}")
+
+        if stats['response_times']:
+            print(f"\nResponse Time Statistics (Successful Requests):")
+            print(f"  Min:              {stats['response_times']['min']}")
+            print(f"  Max:              {stats['response_times']['max']}")
+            print(f"  Mean:             {stats['response_times']['mean']}")
+            print(f"  Median:           {stats['response_times']['median']}")
+            if 'stdev' in stats['response_times']:
+                print(
+                    f"  Std Dev:          {stats['response_times']['stdev']}")
+
+        if self.validator:
+            stats["validation"] = self.validator.summary()
+            self.validator.print_summary()
+
+        if self.timing:
+            stats["server_timing"] = self.timing.summary()
+            self.timing.print_summary()
+
+        if stats['errors']:
+            print(f"\nError Distribution:")
+            for code, count in stats['errors'].items():
+                print(f"  Status {code}: {count} requests")
+
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stress test for the todo list endpoint (sets up users with todos first)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python todo-list.py --users 50 --requests 1000 --concurrency 25
+  python todo-list.py -u 100 --todos-per-user 50 --page-size 50
+  python todo-list.py --find-capacity --slo "p99<200ms,errors<0.1%"
+        """
+    )
+
+    parser.add_argument(
+        "-u", "--users",
+        type=int,
+        default=50,
+        help="Number of test users to set up first (default: 50)"
+    )
+    parser.add_argument(
+        "--todos-per-user",
+        type=int,
+        default=20,
+        help="Todos created per test user during setup (default: 20)"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=10,
+        help="limit query parameter of each list request, 1-100 (default: 10)"
+    )
+    parser.add_argument(
+        "-r", "--requests",
+        type=int,
+        default=1000,
+        help="Number of todo list requests to send (default: 1000)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=25,
+        help="Number of concurrent requests (default: 25)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default="http://localhost:3001",
+        help="Base URL of the API (default: http://localhost:3001)"
+    )
+    parser.add_argument(
+        "--validate-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of 2xx responses checked against the API contract, failures count as invalid_2xx (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--server-timing",
+        action="store_true",
+        help="Break latency down by the API's Server-Timing phases (start the API with SERVER_TIMING=true)"
+    )
+    parser.add_argument(
+        "--find-capacity",
+        action="store_true",
+        help="Search the highest sustainable request rate under --slo instead of a fixed --requests run"
+    )
+    parser.add_argument(
+        "--slo",
+        type=str,
+        default="p99<200ms,errors<0.1%",
+        help="Capacity search SLO (default: p99<200ms,errors<0.1%%)"
+    )
+    parser.add_argument(
+        "--step-duration",
+        type=str,
+        default="10s",
+        help="Capacity search duration of each fixed-rate step (default: 10s)"
+    )
+    parser.add_argument(
+        "--start-rate",
+        type=float,
+        default=10.0,
+        help="Capacity search first arrival rate in req/s (default: 10)"
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=5000.0,
+        help="Capacity search upper bound in req/s (default: 5000)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Capacity search verification runs at the result (default: 3)"
+    )
+    parser.add_argument(
+        "--profile-inspect",
+        type=str,
+        default=None,
+        help="Inspector URL of an API started with node --inspect (e.g. http://127.0.0.1:9229), enables profiling in capacity mode"
+    )
+    parser.add_argument(
+        "--profile-stages",
+        type=str,
+        default=None,
+        help="Comma-separated stages profiled when they start: capacity search steps step-1, step-2, ..., or all"
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=str,
+        default=None,
+        help="Profile a stage once its running p99 exceeds this, e.g. 200ms"
+    )
+    parser.add_argument(
+        "--profile-window",
+        type=str,
+        default="5s",
+        help="CPU profile length per capture (default: 5s)"
+    )
+    parser.add_argument(
+        "--heap-snapshot",
+        action="store_true",
+        help="Take a heap snapshot after each CPU profile"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=str,
+        default=None,
+        help="Excluded warm-up before measuring: a request count (500) or a duration (30s), enables trials mode"
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=1,
+        help="Interleaved measured trials of --requests each, reported with bootstrap confidence intervals (default: 1)"
+    )
+
+    args = parser.parse_args()
+
+    # Validate arguments
+    if args.users < 1:
+        print("Error: users must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.todos_per_user < 0:
+        print("Error: todos-per-user must be >= 0", file=sys.stderr)
+        sys.exit(1)
+    if not 1 <= args.page_size <= 100:
+        print("Error: page-size must be between 1 and 100", file=sys.stderr)
+        sys.exit(1)
+    if args.requests < 1:
+        print("Error: requests must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1:
+        print("Error: concurrency must be >= 1", file=sys.stderr)
+        sys.exit(1)
+    if not 0 <= args.validate_rate <= 1:
+        print("Error: validate-rate must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+    # Capacity reports are built by CapacitySearch and carry no validation section
+    if args.find_capacity and args.validate_rate > 0:
+        print("Error: --validate-rate does not apply to --find-capacity", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        slo = parse_slo(args.slo) if args.find_capacity else None
+        warmup_seconds, warmup_requests = parse_warmup(args.warmup)
+        if args.trials < 1:
+            raise ValueError("trials must be >= 1")
+        if (args.trials > 1 or args.warmup) and (args.find_capacity):
+            raise ValueError("--trials and --warmup only apply to fixed --requests runs")
+        step_duration = parse_duration(args.step_duration)
+        if step_duration <= 0:
+            raise ValueError("step-duration must be > 0")
+        if not 0 < args.start_rate <= args.max_rate:
+            raise ValueError("start-rate must be > 0 and <= max-rate")
+        if args.repeats < 1:
+            raise ValueError("repeats must be >= 1")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # Setup: users with todos
+        setup = SetupPhase(
+            base_url=args.url,
+            num_users=args.users,
+            todos_per_user=args.todos_per_user,
+            concurrency=args.concurrency
+        )
+        users = setup.run()
+
+        if not users:
+            print(
+                "Error: No users were set up. Cannot proceed with todo list test.", file=sys.stderr)
+            sys.exit(1)
+        if setup.todo_errors:
+            print(
+                f"Error: {setup.todo_errors} todo creates failed. Cannot proceed with todo list test.", file=sys.stderr)
+            sys.exit(1)
+
+        tester = TodoListStressTest(
+            base_url=args.url,
+            num_requests=args.requests,
+            concurrency=args.concurrency,
+            users=users,
+            page_size=args.page_size,
+            validator=ResponseValidator(args.validate_rate) if args.validate_rate > 0 else None,
+            timing=ServerTimingCollector() if args.server_timing else None
+        )
+        if args.find_capacity:
+            # Capacity mode: open-loop rate steps, ramp then bisection under the SLO
+            report = CapacitySearch(
+                send_request=tester.send_request,
+                slo=slo,
+                step_duration=step_duration,
+                start_rate=args.start_rate,
+                max_rate=args.max_rate,
+                repeats=args.repeats,
+                profiler=build_profiler(args, "todo_list_capacity_")
+            ).run()
+        elif args.trials > 1 or args.warmup:
+            # Trials mode: excluded warm-up, interleaved trials, bootstrap confidence intervals
+            report = TrialRunner(
+                send_request=tester.send_request,
+                num_requests=args.requests,
+                concurrency=args.concurrency,
+                trials=args.trials,
+                warmup_seconds=warmup_seconds,
+                warmup_requests=warmup_requests,
+                on_warmup_done=tester.timing.reset if tester.timing else None
+            ).run()
+            if tester.validator:
+                report["validation"] = tester.validator.summary()
+        else:
+            report = tester.run()
+
+        # Soak, capacity and trials reports are built outside the tester
+        if tester.timing and "server_timing" not in report:
+            report["server_timing"] = tester.timing.summary()
+            tester.timing.print_summary()
+
+        # Save report to file
+        report_prefix = "todo_list_capacity_report_" if args.find_capacity else \
+            "todo_list_trials_report_" if "trials" in report else "todo_list_stress_test_report_"
+        report_file = f"{report_prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {report_file}\n")
+
+    except KeyboardInterrupt:
+        print("\n\nTest interrupted by user", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Deterministic trace record and replay shared by the stress scripts
+A trace is a compact text file: one JSON header line (scenario, step, base seed,
+setup size) followed by one "offset_ms<TAB>step<TAB>index<TAB>seed" line per
+measured request. The index picks the user/session exactly like a plain run,
+the seed only drives payload content (seeded RNG instead of uuid4). Replay
+dispatches every request at its recorded offset (optionally time compressed
+with --speed), so two builds of the API see identical traffic.
+Only register bodies are built from the seed. Login and refresh requests carry
+the credentials or cookie jar chosen by the index, so their headers say
+"payload_seeded": false and the seed column is informational there.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+TRACE_VERSION = 2
+
+
+def request_seed(base_seed: int, step: str, index: int) -> int:
+    """Stable 63-bit payload seed for the index-th request of a step"""
+    digest = hashlib.blake2b(f"{base_seed}:{step}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def seeded_unique_id(seed: int) -> str:
+    """Deterministic stand-in for str(uuid.uuid4())[:8]"""
+    return f"{random.Random(seed).getrandbits(32):08x}"
+
+
+class TraceEvent(NamedTuple):
+    offset: float
+    step: str
+    index: int
+    seed: int
+
+
+class TraceRecorder:
+    """Append measured requests to a trace file as they are sent"""
+
+    def __init__(self, path: str, scenario: str, step: str, base_seed: int, payload_seeded: bool = True):
+        self.path = path
+        self.scenario = scenario
+        self.step = step
+        self.base_seed = base_seed
+        self.payload_seeded = payload_seeded
+        self.lock = threading.Lock()
+        self.file = None
+        self.start_time = 0.0
+        self.events = 0
+
+    def start(self, setup: Optional[Dict[str, int]] = None):
+        """Open the trace and anchor offsets at the start of the measured phase
+
+        setup records the setup size (requested and ready users/sessions) that
+        request indexes are mapped onto, so a replay can refuse a different one.
+        """
+        self.file = open(self.path, "w", buffering=1 << 16)
+        self.file.write(json.dumps({
+            "trace": TRACE_VERSION,
+            "scenario": self.scenario,
+            "step": self.step,
+            "seed": self.base_seed,
+            "payload_seeded": self.payload_seeded,
+            "setup": setup or {},
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+        }) + "\n")
+        self.start_time = time.time()
+
+    def record(self, index: int, seed: int):
+        """Record a request about to be sent"""
+        offset_ms = (time.time() - self.start_time) * 1000
+        with self.lock:
+            self.file.write(f"{offset_ms:.3f}\t{self.step}\t{index}\t{seed}\n")
+            self.events += 1
+
+    def close(self):
+        """Flush and close the trace"""
+        if self.file:
+            self.file.close()
+            self.file = None
+            print(f"Trace saved to: {self.path} ({self.events} requests)")
+
+
+def read_trace_header(path: str) -> Dict[str, Any]:
+    """Read only the header line of a trace"""
+    with open(path) as f:
+        header = json.loads(f.readline())
+    if header.get("trace") != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version in {path}")
+    return header
+
+
+def check_trace_setup(header: Dict[str, Any], name: str, value: int):
+    """Refuse a replay whose setup differs from the recorded one"""
+    recorded = header.get("setup", {}).get(name)
+    if recorded is not None and recorded != value:
+        raise ValueError(
+            f"trace was recorded with {name}={recorded}, this run has {name}={value}; "
+            f"request indexes would map onto different users")
+
+
+def iter_trace(path: str) -> Iterator[TraceEvent]:
+    """Stream the events of a trace without loading the file"""
+    with open(path) as f:
+        f.readline()
+        for line in f:
+            offset_ms, step, index, seed = line.rstrip("\n").split("\t")
+            yield TraceEvent(float(offset_ms) / 1000, step, int(index), int(seed))
+
+
+def count_trace(path: str) -> int:
+    """Number of events in a trace"""
+    with open(path) as f:
+        return sum(1 for _ in f) - 1
+
+
+class TraceReplayer:
+    """Dispatch trace events at their recorded offsets divided by speed"""
+
+    def __init__(self, path: str, speed: float, concurrency: int):
+        self.path = path
+        self.speed = speed
+        self.concurrency = concurrency
+        self.total = count_trace(path)
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_count = 0
+
+    def run(
+        self,
+        handler: Callable[[int, TraceEvent], Tuple],
+        on_result: Callable[[Tuple], None],
+    ):
+        """Replay every event; results are handed to on_result on the calling thread"""
+        # Bounded in-flight work keeps memory flat on long traces
+        slots = threading.Semaphore(self.concurrency * 4)
+        completed = 0
+
+        def dispatch(index: int, event: TraceEvent) -> Tuple:
+            try:
+                return handler(index, event)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = []
+            start_time = time.time()
+
+            for index, event in enumerate(iter_trace(self.path)):
+                target = start_time + event.offset / self.speed
+                delay = target - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                slots.acquire()
+                # Lag between the intended and the actual send time
+                lag = time.time() - target
+                self.lag_total += lag
+                self.lag_max = max(self.lag_max, lag)
+                self.lag_count += 1
+                futures.append(executor.submit(dispatch, index, event))
+
+                # Split in one pass so nothing finishing in between is dropped
+                pending = []
+                for future in futures:
+                    if future.done():
+                        on_result(future.result())
+                        completed += 1
+                    else:
+                        pending.append(future)
+                futures = pending
+                self.print_progress(completed)
+
+            for future in as_completed(futures):
+                on_result(future.result())
+                completed += 1
+                self.print_progress(completed)
+        print("\n")
+
+    def print_progress(self, completed: int):
+        """Progress bar over the trace length"""
+        if not self.total:
+            return
+        progress = (completed / self.total) * 100
+        bar_length = 40
+        filled = int(bar_length * completed // self.total)
+        bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+        print(
+            f"\r{bar} {progress:.1f}% ({completed}/{self.total})", end="", flush=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """Schedule fidelity of the replay"""
+        if not self.lag_count:
+            return {"trace": self.path, "speed": self.speed, "events": 0}
+        return {
+            "trace": self.path,
+            "speed": self.speed,
+            "events": self.lag_count,
+            "mean_send_lag": f"{self.lag_total / self.lag_count * 1000:.2f}ms",
+            "max_send_lag": f"{self.lag_max * 1000:.2f}ms",
+        }
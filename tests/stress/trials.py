@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Warm-up exclusion, repeated trials and bootstrap confidence intervals shared by
+the stress scripts
+A single closed-loop run mixes JIT warm-up, connection pool fill and the first
+Argon2 calls into its numbers, and one number per run hides how much it moves
+between runs. TrialRunner first drives a scenario's send_request for a warm-up
+(a duration or a request count) whose results are discarded, then measures N
+trials. Trials are interleaved: each trial is split into blocks and every round
+runs one block of each trial in a rotated order, so slow drift (growing
+tables, heap growth) lands on all trials alike instead of on the last one.
+The report gives percentile bootstrap confidence intervals: throughput and
+mean latency resample whole trials, latency percentiles resample requests
+within each trial.
+"""
+
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from statistics import mean
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from soak import parse_duration
+
+
+def parse_warmup(value: Optional[str]) -> Tuple[float, int]:
+    """Warm-up as (seconds, requests): "500" is a request count, "30s"/"2m"/"500ms" a duration"""
+    if not value:
+        return 0.0, 0
+    if re.fullmatch(r"\s*\d+\s*", value):
+        return 0.0, int(value)
+    return parse_duration(value), 0
+
+
+def percentile(ordered: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def bootstrap_ci(samples: Sequence[float], statistic: Callable[[Sequence[float]], float],
+                 iterations: int = 1000, confidence: float = 0.95,
+                 rng: Optional[random.Random] = None) -> Optional[Tuple[float, float, float]]:
+    """(estimate, low, high) percentile bootstrap interval, None with fewer than 2 samples"""
+    if len(samples) < 2:
+        return None
+    rng = rng or random.Random()
+    estimates = sorted(statistic(rng.choices(samples, k=len(samples))) for _ in range(iterations))
+    alpha = (1 - confidence) / 2
+    return (statistic(samples), percentile(estimates, alpha * 100), percentile(estimates, (1 - alpha) * 100))
+
+
+def stratified_percentile_cis(groups: List[List[float]], pcts: Sequence[float], iterations: int = 1000,
+                              confidence: float = 0.95, rng: Optional[random.Random] = None
+                              ) -> Dict[float, Optional[Tuple[float, float, float]]]:
+    """Bootstrap intervals of latency percentiles, resampling requests within each trial"""
+    groups = [group for group in groups if group]
+    if sum(len(group) for group in groups) < 2:
+        return {pct: None for pct in pcts}
+    rng = rng or random.Random()
+    # One resample serves every percentile
+    estimates: Dict[float, List[float]] = {pct: [] for pct in pcts}
+    for _ in range(iterations):
+        pooled = []
+        for group in groups:
+            pooled.extend(rng.choices(group, k=len(group)))
+        pooled.sort()
+        for pct in pcts:
+            estimates[pct].append(percentile(pooled, pct))
+    alpha = (1 - confidence) / 2
+    everything = sorted(value for group in groups for value in group)
+    intervals = {}
+    for pct in pcts:
+        ordered = sorted(estimates[pct])
+        intervals[pct] = (percentile(everything, pct), percentile(ordered, alpha * 100),
+                          percentile(ordered, (1 - alpha) * 100))
+    return intervals
+
+
+class TrialResult:
+    """Measurements of one trial, summed over its blocks"""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.latencies: List[float] = []
+        self.requests = 0
+        self.errors = 0
+        self.error_codes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        """Report row"""
+        ordered = sorted(self.latencies)
+        return {
+            "trial": self.number,
+            "requests": self.requests,
+            "successful": len(self.latencies),
+            "failed": self.errors,
+            "duration": f"{self.elapsed:.2f}s",
+            "requests_per_second": f"{self.requests_per_second():.2f}",
+            "mean": f"{mean(ordered):.4f}s" if ordered else None,
+            "p50": f"{percentile(ordered, 50):.4f}s" if ordered else None,
+            "p95": f"{percentile(ordered, 95):.4f}s" if ordered else None,
+            "p99": f"{percentile(ordered, 99):.4f}s" if ordered else None,
+            "error_codes": self.error_codes,
+        }
+
+
+class TrialRunner:
+    """Warm up, then run interleaved trials of a scenario and report confidence intervals"""
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(
+        self,
+        send_request: Callable[[int], Tuple],
+        num_requests: int,
+        concurrency: int,
+        trials: int = 1,
+        warmup_seconds: float = 0.0,
+        warmup_requests: int = 0,
+        max_rounds: int = 4,
+        confidence: float = 0.95,
+        iterations: int = 1000,
+        is_success: Optional[Callable[[Tuple], bool]] = None,
+        on_warmup_done: Optional[Callable[[], None]] = None,
+    ):
+        self.send_request = send_request
+        self.num_requests = num_requests
+        self.concurrency = concurrency
+        self.trials = [TrialResult(number + 1) for number in range(trials)]
+        self.warmup_seconds = warmup_seconds
+        self.warmup_requests = warmup_requests
+        # Blocks smaller than the concurrency would mostly measure ramp-up and drain
+        self.rounds = max(1, min(max_rounds, num_requests // concurrency)) if trials > 1 else 1
+        self.confidence = confidence
+        self.iterations = iterations
+        self.is_success = is_success or (lambda result: result[2] in [200, 201])
+        self.on_warmup_done = on_warmup_done
+        self.next_index = 0
+        self.completed = 0
+        self.warmup_sent = 0
+        self.warmup_elapsed = 0.0
+        self.lock = threading.Lock()
+
+    def drive(self, count: Optional[int], deadline: Optional[float], trial: Optional[TrialResult]) -> float:
+        """Closed loop of `concurrency` workers until `count` requests or the deadline; returns elapsed"""
+        sent = 0
+
+        def worker():
+            nonlocal sent
+            while True:
+                with self.lock:
+                    if (count is not None and sent >= count) or (deadline is not None and time.time() >= deadline):
+                        return
+                    sent += 1
+                    index = self.next_index
+                    self.next_index += 1
+
+                result = self.send_request(index)
+                if trial is None:
+                    continue
+                success = self.is_success(result)
+                with self.lock:
+                    trial.requests += 1
+                    if success:
+                        trial.latencies.append(result[1])
+                    else:
+                        trial.errors += 1
+                        status_key = str(result[2])
+                        trial.error_codes[status_key] = trial.error_codes.get(status_key, 0) + 1
+                    self.completed += 1
+                    self.print_progress()
+
+        start = time.time()
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(self.concurrency)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        if trial is None:
+            self.warmup_sent += sent
+        return time.time() - start
+
+    def print_progress(self):
+        total = self.num_requests * len(self.trials)
+        progress = (self.completed / total) * 100
+        bar_length = 40
+        filled = int(bar_length * self.completed // total)
+        bar = f"[{'█' * filled}{' ' * (bar_length - filled)}]"
+        print(f"\r{bar} {progress:.1f}% ({self.completed}/{total})", end="", flush=True)
+
+    def block_sizes(self) -> List[int]:
+        """Requests per round for one trial"""
+        base, extra = divmod(self.num_requests, self.rounds)
+        return [base + (1 if r < extra else 0) for r in range(self.rounds)]
+
+    def run(self) -> Dict:
+        """Warm up, then measure the interleaved trials"""
+        print(f"\n{'='*70}")
+        print(f"Repeated Trials")
+        print(f"{'='*70}")
+        print(f"Trials:        {len(self.trials)} x {self.num_requests} requests, {self.rounds} interleaved round(s)")
+        print(f"Concurrency:   {self.concurrency}")
+        warmup = []
+        if self.warmup_requests:
+            warmup.append(f"{self.warmup_requests} requests")
+        if self.warmup_seconds:
+            warmup.append(f"{self.warmup_seconds:g}s")
+        print(f"Warm-up:       {' + '.join(warmup) if warmup else 'none'} (excluded)")
+        print(f"Started:       {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        start_time = time.time()
+        if self.warmup_requests or self.warmup_seconds:
+            print("Warming up...", flush=True)
+            if self.warmup_requests:
+                self.warmup_elapsed += self.drive(self.warmup_requests, None, None)
+            if self.warmup_seconds:
+                self.warmup_elapsed += self.drive(None, time.time() + self.warmup_seconds, None)
+            print(f"Warm-up done: {self.warmup_sent} requests in {self.warmup_elapsed:.2f}s\n", flush=True)
+        if self.on_warmup_done:
+            self.on_warmup_done()
+
+        # Round r runs the trials starting at trial r, so no trial is always first or last
+        for round_number, size in enumerate(self.block_sizes()):
+            for offset in range(len(self.trials)):
+                trial = self.trials[(round_number + offset) % len(self.trials)]
+                trial.elapsed += self.drive(size, None, trial)
+        print("\n")
+
+        return self.generate_report(time.time() - start_time)
+
+    def interval(self, ci: Optional[Tuple[float, float, float]], fmt: str) -> Optional[Dict]:
+        if ci is None:
+            return None
+        estimate, low, high = ci
+        return {"estimate": fmt.format(estimate), "low": fmt.format(low), "high": fmt.format(high)}
+
+    def generate_report(self, total_time: float) -> Dict:
+        """Per-trial rows and bootstrap intervals"""
+        rng = random.Random(0)
+        throughputs = [trial.requests_per_second() for trial in self.trials]
+        trial_means = [mean(trial.latencies) for trial in self.trials if trial.latencies]
+        groups = [trial.latencies for trial in self.trials]
+        requests_total = sum(trial.requests for trial in self.trials)
+        successes = sum(len(trial.latencies) for trial in self.trials)
+
+        intervals = {
+            "requests_per_second": self.interval(
+                bootstrap_ci(throughputs, mean, self.iterations, self.confidence, rng), "{:.2f}"),
+            "mean": self.interval(
+                bootstrap_ci(trial_means, mean, self.iterations, self.confidence, rng), "{:.4f}s"),
+        }
+        percentile_cis = stratified_percentile_cis(groups, self.PERCENTILES, self.iterations, self.confidence, rng)
+        for pct in self.PERCENTILES:
+            intervals[f"p{pct}"] = self.interval(percentile_cis[pct], "{:.4f}s")
+
+        error_codes: Dict[str, int] = {}
+        for trial in self.trials:
+            for code, count in trial.error_codes.items():
+                error_codes[code] = error_codes.get(code, 0) + count
+
+        stats = {
+            "summary": {
+                "trials": len(self.trials),
+                "rounds": self.rounds,
+                "requests_per_trial": self.num_requests,
+                "total_requests": requests_total,
+                "successful": successes,
+                "failed": requests_total - successes,
+                "success_rate": f"{(successes / requests_total * 100):.2f}%" if requests_total else "0.00%",
+                "total_duration": f"{total_time:.2f}s",
+            },
+            "warmup": {
+                "requests": self.warmup_sent,
+                "duration": f"{self.warmup_elapsed:.2f}s",
+            },
+            "confidence_level": f"{self.confidence * 100:.0f}%",
+            "bootstrap_iterations": self.iterations,
+            "confidence_intervals": intervals,
+            "trials": [trial.to_dict() for trial in self.trials],
+            "errors": error_codes,
+        }
+
+        # Print report
+        print(f"{'='*70}")
+        print(f"Trial Results")
+        print(f"{'='*70}")
+        print(f"{'Trial':>5} {'Requests':>9} {'Failed':>7} {'Req/s':>9} {'Mean':>9} {'P50':>9} {'P99':>9}")
+        for trial in self.trials:
+            ordered = sorted(trial.latencies)
+            print(f"{trial.number:>5} {trial.requests:>9} {trial.errors:>7} {trial.requests_per_second():>9.2f} "
+                  f"{(mean(ordered) if ordered else 0) * 1000:>7.1f}ms {percentile(ordered, 50) * 1000:>7.1f}ms "
+                  f"{percentile(ordered, 99) * 1000:>7.1f}ms")
+
+        print(f"\n{stats['confidence_level']} Bootstrap Confidence Intervals ({self.iterations} resamples):")
+        labels = [("requests_per_second", "Requests/Second"), ("mean", "Mean")] + \
+            [(f"p{pct}", f"P{pct}") for pct in self.PERCENTILES]
+        for key, label in labels:
+            ci = intervals[key]
+            if ci is None:
+                needs = "--trials >= 2" if key in ("requests_per_second", "mean") else "2 successful requests"
+                print(f"  {label + ':':<19} n/a (needs {needs})")
+            else:
+                print(f"  {label + ':':<19} {ci['estimate']}  [{ci['low']} .. {ci['high']}]")
+
+        if error_codes:
+            print(f"\nError Distribution:")
+            for code, count in error_codes.items():
+                print(f"  Status {code}: {count} requests")
+
+        print(f"\nTotal Duration:     {stats['summary']['total_duration']}")
+        print(
+            f"\nCompleted:          {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*70}\n")
+
+        return stats
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Sampled response-contract validation for the stress scripts
+A 2xx status alone does not prove the API did its job: a login without an
+accessToken or a refresh that does not rotate the refresh cookie is a failure
+too. ResponseValidator checks a configurable fraction of 2xx responses
+against the API contract (JSON shape, Set-Cookie rotation, todo ownership) so
+the validation cost stays bounded, and sampled violations are reported as a
+separate "invalid_2xx" failure class next to the HTTP status codes.
+"""
+
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+# Status key used in place of the HTTP status when a 2xx fails its contract
+INVALID_2XX = "invalid_2xx"
+
+
+def _json_data(response: requests.Response) -> Any:
+    """The `data` member of a {status: success, data} envelope"""
+    if "application/json" not in response.headers.get("Content-Type", ""):
+        raise ValueError("response is not JSON")
+    body = response.json()
+    if not isinstance(body, dict) or body.get("status") != "success":
+        raise ValueError("status is not success")
+    if "data" not in body:
+        raise ValueError("data is missing")
+    return body["data"]
+
+
+def _require(data: Any, key: str, kind: type = str) -> Any:
+    """A non-empty member of the given type"""
+    if not isinstance(data, dict) or not isinstance(data.get(key), kind) or data.get(key) in ["", None]:
+        raise ValueError(f"{key} is missing")
+    return data[key]
+
+
+def refresh_cookie(response: requests.Response) -> Optional[str]:
+    """Last non-empty refreshToken value set by a response (clearCookie sets an empty one first)"""
+    value = None
+    for header in response.raw.headers.getlist("Set-Cookie"):
+        name, _, rest = header.partition("=")
+        token = rest.split(";", 1)[0]
+        if name.strip() == "refreshToken" and token:
+            value = token
+    return value
+
+
+def check_register(response: requests.Response, email: Optional[str] = None):
+    """201 body carries the new user's id and the submitted email"""
+    data = _json_data(response)
+    _require(data, "id")
+    if email is not None and _require(data, "email") != email:
+        raise ValueError("email does not match the request")
+
+
+def check_login(response: requests.Response, email: Optional[str] = None):
+    """Login returns a JWT access token, the user, and sets the refresh cookie"""
+    data = _json_data(response)
+    if _require(data, "accessToken").count(".") != 2:
+        raise ValueError("accessToken is not a JWT")
+    user = _require(data, "user", dict)
+    _require(user, "id")
+    if email is not None and user.get("email") != email:
+        raise ValueError("user.email does not match the request")
+    if not refresh_cookie(response):
+        raise ValueError("refreshToken cookie not set")
+
+
+def check_refresh(response: requests.Response, previous: Optional[str] = None):
+    """Refresh returns a new access token and rotates the refresh cookie"""
+    data = _json_data(response)
+    if _require(data, "accessToken").count(".") != 2:
+        raise ValueError("accessToken is not a JWT")
+    token = refresh_cookie(response)
+    if not token:
+        raise ValueError("refreshToken cookie not rotated")
+    if previous is not None and token == previous:
+        raise ValueError("refreshToken cookie reused")
+
+
+def check_todo(response: requests.Response, user_id: Optional[str] = None, todo_id: Optional[str] = None):
+    """A single todo owned by the requesting user"""
+    data = _json_data(response)
+    _require(data, "id")
+    if todo_id is not None and data["id"] != todo_id:
+        raise ValueError("todo id does not match the request")
+    if user_id is not None and data.get("userId") != user_id:
+        raise ValueError("todo owned by another user")
+
+
+def check_todo_list(response: requests.Response, user_id: Optional[str] = None):
+    """A page of todos that all belong to the requesting user"""
+    data = _json_data(response)
+    todos = data.get("todos") if isinstance(data, dict) else None
+    if not isinstance(todos, list):
+        raise ValueError("todos is missing")
+    for key in ["total", "page", "limit", "totalPages"]:
+        if not isinstance(data.get(key), int):
+            raise ValueError(f"{key} is missing")
+    if user_id is not None and any(todo.get("userId") != user_id for todo in todos):
+        raise ValueError("list contains another user's todo")
+
+
+CONTRACTS: Dict[str, Callable[..., None]] = {
+    "register": check_register,
+    "login": check_login,
+    "refresh": check_refresh,
+    "todo": check_todo,
+    "todo_list": check_todo_list,
+}
+
+
+class ResponseValidator:
+    """Check a sampled fraction of 2xx responses against their contract"""
+
+    def __init__(self, rate: float, seed: Optional[int] = None):
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sampled = 0
+        self.invalid = 0
+        self.reasons: Dict[str, int] = {}
+        self.examples: List[str] = []
+
+    def sample(self) -> bool:
+        """Whether the next response should be validated"""
+        if self.rate <= 0:
+            return False
+        if self.rate >= 1:
+            return True
+        with self.lock:
+            return self.rng.random() < self.rate
+
+    def validate(self, contract: str, response: requests.Response, **expected) -> bool:
+        """Validate a sampled 2xx response, False if it violates the contract"""
+        if response.status_code not in [200, 201] or not self.sample():
+            return True
+        try:
+            CONTRACTS[contract](response, **expected)
+            reason = None
+        except ValueError as e:
+            reason = f"{contract}: {e}"
+
+        with self.lock:
+            self.sampled += 1
+            if reason is None:
+                return True
+            self.invalid += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            if len(self.examples) < 5:
+                self.examples.append(f"{reason} -> {response.text[:200]}")
+        return False
+
+    def status(self, contract: str, response: requests.Response, **expected):
+        """HTTP status of the response, or INVALID_2XX if the sampled check fails"""
+        return response.status_code if self.validate(contract, response, **expected) else INVALID_2XX
+
+    def summary(self) -> Dict[str, Any]:
+        """Validation counters for the report"""
+        return {
+            "rate": self.rate,
+            "sampled": self.sampled,
+            "invalid": self.invalid,
+            "invalid_rate": f"{(self.invalid / self.sampled * 100) if self.sampled else 0:.2f}%",
+            "reasons": self.reasons,
+            "examples": self.examples,
+        }
+
+    def print_summary(self):
+        """Print the validation section of a report"""
+        print(f"\nResponse Validation ({self.rate * 100:g}% of 2xx sampled):")
+        print(f"  Sampled:          {self.sampled}")
+        print(f"  Invalid 2xx:      {self.invalid}")
+        for reason, count in self.reasons.items():
+            print(f"    {reason}: {count}")